@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import logging
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from extract_cap_variants import (
+    GT_COLUMN,
+    join_targets_variants,
+    load_targets,
+    load_variants,
+    setup_logging,
+    variant_columns,
+    write_variant_cache,
+)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ORACLE_TARGETS = SCRIPT_DIR / 'cap_list.tsv'
+ORACLE_OUTPUT = SCRIPT_DIR / 'cap_output.tsv'
+
+CHROMS = [str(i) for i in range(1, 23)] + ['X', 'Y']
+# 합성 변이 파일을 기록할 때 한 번에 생성하는 행 수
+WRITE_BLOCK = 1_000_000
+MODES = ['full', 'chunked', 'cache']
+
+def parse_arguments():
+    """명령행 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description='CAP NGS 변이 추출 벤치마크')
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e4, 1e5, 1e6],
+                      help='합성 변이 테이블 행 수 목록 (기본값: 1e4 1e5 1e6)')
+    parser.add_argument('--targets', type=int, default=100,
+                      help='합성 평가 대상 수 (기본값: 100)')
+    parser.add_argument('--interval-width', type=int, default=20,
+                      help='평가 대상 구간 길이 (기본값: 20)')
+    parser.add_argument('--overlap', type=float, default=0.001,
+                      help='평가 대상 구간 안에 생성할 변이 비율 (기본값: 0.001)')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES,
+                      help='측정할 로드 방식 (기본값: full chunked cache)')
+    parser.add_argument('--chunksize', type=int, default=1_000_000,
+                      help='chunked 방식의 청크 행 수 (기본값: 1000000)')
+    parser.add_argument('--seed', type=int, default=0,
+                      help='난수 시드 (기본값: 0)')
+    parser.add_argument('--workdir', type=str, default=None,
+                      help='합성 데이터를 기록할 디렉토리 (기본값: 임시 디렉토리, 종료 시 삭제)')
+    parser.add_argument('--output', type=str, default='benchmark_cap_variants.json',
+                      help='결과 JSON 파일 경로')
+    parser.add_argument('--skip-oracle', action='store_true',
+                      help='cap_list.tsv/cap_output.tsv 정합성 검사 생략')
+    return parser.parse_args()
+
+def generate_targets(n_targets, interval_width, rng):
+    """합성 평가 대상(CAP 리스트 형식)을 생성합니다."""
+    chroms = rng.choice(CHROMS, n_targets)
+    starts = rng.integers(1_000, 200_000_000, n_targets)
+    return pd.DataFrame({
+        'Gene_Symbol': [f"GENE{idx} (HGNC:{idx})" for idx in range(n_targets)],
+        'Chromosomal_interval': [f"chr{chrom}:{start}-{start + interval_width}"
+                                 for chrom, start in zip(chroms, starts)],
+        'Transcript': [f"NM_{idx:06d}.1" for idx in range(n_targets)],
+    })
+
+def generate_variant_block(n_rows, targets_df, interval_width, overlap, rng):
+    """합성 변이 행 블록을 생성합니다. overlap 비율만큼은 평가 대상 구간 안에 둡니다."""
+    n_targets = len(targets_df)
+    chroms = rng.choice(CHROMS, n_rows).astype(object)
+    positions = rng.integers(1, 250_000_000, n_rows)
+    genes = np.array([f"GENE{idx}" for idx in rng.integers(0, n_targets, n_rows)], dtype=object)
+
+    inside = rng.random(n_rows) < overlap
+    picked = rng.integers(0, n_targets, int(inside.sum()))
+    intervals = targets_df['Chromosomal_interval'].str.extract(r'chr(\w+):(\d+)-')
+    chroms[inside] = intervals[0].to_numpy()[picked]
+    positions[inside] = intervals[1].astype(np.int64).to_numpy()[picked] + rng.integers(0, interval_width + 1, len(picked))
+    genes[inside] = np.array([f"GENE{idx}" for idx in picked], dtype=object)
+
+    return pd.DataFrame({
+        'CHROM': chroms,
+        'POS': positions,
+        'REF': 'A',
+        'ALT': 'G',
+        'TRID': 'NM_000000.1',
+        'GENE': genes,
+        'ID': '.',
+        GT_COLUMN: rng.choice(['0/1', '1/1'], n_rows),
+        'HGVS_C': 'c.1A>G',
+        'HGVS_P': '.',
+        'QUAL': 50.0,
+    })
+
+def write_synthetic_variants(variants_file, n_rows, targets_df, interval_width, overlap, rng):
+    """합성 변이 테이블을 블록 단위로 TSV에 기록합니다 (메모리는 블록 크기에 비례)."""
+    written = 0
+    with open(variants_file, 'w') as handle:
+        while written < n_rows:
+            block = generate_variant_block(min(WRITE_BLOCK, n_rows - written), targets_df,
+                                           interval_width, overlap, rng)
+            block.to_csv(handle, sep='\t', index=False, header=(written == 0))
+            written += len(block)
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS를 MB 단위로 반환합니다.
+
+    ru_maxrss는 exec 이전 부모 프로세스의 값을 물려받으므로 Linux에서는
+    /proc/self/status의 VmHWM을 우선 사용합니다.
+    """
+    status = Path('/proc/self/status')
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_case(variants_file, targets_file, output_file, mode, chunksize):
+    """한 가지 경우를 로드/필터/기록 단계별로 측정합니다 (별도 프로세스에서 실행)."""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.WARNING)
+
+    started = time.perf_counter()
+    targets_df, target_index = load_targets(targets_file)
+    variants_df = load_variants(variants_file, target_index, logger,
+                                chunksize=chunksize if mode == 'chunked' else None,
+                                use_cache=(mode == 'cache'))
+    loaded = time.perf_counter()
+    result_df, match_counts = join_targets_variants(targets_df, variants_df, strict_trid=False)
+    filtered = time.perf_counter()
+    result_df.to_csv(output_file, sep='\t', index=False)
+    written = time.perf_counter()
+
+    return {
+        'load_sec': round(loaded - started, 4),
+        'filter_sec': round(filtered - loaded, 4),
+        'write_sec': round(written - filtered, 4),
+        'total_sec': round(written - started, 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'loaded_rows': len(variants_df),
+        'matched_variants': int(match_counts.sum()),
+    }
+
+def run_isolated(*args):
+    """최대 RSS가 경우마다 따로 측정되도록 새 프로세스에서 run_case를 실행합니다."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(run_case, *args).result()
+
+def check_oracle(workdir, rng, logger):
+    """cap_output.tsv에서 변이 테이블을 복원하고 잡음 행을 섞어 추출 결과가 같은지 확인합니다."""
+    expected = pd.read_csv(ORACLE_OUTPUT, sep='\t')
+    columns = variant_columns()
+    variants_df = expected.loc[expected['CHROM'].notna(), columns].copy()
+    variants_df['POS'] = variants_df['POS'].astype(np.int64)
+    variants_df['CHROM'] = variants_df['CHROM'].astype(str)
+
+    # 같은 유전자/염색체이지만 구간 밖인 행과 무관한 행을 섞음
+    near = variants_df.assign(POS=variants_df['POS'] + 100_000)
+    noise = generate_variant_block(10_000, load_targets(ORACLE_TARGETS)[0], 0, 0.0, rng)[columns]
+    variants_file = workdir / 'oracle_variants.tsv'
+    pd.concat([noise, variants_df, near], ignore_index=True).to_csv(variants_file, sep='\t', index=False)
+
+    results = {}
+    for mode in MODES:
+        output_file = workdir / f"oracle_{mode}.tsv"
+        run_case(variants_file, ORACLE_TARGETS, output_file, mode, chunksize=1_000)
+        results[mode] = output_file.read_text() == ORACLE_OUTPUT.read_text()
+        if not results[mode]:
+            logger.error(f"정합성 검사 실패: {mode} 결과가 {ORACLE_OUTPUT.name}와 다릅니다.")
+    logger.info(f"정합성 검사: {results}")
+    return results
+
+def main():
+    """메인 함수"""
+    logger = setup_logging()
+    args = parse_arguments()
+    rng = np.random.default_rng(args.seed)
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='cap-bench-'))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'parameters': vars(args),
+        },
+        'oracle': None,
+        'results': [],
+    }
+    try:
+        if not args.skip_oracle:
+            report['oracle'] = check_oracle(workdir, rng, logger)
+
+        targets_df = generate_targets(args.targets, args.interval_width, rng)
+        targets_file = workdir / 'targets.tsv'
+        targets_df.to_csv(targets_file, sep='\t', index=False)
+
+        for size in args.sizes:
+            n_rows = int(size)
+            variants_file = workdir / f"variants_{n_rows}.tsv"
+            logger.info(f"합성 변이 테이블 생성 중: {n_rows}행")
+            write_synthetic_variants(variants_file, n_rows, targets_df, args.interval_width, args.overlap, rng)
+
+            if 'cache' in args.modes:
+                # 캐시 생성 시간은 측정에서 분리하여 반복 실행 시의 로드 시간만 기록
+                started = time.perf_counter()
+                write_variant_cache(variants_file, logger)
+                report['results'].append({'rows': n_rows, 'targets': args.targets, 'mode': 'cache-build',
+                                          'total_sec': round(time.perf_counter() - started, 4)})
+
+            for mode in args.modes:
+                result = run_isolated(variants_file, targets_file, workdir / f"output_{n_rows}_{mode}.tsv",
+                                      mode, args.chunksize)
+                result = {'rows': n_rows, 'targets': args.targets, 'mode': mode, **result}
+                logger.info(f"{n_rows}행 {mode}: 로드 {result['load_sec']}초, 필터 {result['filter_sec']}초, "
+                            f"기록 {result['write_sec']}초, 최대 RSS {result['peak_rss_mb']}MB")
+                report['results'].append(result)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2, ensure_ascii=False)
+    logger.info(f"벤치마크 결과 저장 완료: {args.output}")
+
+    if report['oracle'] and not all(report['oracle'].values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
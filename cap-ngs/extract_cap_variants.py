@@ -2,11 +2,41 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import json
 import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
 import re
+from urllib.parse import unquote
+
+# 결과에 포함되는 변이 컬럼 (GT 컬럼은 샘플마다 다름)
+GT_COLUMN = '2025_CAP_A_GT'
+
+# VCF 입력 (bgzip + tabix/csi 인덱스)
+VCF_SUFFIXES = ('.vcf.gz', '.vcf.bgz')
+# SnpEff ANN 필드 순서 (Allele|Annotation|Annotation_Impact|Gene_Name|Gene_ID|Feature_Type|Feature_ID|...)
+ANN_FIELDS = ['Allele', 'Annotation', 'Annotation_Impact', 'Gene_Name', 'Gene_ID', 'Feature_Type',
+              'Feature_ID', 'Transcript_BioType', 'Rank', 'HGVS.c', 'HGVS.p']
+
+# 배치 모드 manifest 컬럼
+MANIFEST_COLUMNS = ['variants', 'targets', 'gt_column', 'output']
+
+# 컬럼형 캐시(Arrow IPC, CHROM 파티션) 설정
+CACHE_SUFFIX = '.arrow'
+CACHE_SOURCE_FILE = '_source.json'
+# pandas.read_csv와 동일하게 결측값으로 취급할 문자열
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+             '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+def variant_columns(gt_column=GT_COLUMN):
+    """결과에 포함되는 변이 컬럼 목록을 반환합니다."""
+    return ['CHROM', 'POS', 'TRID', 'GENE', 'ID', gt_column, 'HGVS_C', 'HGVS_P']
 
 def setup_logging():
     """로깅 설정을 초기화합니다."""
@@ -22,15 +52,32 @@ def setup_logging():
 def parse_arguments():
     """명령행 인자를 파싱합니다."""
     parser = argparse.ArgumentParser(description='CAP NGS 변이 정보 추출 스크립트')
-    parser.add_argument('--variants', required=True, type=str,
-                      help='전체 변이 정보가 담긴 TSV 파일 경로')
-    parser.add_argument('--targets', required=True, type=str,
+    parser.add_argument('--variants', type=str,
+                      help='전체 변이 정보가 담긴 TSV 파일 경로, 또는 tabix/csi 인덱스가 있는 bgzip VCF (.vcf.gz)')
+    parser.add_argument('--targets', type=str,
                       help='평가 대상 정보가 담긴 TSV 파일 경로 (CAP 리스트와 동일)')
-    parser.add_argument('--output', required=True, type=str,
+    parser.add_argument('--output', type=str,
                       help='결과를 저장할 TSV 파일 경로')
+    parser.add_argument('--gt-column', type=str, default=GT_COLUMN,
+                      help=f'결과에 포함할 샘플 GT 컬럼 (기본값: {GT_COLUMN})')
+    parser.add_argument('--manifest', type=str,
+                      help='배치 모드: variants, targets, gt_column, output 컬럼을 가진 TSV 파일 경로')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                      help='배치 모드 동시 처리 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--report', type=str,
+                      help='배치 모드 실행 보고서 TSV 경로 (기본값: <manifest>.report.tsv)')
     parser.add_argument('--strict-trid', action='store_true',
                       help='TRID가 정확히 일치하는 변이만 추출 (기본값: False)')
-    return parser.parse_args()
+    parser.add_argument('--chunksize', type=int, default=None,
+                      help='변이 파일을 지정한 행 수 단위로 스트리밍하며 평가 대상 구간의 변이만 보관 (기본값: 전체 로드)')
+    parser.add_argument('--cache', action='store_true',
+                      help='변이 파일 옆에 컬럼형 캐시(<variants>.arrow)를 만들고, 원본 크기/수정 시각이 같으면 재사용 (pyarrow 필요)')
+    parser.add_argument('--summary-only', action='store_true',
+                      help='변이별 INFO 로그 대신 요약 한 줄만 출력 (기본값: False)')
+    args = parser.parse_args()
+    if not args.manifest and not (args.variants and args.targets and args.output):
+        parser.error('--manifest 또는 --variants, --targets, --output 을 모두 지정해야 합니다.')
+    return args
 
 def clean_gene_symbol(gene_symbol):
     """Gene Symbol에서 HGNC 번호를 제거합니다."""
@@ -51,97 +98,507 @@ def parse_chromosomal_interval(interval):
     chrom, start, end = match.groups()
     return chrom, int(start), int(end)
 
-def extract_variants(variants_file, targets_file, output_file, strict_trid, logger):
-    """주어진 조건에 맞는 변이를 추출합니다."""
+# 정렬 인덱스 키: (CHROM, GENE) 그룹 코드를 상위 비트, POS를 하위 비트에 둡니다.
+POS_BITS = 32
+
+def build_variant_index(variants_df):
+    """CHROM/GENE 그룹별로 POS가 정렬된 변이 인덱스를 생성합니다.
+
+    반환값은 (CHROM/GENE 그룹 MultiIndex, 정렬된 복합 키 배열, 원본 행 번호 배열)입니다.
+    복합 키는 (그룹 코드 << POS_BITS) | POS 이므로 한 번의 이진 탐색으로
+    염색체, 유전자, 위치 범위를 동시에 찾을 수 있습니다.
+    """
+    positions = pd.to_numeric(variants_df['POS'], errors='coerce')
+    valid = positions.notna() & variants_df['GENE'].notna()
+
+    chroms = variants_df['CHROM'].astype(str)[valid]
+    genes = variants_df['GENE'][valid]
+    codes, groups = pd.MultiIndex.from_arrays([chroms, genes], names=['CHROM', 'GENE']).factorize()
+
+    keys = (codes.astype(np.int64) << POS_BITS) | positions[valid].to_numpy(dtype=np.int64)
+    rows = np.flatnonzero(valid.to_numpy())
+
+    # 안정 정렬이므로 같은 키 안에서는 원본 행 순서가 유지됩니다.
+    order = np.argsort(keys, kind='stable')
+    return groups, keys[order], rows[order]
+
+def build_target_index(targets_df):
+    """평가 대상 구간을 CHROM/GENE 그룹별 복합 키 구간으로 병합한 인덱스를 생성합니다."""
+    intervals = {}
+    for gene_symbol, interval in zip(targets_df['Gene_Symbol'], targets_df['Chromosomal_interval']):
+        chrom, start_pos, end_pos = parse_chromosomal_interval(interval)
+        intervals.setdefault((chrom, clean_gene_symbol(gene_symbol)), []).append((start_pos, end_pos))
+
+    groups = pd.MultiIndex.from_tuples(list(intervals), names=['CHROM', 'GENE'])
+    starts, ends = [], []
+    for code, spans in enumerate(intervals.values()):
+        base = code << POS_BITS
+        # 겹치는 구간은 하나로 병합하여 이진 탐색 한 번으로 판정할 수 있게 합니다.
+        for start_pos, end_pos in sorted(spans):
+            if ends and base | start_pos <= ends[-1]:
+                ends[-1] = max(ends[-1], base | end_pos)
+            else:
+                starts.append(base | start_pos)
+                ends.append(base | end_pos)
+    return groups, np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+def in_target_intervals(variants_df, target_index):
+    """각 변이가 평가 대상 구간(같은 CHROM/GENE) 안에 있는지 여부를 불리언 배열로 반환합니다."""
+    groups, starts, ends = target_index
+    codes = groups.get_indexer(
+        pd.MultiIndex.from_arrays([variants_df['CHROM'].astype(str), variants_df['GENE']])
+    )
+    positions = pd.to_numeric(variants_df['POS'], errors='coerce').to_numpy()
+    valid = (codes >= 0) & ~np.isnan(positions)
+
+    keys = (codes[valid].astype(np.int64) << POS_BITS) | positions[valid].astype(np.int64)
+    slot = np.searchsorted(starts, keys, side='right') - 1
+    inside = np.zeros(len(variants_df), dtype=bool)
+    inside[valid] = (slot >= 0) & (keys <= ends[np.maximum(slot, 0)])
+    return inside
+
+def variant_cache_path(variants_file):
+    """변이 파일의 컬럼형 캐시 디렉토리 경로를 반환합니다."""
+    return Path(f"{variants_file}{CACHE_SUFFIX}")
+
+def source_signature(variants_file):
+    """캐시 유효성 판단에 쓰는 원본 파일의 크기와 수정 시각을 반환합니다."""
+    stat = os.stat(variants_file)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def is_variant_cache_valid(variants_file):
+    """컬럼형 캐시가 있고 원본 파일의 크기/수정 시각이 기록된 값과 같은지 확인합니다."""
+    source_file = variant_cache_path(variants_file) / CACHE_SOURCE_FILE
+    return source_file.exists() and json.loads(source_file.read_text()) == source_signature(variants_file)
+
+def write_variant_cache(variants_file, logger):
+    """변이 TSV를 스트리밍으로 읽어 CHROM 파티션 Arrow IPC 캐시를 기록합니다.
+
+    POS를 제외한 모든 컬럼은 문자열로 저장하여 청크마다 타입 추론이 달라지는
+    문제를 피합니다. pyarrow가 없거나 기록에 실패하면 False를 반환합니다.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.dataset as ds
+    except ImportError:
+        logger.warning("pyarrow가 설치되어 있지 않아 컬럼형 캐시를 사용하지 않습니다.")
+        return False
+
+    cache_dir = variant_cache_path(variants_file)
+    tmp_dir = Path(f"{cache_dir}.tmp-{os.getpid()}")
+    try:
+        signature = source_signature(variants_file)
+        with open(variants_file) as handle:
+            header = handle.readline().rstrip('\n').split('\t')
+        column_types = {column: pa.string() for column in header}
+        column_types['POS'] = pa.int64()
+
+        reader = pacsv.open_csv(
+            variants_file,
+            parse_options=pacsv.ParseOptions(delimiter='\t'),
+            convert_options=pacsv.ConvertOptions(column_types=column_types, null_values=NA_VALUES,
+                                                 strings_can_be_null=True),
+        )
+        ds.write_dataset(
+            reader, tmp_dir, format='ipc',
+            partitioning=ds.partitioning(pa.schema([('CHROM', pa.string())]), flavor='hive'),
+            preserve_order=True,
+        )
+        (tmp_dir / CACHE_SOURCE_FILE).write_text(json.dumps(signature))
+
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir)
+        tmp_dir.rename(cache_dir)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"컬럼형 캐시 생성 실패: {str(e)}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+
+    logger.info(f"컬럼형 캐시 생성 완료: {cache_dir}")
+    return True
+
+def read_variant_cache(variants_file, target_index, logger, gt_column=GT_COLUMN):
+    """유효한 컬럼형 캐시가 있으면 메모리 맵으로 열어 평가 대상 구간의 변이만 반환합니다.
+
+    캐시가 없거나 원본 파일의 크기/수정 시각이 달라졌으면 None을 반환합니다.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+    except ImportError:
+        return None
+
+    cache_dir = variant_cache_path(variants_file)
+    if not (cache_dir / CACHE_SOURCE_FILE).exists():
+        return None
+    if not is_variant_cache_valid(variants_file):
+        logger.info(f"원본 파일이 변경되어 컬럼형 캐시를 다시 생성합니다: {cache_dir}")
+        return None
+
+    dataset = ds.dataset(
+        cache_dir, format='ipc',
+        partitioning=ds.partitioning(pa.schema([('CHROM', pa.string())]), flavor='hive'),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+    chroms = sorted({chrom for chrom, _ in target_index[0]})
+    genes = sorted({gene for _, gene in target_index[0]})
+
+    # 평가 대상 염색체 파티션만 읽고, 유전자 조건은 Arrow에서 먼저 거른 뒤 구간 필터링
+    table = dataset.to_table(
+        columns=variant_columns(gt_column),
+        filter=ds.field('CHROM').isin(chroms) & ds.field('GENE').isin(genes),
+    )
+    variants_df = table.to_pandas()
+    variants_df = variants_df[in_target_intervals(variants_df, target_index)].reset_index(drop=True)
+    logger.info(f"컬럼형 캐시 로드 완료: {cache_dir} (평가 대상 구간 {len(variants_df)}행)")
+    return variants_df
+
+def is_vcf(variants_file):
+    """변이 파일이 bgzip VCF인지 확인합니다."""
+    return str(variants_file).endswith(VCF_SUFFIXES)
+
+def merge_target_regions(targets_df):
+    """평가 대상 구간을 염색체별로 병합하여 (CHROM, 시작, 종료) 목록으로 반환합니다."""
+    spans = sorted(parse_chromosomal_interval(interval) for interval in targets_df['Chromosomal_interval'])
+    regions = []
+    for chrom, start_pos, end_pos in spans:
+        if regions and regions[-1][0] == chrom and start_pos <= regions[-1][2]:
+            regions[-1][2] = max(regions[-1][2], end_pos)
+        else:
+            regions.append([chrom, start_pos, end_pos])
+    return regions
+
+def parse_vcf_annotation_fields(header):
+    """VCF 헤더에서 ANN(SnpEff) 또는 CSQ(VEP) 주석의 INFO 키와 필드 순서를 찾습니다."""
+    if 'ANN' in header.info:
+        return 'ANN', ANN_FIELDS
+    if 'CSQ' in header.info:
+        description = header.info['CSQ'].description
+        match = re.search(r'Format:\s*(\S+)', description)
+        if match:
+            return 'CSQ', match.group(1).strip('"').split('|')
+    raise ValueError("VCF에 ANN 또는 CSQ 주석이 없습니다.")
+
+def parse_vcf_annotation(info_key, fields, annotation):
+    """주석 한 건에서 (GENE, TRID, HGVS_C, HGVS_P)를 추출합니다."""
+    values = dict(zip(fields, annotation.split('|')))
+    if info_key == 'ANN':
+        gene, trid = values.get('Gene_Name', ''), values.get('Feature_ID', '')
+        hgvs_c, hgvs_p = values.get('HGVS.c', ''), values.get('HGVS.p', '')
+    else:
+        # VEP HGVS는 'NM_000022.4:c.36G>A' 형식이며 '='가 %3D로 인코딩될 수 있음
+        gene, trid = values.get('SYMBOL', ''), values.get('Feature', '')
+        hgvs_c = unquote(values.get('HGVSc', '')).split(':')[-1]
+        hgvs_p = unquote(values.get('HGVSp', '')).split(':')[-1]
+    return gene, trid, hgvs_c or '.', hgvs_p or '.'
+
+def format_genotype(sample):
+    """pysam 샘플 레코드의 GT를 '0/1', '1|1' 형식 문자열로 변환합니다."""
+    alleles = sample.get('GT') or ()
+    if not alleles:
+        return '.'
+    separator = '|' if sample.phased else '/'
+    return separator.join('.' if allele is None else str(allele) for allele in alleles)
+
+def load_vcf_variants(variants_file, targets_df, target_index, logger, gt_column=GT_COLUMN):
+    """bgzip VCF에서 평가 대상 구간만 인덱스로 조회하여 TSV와 같은 컬럼의 DataFrame을 만듭니다.
+
+    변이 하나의 ANN/CSQ 주석마다 한 행(전사체별 한 행)을 생성합니다. GT 컬럼
+    이름에서 '_GT'를 뗀 값을 샘플 이름으로 쓰며, 샘플이 하나뿐이면 그 샘플을 씁니다.
+    """
+    try:
+        import pysam
+    except ImportError:
+        raise ImportError("VCF 입력에는 pysam이 필요합니다: pip install pysam")
+
+    columns = variant_columns(gt_column)
+    records = []
+    with pysam.VariantFile(variants_file) as vcf:
+        info_key, fields = parse_vcf_annotation_fields(vcf.header)
+
+        samples = list(vcf.header.samples)
+        sample_name = gt_column[:-len('_GT')] if gt_column.endswith('_GT') else gt_column
+        if sample_name not in samples:
+            if len(samples) != 1:
+                raise ValueError(f"VCF에서 샘플을 찾을 수 없습니다: {sample_name} (샘플: {', '.join(samples)})")
+            sample_name = samples[0]
+
+        contigs = set(vcf.header.contigs)
+        for chrom, start_pos, end_pos in merge_target_regions(targets_df):
+            contig = f"chr{chrom}" if f"chr{chrom}" in contigs else chrom
+            if contig not in contigs:
+                continue
+            # fetch는 구간과 겹치는 레코드를 반환하므로 TSV와 같이 POS 기준으로 다시 거름
+            for record in vcf.fetch(contig, start_pos - 1, end_pos):
+                if not start_pos <= record.pos <= end_pos:
+                    continue
+                genotype = format_genotype(record.samples[sample_name])
+                for annotation in record.info.get(info_key, ()):
+                    gene, trid, hgvs_c, hgvs_p = parse_vcf_annotation(info_key, fields, annotation)
+                    records.append((chrom, record.pos, trid, gene, record.id or '.', genotype, hgvs_c, hgvs_p))
+
+    variants_df = pd.DataFrame.from_records(records, columns=columns)
+    variants_df = variants_df[in_target_intervals(variants_df, target_index)].reset_index(drop=True)
+    logger.info(f"VCF 구간 조회 완료: 주석 {len(records)}행 중 평가 대상 구간 {len(variants_df)}행 보관")
+    return variants_df
+
+def load_variants(variants_file, target_index, logger, chunksize=None, use_cache=False, gt_column=GT_COLUMN):
+    """변이 파일을 로드합니다.
+
+    chunksize가 주어지면 파일을 청크 단위로 읽으면서 결과에 쓰이는 컬럼과
+    평가 대상 구간 안의 행만 보관하므로, 메모리 사용량이 입력 크기가 아닌
+    매칭 결과 크기에 비례합니다. use_cache가 참이면 컬럼형 캐시를 먼저
+    사용하고, 캐시가 없으면 처음 읽을 때 생성합니다.
+    """
+    if use_cache:
+        variants_df = read_variant_cache(variants_file, target_index, logger, gt_column)
+        if variants_df is None and write_variant_cache(variants_file, logger):
+            variants_df = read_variant_cache(variants_file, target_index, logger, gt_column)
+        if variants_df is not None:
+            return variants_df
+
+    if not chunksize:
+        return pd.read_csv(variants_file, sep='\t', low_memory=False)
+
+    columns = variant_columns(gt_column)
+    kept = []
+    total = 0
+    reader = pd.read_csv(variants_file, sep='\t', usecols=columns,
+                         dtype={'CHROM': str}, chunksize=chunksize)
+    for chunk in reader:
+        total += len(chunk)
+        kept.append(chunk[in_target_intervals(chunk, target_index)])
+
+    variants_df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=columns)
+    logger.info(f"스트리밍 로드 완료: 전체 {total}행 중 평가 대상 구간 {len(variants_df)}행 보관")
+    return variants_df
+
+def join_targets_variants(targets_df, variants_df, strict_trid, gt_column=GT_COLUMN):
+    """평가 대상과 변이를 구간 조인한 결과를 반환합니다.
+
+    모든 평가 대상의 구간을 한 번에 이진 탐색하여 (대상, 변이) 쌍을 만든 뒤
+    평가 대상 기준으로 left-merge 하므로, 매칭이 없는 대상도 변이 컬럼이
+    비어 있는 행으로 남습니다. 반환값은 (결과 DataFrame, 대상별 매칭 변이 수)입니다.
+    """
+    groups, keys, rows = build_variant_index(variants_df)
+
+    intervals = [parse_chromosomal_interval(interval) for interval in targets_df['Chromosomal_interval']]
+    gene_symbols = [clean_gene_symbol(gene_symbol) for gene_symbol in targets_df['Gene_Symbol']]
+    codes = groups.get_indexer(pd.MultiIndex.from_tuples(
+        [(chrom, gene_symbol) for (chrom, _, _), gene_symbol in zip(intervals, gene_symbols)]
+    ))
+    start_keys = (codes.astype(np.int64) << POS_BITS) | np.array([start for _, start, _ in intervals], dtype=np.int64)
+    end_keys = (codes.astype(np.int64) << POS_BITS) | np.array([end for _, _, end in intervals], dtype=np.int64)
+
+    found = codes >= 0
+    lo = np.where(found, np.searchsorted(keys, start_keys, side='left'), 0)
+    hi = np.where(found, np.searchsorted(keys, end_keys, side='right'), 0)
+    counts = hi - lo
+
+    # 대상별 [lo, hi) 구간을 펼쳐 (대상 번호, 원본 행 번호) 쌍을 만들고 원본 행 순서로 정렬
+    target_ids = np.repeat(np.arange(len(targets_df)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    variant_rows = rows[np.repeat(lo, counts) + offsets]
+    order = np.lexsort((variant_rows, target_ids))
+    target_ids, variant_rows = target_ids[order], variant_rows[order]
+
+    matched = variants_df[variant_columns(gt_column)].iloc[variant_rows].reset_index(drop=True)
+    matched['_target'] = target_ids
+
+    # TRID 필터링 조건 (strict_trid 옵션에 따라 다름)
+    if strict_trid:
+        transcripts = targets_df['Transcript'].to_numpy()[target_ids]
+        matched = matched[matched['TRID'].to_numpy() == transcripts]
+
+    match_counts = np.bincount(matched['_target'], minlength=len(targets_df))
+    result_df = (
+        targets_df.assign(_target=np.arange(len(targets_df)))
+        .merge(matched, on='_target', how='left')
+        .drop(columns='_target')
+    )
+    return result_df, match_counts
+
+def log_variant_details(targets_df, result_df, match_counts, logger, gt_column=GT_COLUMN):
+    """평가 대상별 매칭 결과와 추출된 변이를 한 줄씩 로깅합니다."""
+    for gene_symbol, count in zip(targets_df['Gene_Symbol'], match_counts):
+        if count:
+            logger.info(f"매칭된 변이 발견: {clean_gene_symbol(gene_symbol)} - {count}개")
+        else:
+            logger.warning(f"매칭된 변이 없음: {clean_gene_symbol(gene_symbol)}")
+
+    logger.info("추출된 변이 요약:")
+    variants = result_df.loc[result_df['CHROM'].notna(), variant_columns(gt_column)]
+    for chrom, pos, trid, gene, variant_id, gt, hgvs_c, hgvs_p in variants.itertuples(index=False, name=None):
+        logger.info(f"  - CHROM: {chrom}, POS: {pos}, TRID: {trid}, GENE: {gene}, ID: {variant_id}, GT: {gt}, HGVS_C: {hgvs_c}, HGVS_P: {hgvs_p}")
+
+def log_summary(result_df, match_counts, logger):
+    """추출 결과를 요약 한 줄로 로깅합니다."""
+    matched_targets = int(np.count_nonzero(match_counts))
+    genes = result_df.loc[result_df['CHROM'].notna(), 'GENE'].nunique()
+    logger.info(
+        f"요약: 평가 대상 {len(match_counts)}개 중 {matched_targets}개 매칭 "
+        f"(매칭 없음 {len(match_counts) - matched_targets}개), "
+        f"변이 {int(match_counts.sum())}개, 유전자 {genes}개"
+    )
+
+def load_targets(targets_file):
+    """평가 대상 정보(CAP 리스트)를 로드하고 구간 인덱스와 함께 반환합니다."""
+    targets_df = pd.read_csv(targets_file, sep='\t')
+    return targets_df, build_target_index(targets_df)
+
+def extract_variants(variants_file, targets_file, output_file, strict_trid, logger, chunksize=None,
+                     summary_only=False, use_cache=False, gt_column=GT_COLUMN, targets=None):
+    """주어진 조건에 맞는 변이를 추출하고 실행 요약을 반환합니다.
+
+    targets에 load_targets의 결과를 넘기면 평가 대상 파일을 다시 읽지 않습니다.
+    """
     try:
-        # 변이 파일 로드
-        logger.info(f"변경 파일 로드 중: {variants_file}")
-        variants_df = pd.read_csv(variants_file, sep='\t', low_memory=False)
-        
         # 평가 대상 정보 로드 (CAP 리스트와 동일)
-        logger.info(f"평가 대상 정보 로드 중: {targets_file}")
-        targets_df = pd.read_csv(targets_file, sep='\t')
+        if targets is None:
+            logger.info(f"평가 대상 정보 로드 중: {targets_file}")
+            targets = load_targets(targets_file)
+        targets_df, target_index = targets
         
-        # 결과를 저장할 리스트
-        all_results = []
-        
-        # 각 평가 대상에 대해 처리
-        for _, target in targets_df.iterrows():
-            gene_symbol = clean_gene_symbol(target['Gene_Symbol'])
-            chrom, start_pos, end_pos = parse_chromosomal_interval(target['Chromosomal_interval'])
-            transcript = target['Transcript']
-            
-            # 기본 필터링 조건 (염색체, 유전자, 위치 범위)
-            base_filter = (
-                (variants_df['GENE'] == gene_symbol) &
-                (variants_df['CHROM'] == chrom) &
-                (variants_df['POS'] >= start_pos) &
-                (variants_df['POS'] <= end_pos)
-            )
-            
-            # TRID 필터링 조건 (strict_trid 옵션에 따라 다름)
-            if strict_trid:
-                trid_filter = (variants_df['TRID'] == transcript)
-                matched = variants_df[base_filter & trid_filter]
-                logger.info(f"TRID 정확히 일치하는 변이만 검색: {transcript}")
-            else:
-                # TRID 필터링 없이 기본 조건만 적용
-                matched = variants_df[base_filter]
-                logger.info(f"TRID 일치 여부와 관계없이 검색: {transcript}")
-            
-            if not matched.empty:
-                logger.info(f"매칭된 변이 발견: {gene_symbol} - {len(matched)}개")
-                # 각 매칭된 변이의 상세 정보 로깅
-                for _, row in matched.iterrows():
-                    logger.info(f"  - CHROM: {row['CHROM']}, POS: {row['POS']}, TRID: {row['TRID']}, GENE: {row['GENE']}")
-                
-                # 필요한 컬럼만 선택
-                variant_info = matched[['CHROM', 'POS', 'TRID', 'GENE', 'ID', '2025_CAP_A_GT', 'HGVS_C', 'HGVS_P']]
-                
-                # 각 변이에 대해 원본 target 정보와 결합
-                for _, variant_row in variant_info.iterrows():
-                    result_row = target.copy()
-                    # 변이 정보를 직접 할당
-                    result_row['CHROM'] = variant_row['CHROM']
-                    result_row['POS'] = variant_row['POS']
-                    result_row['TRID'] = variant_row['TRID']
-                    result_row['GENE'] = variant_row['GENE']
-                    result_row['ID'] = variant_row['ID']
-                    result_row['2025_CAP_A_GT'] = variant_row['2025_CAP_A_GT']
-                    result_row['HGVS_C'] = variant_row['HGVS_C']
-                    result_row['HGVS_P'] = variant_row['HGVS_P']
-                    all_results.append(result_row)
-            else:
-                logger.warning(f"매칭된 변이 없음: {gene_symbol}")
-                # 변이가 없는 경우에도 원본 target 정보 추가
-                all_results.append(target)
+        # 변이 파일 로드
+        logger.info(f"변경 파일 로드 중: {variants_file}")
+        if is_vcf(variants_file):
+            variants_df = load_vcf_variants(variants_file, targets_df, target_index, logger, gt_column)
+        else:
+            variants_df = load_variants(variants_file, target_index, logger, chunksize, use_cache, gt_column)
         
-        # 모든 결과를 DataFrame으로 변환
-        result_df = pd.DataFrame(all_results)
+        # 평가 대상과 변이 구간 조인 (TRID 조건은 strict_trid 옵션에 따라 다름)
+        if strict_trid:
+            logger.info("TRID 정확히 일치하는 변이만 검색")
+        else:
+            logger.info("TRID 일치 여부와 관계없이 검색")
+        result_df, match_counts = join_targets_variants(targets_df, variants_df, strict_trid, gt_column)
         
         # 결과 저장
         result_df.to_csv(output_file, sep='\t', index=False)
         logger.info(f"결과 저장 완료: {output_file}")
         
         # 변이가 있는 행 수 계산
-        variant_count = sum(1 for _, row in result_df.iterrows() if pd.notna(row.get('CHROM')))
+        variant_count = int(result_df['CHROM'].notna().sum())
         logger.info(f"총 {variant_count}개의 변이 추출됨")
         
         # 결과 요약 출력
-        logger.info("추출된 변이 요약:")
-        for _, row in result_df.iterrows():
-            if pd.notna(row.get('CHROM')):
-                logger.info(f"  - CHROM: {row['CHROM']}, POS: {row['POS']}, TRID: {row['TRID']}, GENE: {row['GENE']}, ID: {row['ID']}, GT: {row['2025_CAP_A_GT']}, HGVS_C: {row['HGVS_C']}, HGVS_P: {row['HGVS_P']}")
+        if summary_only:
+            log_summary(result_df, match_counts, logger)
+        else:
+            log_variant_details(targets_df, result_df, match_counts, logger, gt_column)
+        
+        return {
+            'n_targets': len(targets_df),
+            'n_matched_targets': int(np.count_nonzero(match_counts)),
+            'n_variants': variant_count,
+        }
             
     except Exception as e:
         logger.error(f"오류 발생: {str(e)}")
         raise
 
+def read_manifest(manifest_file):
+    """배치 모드 manifest를 읽어 작업 목록을 반환합니다."""
+    manifest_df = pd.read_csv(manifest_file, sep='\t', dtype=str)
+    missing = [column for column in MANIFEST_COLUMNS if column not in manifest_df.columns]
+    if missing:
+        raise ValueError(f"manifest에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+    return manifest_df[MANIFEST_COLUMNS].to_dict('records')
+
+# 배치 작업자 프로세스마다 한 번 전달받는 평가 대상 인덱스 (targets 파일 경로 -> load_targets 결과)
+_batch_targets = {}
+
+def init_batch_worker(targets_by_file):
+    """배치 작업자 프로세스를 초기화합니다."""
+    global _batch_targets
+    _batch_targets = targets_by_file
+    setup_logging()
+
+def prepare_batch_cache(variants_file):
+    """배치 작업 전에 변이 파일의 컬럼형 캐시를 준비합니다 (여러 작업자가 같은 캐시를 동시에 쓰지 않도록).
+
+    없는 파일은 건너뛰어 해당 작업에서 FAILED로 보고되게 합니다.
+    """
+    if not Path(variants_file).is_file():
+        return
+    if not is_vcf(variants_file) and not is_variant_cache_valid(variants_file):
+        write_variant_cache(variants_file, logging.getLogger(__name__))
+
+def run_batch_task(task, strict_trid, chunksize, use_cache):
+    """manifest 한 행을 처리하고 보고서 행을 반환합니다."""
+    logger = logging.getLogger(__name__)
+    report = dict(task)
+    started = time.perf_counter()
+    try:
+        stats = extract_variants(task['variants'], task['targets'], task['output'], strict_trid, logger,
+                                 chunksize=chunksize, summary_only=True, use_cache=use_cache,
+                                 gt_column=task['gt_column'], targets=_batch_targets[task['targets']])
+        report.update(stats, status='OK', error='')
+    except Exception as e:
+        report.update(n_targets=None, n_matched_targets=None, n_variants=None, status='FAILED',
+                      error=str(e).splitlines()[0])
+    report['elapsed_sec'] = round(time.perf_counter() - started, 3)
+    return report
+
+def run_batch(manifest_file, report_file, workers, strict_trid, logger, chunksize=None, use_cache=False):
+    """manifest의 작업을 프로세스 풀에서 병렬로 처리하고 통합 실행 보고서를 기록합니다.
+
+    평가 대상 파일은 부모 프로세스에서 파일별로 한 번만 파싱하여 각 작업자에
+    초기화 시점에 전달합니다.
+    """
+    tasks = read_manifest(manifest_file)
+    logger.info(f"배치 작업 수: {len(tasks)}, 작업자 수: {workers}")
+
+    targets_by_file = {}
+    for targets_file in dict.fromkeys(task['targets'] for task in tasks):
+        logger.info(f"평가 대상 정보 로드 중: {targets_file}")
+        targets_by_file[targets_file] = load_targets(targets_file)
+
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                             initargs=(targets_by_file,)) as executor:
+        # 같은 변이 파일을 쓰는 작업들이 캐시를 중복 생성하지 않도록 파일별로 먼저 준비
+        if use_cache:
+            list(executor.map(prepare_batch_cache, dict.fromkeys(task['variants'] for task in tasks)))
+        
+        futures = [
+            executor.submit(run_batch_task, task, strict_trid, chunksize, use_cache)
+            for task in tasks
+        ]
+        for future in as_completed(futures):
+            report = future.result()
+            if report['status'] == 'OK':
+                logger.info(f"완료: {report['output']} - 변이 {report['n_variants']}개 ({report['elapsed_sec']}초)")
+            else:
+                logger.error(f"실패: {report['output']} - {report['error']}")
+            reports.append(report)
+
+    # manifest 순서대로 보고서 기록
+    order = {task['output']: idx for idx, task in enumerate(tasks)}
+    report_df = pd.DataFrame(sorted(reports, key=lambda report: order[report['output']])).astype(
+        {'n_targets': 'Int64', 'n_matched_targets': 'Int64', 'n_variants': 'Int64'}
+    )
+    report_df.to_csv(report_file, sep='\t', index=False)
+    failed = int((report_df['status'] != 'OK').sum())
+    logger.info(f"배치 보고서 저장 완료: {report_file} (성공 {len(report_df) - failed}개, 실패 {failed}개)")
+    return failed
+
 def main():
     """메인 함수"""
     logger = setup_logging()
     args = parse_arguments()
     
+    if args.manifest:
+        if not Path(args.manifest).exists():
+            logger.error(f"manifest 파일을 찾을 수 없습니다: {args.manifest}")
+            sys.exit(1)
+        report_file = args.report or f"{Path(args.manifest).with_suffix('')}.report.tsv"
+        failed = run_batch(args.manifest, report_file, args.workers, args.strict_trid, logger,
+                           chunksize=args.chunksize, use_cache=args.cache)
+        sys.exit(1 if failed else 0)
+    
     # 입력 파일 존재 확인
     variants_path = Path(args.variants)
     targets_path = Path(args.targets)
@@ -155,7 +612,9 @@ def main():
         sys.exit(1)
     
     # 변이 추출 실행
-    extract_variants(args.variants, args.targets, args.output, args.strict_trid, logger)
+    extract_variants(args.variants, args.targets, args.output, args.strict_trid, logger,
+                     chunksize=args.chunksize, summary_only=args.summary_only, use_cache=args.cache,
+                     gt_column=args.gt_column)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RestBackend를 로컬 모의 ICA 서버에 대해 확인하는 스크립트
+
+ICA v2 REST API 일부(프로젝트/데이터 목록, 다운로드 URL, 데이터 생성)를 흉내 내는
+HTTP 서버를 띄우고, 응답 코드를 주입하여 재시도 정책과 연결 재사용을 확인합니다.
+실패한 확인이 있으면 종료 코드 1로 끝납니다.
+
+    python check_rest_backend.py
+"""
+
+import json
+import sys
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ica_data_manager.backends import Backend, RestBackend, create_backend
+
+API_KEY = 'check-api-key'
+PROJECT_ID = 'project-1'
+# 모의 서버의 프로젝트/데이터 수 (페이지 나눔 확인용)
+PROJECT_COUNT = 5
+DATA_COUNT = 7
+
+
+class MockIcaServer(ThreadingHTTPServer):
+    """요청 기록과 응답 코드 주입을 지원하는 모의 ICA 서버"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), MockIcaHandler)
+        self.requests = []
+        self.connections = set()
+        self.faults = deque()
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def inject(self, *status_codes: int) -> None:
+        """다음 요청들에 차례로 돌려줄 오류 응답 코드 설정"""
+        with self.lock:
+            self.faults.extend(status_codes)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests.clear()
+            self.connections.clear()
+            self.faults.clear()
+
+
+class MockIcaHandler(BaseHTTPRequestHandler):
+    """ICA REST 경로별 응답 처리 (keep-alive를 위해 HTTP/1.1 사용)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        server = self.server
+        with server.lock:
+            server.requests.append((method, url.path))
+            server.connections.add(self.client_address)
+            fault = server.faults.popleft() if server.faults else None
+
+        if self.headers.get('X-API-Key') != API_KEY:
+            return self._reply(401, {'message': 'unauthorized'})
+        if fault is not None:
+            return self._reply(fault, {'message': 'injected'}, {'Retry-After': '0'} if fault == 429 else {})
+
+        path = url.path[len('/ica/rest'):]
+        if method == 'GET' and path == '/api/projects':
+            return self._reply(200, self._page(
+                [{'id': f"project-{i}", 'details': {'name': f"P{i}"}} for i in range(PROJECT_COUNT)], params))
+        if method == 'GET' and path == f"/api/projects/{PROJECT_ID}/data":
+            return self._reply(200, self._page(
+                [{'data': {'id': f"fil.{i}", 'details': {'name': f"f{i}.txt", 'path': f"/f{i}.txt"}}}
+                 for i in range(DATA_COUNT)], params))
+        if method == 'POST' and path.endswith(':createDownloadUrl'):
+            return self._reply(200, {'url': f"https://example.com/{path.split('/')[-1]}"})
+        if method == 'POST' and path == f"/api/projects/{PROJECT_ID}/data":
+            request = json.loads(body)
+            return self._reply(201, {'data': {'id': 'fil.new', 'details': {
+                'name': request['name'], 'path': f"{request['folderPath']}{request['name']}"}}})
+        return self._reply(404, {'message': 'not found'})
+
+    @staticmethod
+    def _page(items, params):
+        """pageToken(다음 시작 위치) 방식의 페이지 응답"""
+        size = int(params.get('pageSize', 1000))
+        start = int(params.get('pageToken') or params.get('pageOffset') or 0)
+        page = {'items': items[start:start + size], 'totalItemCount': len(items)}
+        if start + size < len(items):
+            page['nextPageToken'] = str(start + size)
+        return page
+
+    def _reply(self, status: int, payload, headers=None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Checker:
+    """확인 결과 기록"""
+
+    def __init__(self):
+        self.failed = []
+
+    def check(self, ok: bool, message: str) -> bool:
+        print(f"{'PASS' if ok else 'FAIL'} {message}", flush=True)
+        if not ok:
+            self.failed.append(message)
+        return ok
+
+    def raises(self, error_type, func, message: str) -> None:
+        try:
+            func()
+        except error_type:
+            self.check(True, message)
+        else:
+            self.check(False, message)
+
+
+def main() -> None:
+    server = MockIcaServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    checker = Checker()
+    check = checker.check
+    backend = create_backend('rest', api_key=API_KEY, base_url=server.base_url, backoff_factor=0)
+
+    try:
+        # 주소 변환과 백엔드 선택
+        check(backend.base_url == f"{server.base_url}/ica/rest", "서버 주소에 /ica/rest를 붙임")
+        checker.raises(ValueError, lambda: create_backend('grpc'), "알 수 없는 백엔드 이름은 ValueError")
+
+        class IncompleteBackend(Backend):
+            def list_projects(self):
+                return []
+
+        checker.raises(TypeError, IncompleteBackend, "추상 메서드를 구현하지 않은 백엔드는 생성 시 TypeError")
+
+        # 페이지 나눔과 연결 재사용
+        server.reset()
+        projects = backend.list_projects()
+        check([p['id'] for p in projects] == [f"project-{i}" for i in range(PROJECT_COUNT)],
+              f"list_projects: 프로젝트 {PROJECT_COUNT}개")
+        page = backend.list_project_data_page(PROJECT_ID, page_size=3)
+        check([item['id'] for item in page['items']] == ['fil.0', 'fil.1', 'fil.2']
+              and 'details' in page['items'][0], "list_project_data_page: 항목을 icav2 출력 형태로 풀어 줌")
+        page = backend.list_project_data_page(PROJECT_ID, page_size=3, page_token=page['nextPageToken'])
+        check([item['id'] for item in page['items']] == ['fil.3', 'fil.4', 'fil.5'],
+              "list_project_data_page: pageToken으로 다음 페이지 조회")
+        for i in range(DATA_COUNT):
+            backend.get_download_url(PROJECT_ID, f"fil.{i}")
+        check(len(server.connections) == 1,
+              f"요청 {len(server.requests)}개를 연결 {len(server.connections)}개로 보냄 (keep-alive)")
+
+        # GET은 서버 오류를 재시도
+        server.reset()
+        server.inject(500, 503)
+        page = backend.list_project_data_page(PROJECT_ID, page_size=3)
+        check(len(page['items']) == 3 and len(server.requests) == 3, "GET: 500, 503 응답 후 재시도하여 성공")
+
+        # POST는 서버 오류를 재시도하지 않음 (중복 생성 방지)
+        server.reset()
+        server.inject(500)
+        checker.raises(RuntimeError, lambda: backend.create_data(PROJECT_ID, 'a.txt', '/runs/', 'FILE'),
+                       "POST: 500 응답은 RuntimeError")
+        check(len(server.requests) == 1, "POST: 500 응답은 재시도하지 않음")
+
+        # POST도 스로틀링(429)은 재시도
+        server.reset()
+        server.inject(429, 429)
+        data = backend.create_data(PROJECT_ID, 'a.txt', '/runs/', 'FILE')
+        check(data['id'] == 'fil.new' and data['details']['path'] == '/runs/a.txt' and len(server.requests) == 3,
+              "POST: 429 응답 후 재시도하여 성공")
+        server.reset()
+        server.inject(429, 429)
+        url = backend.get_download_url(PROJECT_ID, 'fil.0')
+        check(url.endswith('fil.0:createDownloadUrl') and len(server.requests) == 3,
+              "get_download_url: 429 응답 후 재시도하여 성공")
+
+        # 재시도 횟수를 넘기면 RuntimeError
+        server.reset()
+        server.inject(*[503] * 10)
+        checker.raises(RuntimeError, backend.list_projects, "GET: 재시도 횟수를 넘기면 RuntimeError")
+        check(len(server.requests) == 6, f"GET: 최초 요청 + 재시도 5회 ({len(server.requests)}개 요청)")
+
+        # 잘못된 API 키
+        server.reset()
+        other = RestBackend(api_key='wrong-key', base_url=server.base_url, backoff_factor=0)
+        checker.raises(RuntimeError, other.list_projects, "401 응답은 RuntimeError")
+        check(len(server.requests) == 1, "401 응답은 재시도하지 않음")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if checker.failed:
+        print(f"확인 {len(checker.failed)}개 실패", file=sys.stderr)
+        sys.exit(1)
+    print("모든 확인 통과")
+
+
+if __name__ == '__main__':
+    main()
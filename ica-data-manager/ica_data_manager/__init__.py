@@ -7,16 +7,45 @@ Illumina Connected Analytics (ICA) 데이터 관리를 위한 Python 패키지
 
 __version__ = "0.1.0"
 
-from .utils import verify_icav2_installation
 from .project_manager import ProjectManager, Project
 from .data_manager import DataManager, ProjectData
+from .cache import ProjectDataCache
+from .index import PathIndex
+from .backends import Backend, CliBackend, RestBackend, create_backend
+from .telemetry import DownloadResult, DownloadStatus, UploadResult, ProgressReporter
+from .search import DataFilter, search_projects
+from .sync import SyncPlan, plan_sync, run_sync
 
-# 패키지 임포트 시 ICAv2 CLI 설치 여부 확인
-verify_icav2_installation()
+# ICAv2 CLI 설치 여부는 임포트 시점이 아니라 처음 icav2를 실행할 때
+# 확인합니다 (utils.run_icav2).
+
+
+def __getattr__(name):
+    # ProjectDataTable은 numpy를 임포트하므로 처음 사용할 때 불러옴
+    if name == "ProjectDataTable":
+        from .table import ProjectDataTable
+        return ProjectDataTable
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "ProjectManager",
     "Project",
     "DataManager",
     "ProjectData",
+    "ProjectDataCache",
+    "PathIndex",
+    "ProjectDataTable",
+    "Backend",
+    "CliBackend",
+    "RestBackend",
+    "create_backend",
+    "DownloadResult",
+    "DownloadStatus",
+    "UploadResult",
+    "ProgressReporter",
+    "DataFilter",
+    "search_projects",
+    "SyncPlan",
+    "plan_sync",
+    "run_sync",
 ] 
\ No newline at end of file
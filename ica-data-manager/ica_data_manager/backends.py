@@ -0,0 +1,390 @@
+"""ICA API 호출 백엔드 모듈 (icav2 CLI / REST)"""
+
+import json
+import os
+import subprocess
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from .utils import run_icav2, run_icav2_async
+
+if TYPE_CHECKING:
+    from urllib3.util.retry import Retry
+
+
+# ICA REST API 기본 주소
+DEFAULT_BASE_URL = 'https://ica.illumina.com/ica/rest'
+# ICA v2 REST API 응답 형식
+ICA_MEDIA_TYPE = 'application/vnd.illumina.v3+json'
+# icav2 CLI 설정 파일 (REST 백엔드의 API 키/서버 주소 기본값)
+ICAV2_CONFIG = Path.home() / '.icav2' / 'config.yaml'
+# 재시도할 응답 코드 (스로틀링/서버 과부하)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# 요청 타임아웃 (연결, 읽기) 초
+REQUEST_TIMEOUT = (10, 120)
+
+
+def _make_retry(**kwargs) -> "Retry":
+    """
+    POST는 연결 오류와 429 응답만 재시도하는 urllib3 Retry 생성
+
+    POST(데이터 생성 등)는 서버가 처리한 뒤 응답만 실패했을 수 있으므로 읽기
+    오류나 5xx 응답에서 다시 보내면 같은 항목이 중복 생성될 수 있습니다. 연결
+    오류와 스로틀링(429)은 요청이 처리되지 않았으므로 메서드와 관계없이 재시도합니다.
+    """
+    from urllib3.util.retry import Retry
+
+    class _Retry(Retry):
+        def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+            if status_code == 429 and self.total:
+                return True
+            return super().is_retry(method, status_code, has_retry_after)
+
+    return _Retry(**kwargs)
+
+
+class Backend(ABC):
+    """
+    ICA API 호출 백엔드 인터페이스
+
+    모든 백엔드는 icav2 --output-format json과 같은 형태의 응답
+    (항목마다 'id'와 'details')을 반환하므로 파싱 코드는 백엔드와 무관합니다.
+    추상 메서드를 모두 구현하지 않은 백엔드는 생성 시점에 TypeError가 발생합니다.
+    """
+
+    name = ''
+
+    @abstractmethod
+    def list_projects(self) -> List[Dict[str, Any]]:
+        """
+        전체 프로젝트 목록 조회
+
+        Returns:
+            List[Dict[str, Any]]: 프로젝트 항목 목록
+
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        ...
+
+    @abstractmethod
+    def list_project_data_page(self, project_id: str, page_size: int, page_offset: int = 0,
+                               page_token: Optional[str] = None, parent_folder: Optional[str] = None,
+                               sort_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        프로젝트 데이터 목록 한 페이지 조회
+
+        Args:
+            project_id: 프로젝트 ID
+            page_size: 페이지당 항목 수
+            page_offset: 페이지 시작 위치 (page_token이 없을 때 사용)
+            page_token: 이전 응답의 nextPageToken
+            parent_folder: 이 폴더 바로 아래 항목만 조회
+            sort_by: 정렬 기준 (예: 'timeModified desc')
+
+        Returns:
+            Dict[str, Any]: {'items': [...], 'nextPageToken': ...} 형태의 응답
+
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        ...
+
+    async def alist_project_data_page(self, project_id: str, page_size: int, page_offset: int = 0,
+                                      page_token: Optional[str] = None, parent_folder: Optional[str] = None,
+                                      sort_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        list_project_data_page의 asyncio 버전
+
+        기본 구현은 동기 호출을 스레드에서 실행합니다.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.list_project_data_page, project_id, page_size,
+                                       page_offset, page_token, parent_folder, sort_by)
+
+    @abstractmethod
+    def get_download_url(self, project_id: str, data_id: str) -> str:
+        """
+        파일의 presigned 다운로드 URL 발급
+
+        Raises:
+            RuntimeError: 발급 실패시
+        """
+        ...
+
+    @abstractmethod
+    def create_data(self, project_id: str, name: str, folder_path: str, data_type: str) -> Dict[str, Any]:
+        """
+        프로젝트에 폴더 또는 (내용이 빈) 파일 생성
+
+        Args:
+            project_id: 프로젝트 ID
+            name: 폴더/파일 이름
+            folder_path: 상위 폴더 경로 (예: '/runs/RUN1/')
+            data_type: 'FOLDER' 또는 'FILE'
+
+        Returns:
+            Dict[str, Any]: 생성된 항목 ('id'와 'details')
+
+        Raises:
+            RuntimeError: 생성 실패시
+        """
+        ...
+
+    @abstractmethod
+    def get_temporary_credentials(self, project_id: str, data_id: str) -> Dict[str, Any]:
+        """
+        파일 업로드용 임시 AWS 자격 증명 발급
+
+        Returns:
+            Dict[str, Any]: accessKey, secretKey, sessionToken, region, bucket, objectPrefix
+
+        Raises:
+            RuntimeError: 발급 실패시
+        """
+        ...
+
+
+class CliBackend(Backend):
+    """icav2 CLI를 subprocess로 실행하는 백엔드"""
+
+    name = 'cli'
+
+    def list_projects(self) -> List[Dict[str, Any]]:
+        try:
+            result = run_icav2(['projects', 'list', '--output-format', 'json'])
+            return json.loads(result.stdout).get('items', [])
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"프로젝트 목록 조회 실패: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"프로젝트 데이터 파싱 실패: {str(e)}")
+
+    @staticmethod
+    def _projectdata_list_args(project_id: str, page_size: int, page_offset: int, page_token: Optional[str],
+                               parent_folder: Optional[str], sort_by: Optional[str]) -> List[str]:
+        """icav2 projectdata list 인자 목록"""
+        args = ['projectdata', 'list',
+                '--project-id', project_id,
+                '--output-format', 'json',
+                '--page-size', str(page_size)]
+        if page_token:
+            args += ['--page-token', page_token]
+        else:
+            args += ['--page-offset', str(page_offset)]
+        if parent_folder:
+            args += ['--parent-folder', parent_folder]
+        if sort_by:
+            args += ['--sort-by', sort_by]
+        return args
+
+    def list_project_data_page(self, project_id: str, page_size: int, page_offset: int = 0,
+                               page_token: Optional[str] = None, parent_folder: Optional[str] = None,
+                               sort_by: Optional[str] = None) -> Dict[str, Any]:
+        args = self._projectdata_list_args(project_id, page_size, page_offset, page_token, parent_folder, sort_by)
+        try:
+            return json.loads(run_icav2(args).stdout)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"프로젝트 데이터 목록 조회 실패: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"프로젝트 데이터 파싱 실패: {str(e)}")
+
+    async def alist_project_data_page(self, project_id: str, page_size: int, page_offset: int = 0,
+                                      page_token: Optional[str] = None, parent_folder: Optional[str] = None,
+                                      sort_by: Optional[str] = None) -> Dict[str, Any]:
+        """icav2를 asyncio 하위 프로세스로 실행하여 스레드 없이 동시에 조회"""
+        args = self._projectdata_list_args(project_id, page_size, page_offset, page_token, parent_folder, sort_by)
+        try:
+            return json.loads(await run_icav2_async(args))
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"프로젝트 데이터 목록 조회 실패: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"프로젝트 데이터 파싱 실패: {str(e)}")
+
+    def get_download_url(self, project_id: str, data_id: str) -> str:
+        try:
+            return run_icav2(['projectdata', 'downloadurl', data_id,
+                              '--project-id', project_id]).stdout.strip()
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"다운로드 URL 발급 실패: {str(e)}")
+
+    def create_data(self, project_id: str, name: str, folder_path: str, data_type: str) -> Dict[str, Any]:
+        try:
+            result = run_icav2(['projectdata', 'create', name,
+                                '--project-id', project_id,
+                                '--data-type', data_type,
+                                '--folder', folder_path,
+                                '--output-format', 'json'])
+            return json.loads(result.stdout)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"데이터 생성 실패 ({folder_path}{name}): {e.stderr or str(e)}")
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"데이터 생성 응답 파싱 실패: {str(e)}")
+
+    def get_temporary_credentials(self, project_id: str, data_id: str) -> Dict[str, Any]:
+        try:
+            result = run_icav2(['projectdata', 'temporarycredentials', data_id,
+                                '--project-id', project_id,
+                                '--output-format', 'json'])
+            response = json.loads(result.stdout)
+            return response.get('awsTempCredentials', response)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"임시 자격 증명 발급 실패: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"임시 자격 증명 파싱 실패: {str(e)}")
+
+
+class RestBackend(Backend):
+    """
+    ICA v2 REST API를 직접 호출하는 백엔드
+
+    keep-alive 연결 풀을 쓰는 requests.Session 하나로 모든 요청을 보내므로
+    요청마다 프로세스 실행, 인증, TLS 연결 비용이 들지 않습니다. 스로틀링이나
+    서버 오류 응답과 연결 오류는 지수 백오프로 재시도하며, 멱등이 아닌 POST는
+    서버가 처리하지 않은 연결 오류와 429 응답만 재시도합니다.
+
+    API 키와 서버 주소는 인자, 환경 변수(ICAV2_X_API_KEY, ICAV2_SERVER_URL),
+    icav2 설정 파일(~/.icav2/config.yaml) 순서로 찾습니다.
+    """
+
+    name = 'rest'
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_connections: int = 16, retries: int = 5, backoff_factor: float = 0.5):
+        """
+        Args:
+            api_key: ICA API 키
+            base_url: REST API 주소 (예: https://ica.illumina.com/ica/rest)
+            max_connections: 연결 풀 크기
+            retries: 요청당 최대 재시도 횟수
+            backoff_factor: 재시도 대기 시간 계수 (backoff_factor * 2^(재시도 - 1)초)
+
+        Raises:
+            RuntimeError: API 키를 찾을 수 없는 경우
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        config = self._read_icav2_config()
+        api_key = api_key or os.environ.get('ICAV2_X_API_KEY') or config.get('x-api-key')
+        if not api_key:
+            raise RuntimeError("ICA API 키가 없습니다. ICAV2_X_API_KEY 환경 변수나 ~/.icav2/config.yaml의 "
+                               "x-api-key를 설정하세요.")
+        self.base_url = self._normalize_base_url(
+            base_url or os.environ.get('ICAV2_SERVER_URL') or config.get('server-url') or DEFAULT_BASE_URL
+        )
+
+        retry = _make_retry(total=retries, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUS_CODES,
+                            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS, respect_retry_after_header=True,
+                            raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'X-API-Key': api_key, 'Accept': ICA_MEDIA_TYPE})
+
+    @staticmethod
+    def _read_icav2_config() -> Dict[str, str]:
+        """icav2 설정 파일 읽기 (없으면 빈 딕셔너리)"""
+        if not ICAV2_CONFIG.exists():
+            return {}
+        import yaml
+        with open(ICAV2_CONFIG) as f:
+            return yaml.safe_load(f) or {}
+
+    @staticmethod
+    def _normalize_base_url(base_url: str) -> str:
+        """'ica.illumina.com' 같은 서버 주소를 REST API 주소로 변환"""
+        if '://' not in base_url:
+            base_url = f"https://{base_url}"
+        base_url = base_url.rstrip('/')
+        if not base_url.endswith('/ica/rest'):
+            base_url += '/ica/rest'
+        return base_url
+
+    def _request(self, method: str, path: str, error_message: str, **kwargs) -> Dict[str, Any]:
+        """REST API 호출 후 JSON 응답 반환"""
+        import requests
+
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", timeout=REQUEST_TIMEOUT, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            raise RuntimeError(f"{error_message}: {str(e)}")
+        except ValueError as e:
+            raise RuntimeError(f"{error_message} (응답 파싱 실패): {str(e)}")
+
+    def list_projects(self) -> List[Dict[str, Any]]:
+        items = []
+        page_token = None
+        while True:
+            params = {'pageSize': 1000}
+            if page_token:
+                params['pageToken'] = page_token
+            response = self._request('GET', '/api/projects', "프로젝트 목록 조회 실패", params=params)
+            items.extend(response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token or not response.get('items'):
+                return items
+
+    def list_project_data_page(self, project_id: str, page_size: int, page_offset: int = 0,
+                               page_token: Optional[str] = None, parent_folder: Optional[str] = None,
+                               sort_by: Optional[str] = None) -> Dict[str, Any]:
+        params = {'pageSize': page_size}
+        if page_token:
+            params['pageToken'] = page_token
+        else:
+            params['pageOffset'] = page_offset
+        if parent_folder:
+            params['parentFolderPath'] = parent_folder
+        if sort_by:
+            params['sort'] = sort_by
+
+        response = self._request('GET', f"/api/projects/{project_id}/data",
+                                 "프로젝트 데이터 목록 조회 실패", params=params)
+        # REST 응답은 항목을 {'data': {'id', 'details'}}로 감싸므로 icav2 출력 형태로 풀어 줌
+        response['items'] = [item.get('data', item) for item in response.get('items', [])]
+        return response
+
+    def get_download_url(self, project_id: str, data_id: str) -> str:
+        response = self._request('POST', f"/api/projects/{project_id}/data/{data_id}:createDownloadUrl",
+                                 "다운로드 URL 발급 실패")
+        return response['url']
+
+    def create_data(self, project_id: str, name: str, folder_path: str, data_type: str) -> Dict[str, Any]:
+        response = self._request('POST', f"/api/projects/{project_id}/data",
+                                 f"데이터 생성 실패 ({folder_path}{name})",
+                                 json={'name': name, 'folderPath': folder_path, 'dataType': data_type},
+                                 headers={'Content-Type': ICA_MEDIA_TYPE})
+        return response.get('data', response)
+
+    def get_temporary_credentials(self, project_id: str, data_id: str) -> Dict[str, Any]:
+        response = self._request('POST', f"/api/projects/{project_id}/data/{data_id}:createTemporaryCredentials",
+                                 "임시 자격 증명 발급 실패", json={}, headers={'Content-Type': ICA_MEDIA_TYPE})
+        return response['awsTempCredentials']
+
+
+# --backend 옵션 값별 백엔드 클래스
+BACKENDS = {
+    CliBackend.name: CliBackend,
+    RestBackend.name: RestBackend,
+}
+
+
+def create_backend(name: str = CliBackend.name, **kwargs) -> Backend:
+    """
+    이름으로 백엔드 생성
+
+    Args:
+        name: 백엔드 이름 ('cli' 또는 'rest')
+        **kwargs: 백엔드 생성자 인자
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름인 경우
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
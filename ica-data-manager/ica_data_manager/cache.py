@@ -0,0 +1,199 @@
+"""ICA 프로젝트 데이터 목록 로컬 캐시 모듈"""
+
+import json
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+
+from .data_manager import ProjectData
+from .index import prefix_upper_bound
+from .utils import default_cache_dir
+
+
+# 이 시간(초) 이내에 조회한 목록은 ICA에 다시 묻지 않고 캐시에서 반환
+DEFAULT_TTL = 600
+# 증분 갱신으로는 삭제된 항목을 알 수 없으므로 이 주기(초)마다 전체 목록을 다시 조회
+FULL_REFRESH_INTERVAL = 24 * 60 * 60
+# 테이블 구조가 바뀌면 올림 (이전 버전의 캐시는 지우고 새로 만듦)
+SCHEMA_VERSION = 2
+
+
+class ProjectDataCache:
+    """프로젝트별 ProjectData 목록을 SQLite에 보관하는 캐시 클래스"""
+
+    def __init__(self, db_path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 full_refresh_interval: float = FULL_REFRESH_INTERVAL):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본값: <캐시 디렉토리>/project_data.sqlite)
+            ttl: 캐시된 목록을 그대로 사용하는 시간(초)
+            full_refresh_interval: 전체 목록을 다시 조회하는 주기(초)
+        """
+        if db_path is None:
+            default_cache_dir().mkdir(parents=True, exist_ok=True)
+            db_path = str(default_cache_dir() / 'project_data.sqlite')
+        self.db_path = db_path
+        self.ttl = ttl
+        self.full_refresh_interval = full_refresh_interval
+        self._conn = sqlite3.connect(db_path)
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._conn.executescript(
+                f"""
+                DROP TABLE IF EXISTS project_data;
+                DROP TABLE IF EXISTS listing_state;
+                PRAGMA user_version = {SCHEMA_VERSION};
+                """
+            )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS project_data (
+                project_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                name TEXT,
+                data_type TEXT,
+                path TEXT,
+                file_size INTEGER,
+                format TEXT,
+                status TEXT,
+                creator_id TEXT,
+                time_created TEXT,
+                time_modified TEXT,
+                owning_project_id TEXT,
+                project_name TEXT,
+                tags TEXT,
+                object_etag TEXT,
+                PRIMARY KEY (project_id, id)
+            );
+            CREATE INDEX IF NOT EXISTS project_data_path ON project_data (project_id, path);
+            CREATE TABLE IF NOT EXISTS listing_state (
+                project_id TEXT PRIMARY KEY,
+                full_refreshed_at REAL NOT NULL,
+                refreshed_at REAL NOT NULL,
+                high_water TEXT NOT NULL
+            );
+            """
+        )
+
+    def _state(self, project_id: str) -> Optional[Tuple[float, float, str]]:
+        """프로젝트의 (full_refreshed_at, refreshed_at, high_water) 조회"""
+        return self._conn.execute(
+            'SELECT full_refreshed_at, refreshed_at, high_water FROM listing_state WHERE project_id = ?',
+            (project_id,)
+        ).fetchone()
+
+    def is_fresh(self, project_id: str) -> bool:
+        """TTL 이내에 갱신된 목록이 있는지 확인"""
+        state = self._state(project_id)
+        return state is not None and time.time() - state[1] < self.ttl
+
+    def needs_full_refresh(self, project_id: str) -> bool:
+        """캐시가 없거나 전체 갱신 주기가 지났는지 확인"""
+        state = self._state(project_id)
+        return state is None or time.time() - state[0] >= self.full_refresh_interval
+
+    def high_water(self, project_id: str) -> str:
+        """캐시에 저장된 가장 최근 수정 시각 (없으면 빈 문자열)"""
+        state = self._state(project_id)
+        return state[2] if state else ''
+
+    def load(self, project_id: str, path: Optional[str] = None) -> List[ProjectData]:
+        """
+        캐시된 데이터 목록 반환 (경로순)
+
+        path가 주어지면 (project_id, path) 인덱스의 범위 검색으로 해당 경로
+        아래 항목만 읽습니다.
+
+        Args:
+            project_id: 프로젝트 ID
+            path: 경로 접두사
+
+        Returns:
+            List[ProjectData]: 데이터 목록
+        """
+        query = """
+            SELECT id, name, data_type, path, file_size, format, status, creator_id,
+                   time_created, time_modified, owning_project_id, project_name, tags, object_etag
+            FROM project_data WHERE project_id = ?
+        """
+        params = [project_id]
+        if path:
+            query += ' AND path >= ? AND path < ?'
+            params += [path, prefix_upper_bound(path)]
+        rows = self._conn.execute(query + ' ORDER BY path', params)
+        return [
+            ProjectData(
+                id=row[0],
+                name=row[1],
+                data_type=row[2],
+                path=row[3],
+                file_size=row[4],
+                format=row[5],
+                status=row[6],
+                creator_id=row[7],
+                time_created=row[8],
+                time_modified=row[9],
+                project_id=row[10],
+                project_name=row[11],
+                tags=json.loads(row[12]),
+                object_etag=row[13]
+            )
+            for row in rows
+        ]
+
+    def replace(self, project_id: str, data_list: List[ProjectData]) -> None:
+        """
+        전체 목록 조회 결과로 프로젝트 캐시를 교체
+
+        Args:
+            project_id: 프로젝트 ID
+            data_list: 전체 데이터 목록
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.execute('DELETE FROM project_data WHERE project_id = ?', (project_id,))
+            self._insert(project_id, data_list)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO listing_state VALUES (?, ?, ?, ?)',
+                (project_id, now, now, max((d.time_modified for d in data_list), default=''))
+            )
+
+    def upsert(self, project_id: str, data_list: List[ProjectData]) -> None:
+        """
+        증분 조회 결과(수정된 항목)를 캐시에 반영
+
+        Args:
+            project_id: 프로젝트 ID
+            data_list: 마지막 조회 이후 수정된 데이터 목록
+        """
+        with self._conn:
+            self._insert(project_id, data_list)
+            self._conn.execute(
+                'UPDATE listing_state SET refreshed_at = ?, high_water = MAX(high_water, ?) WHERE project_id = ?',
+                (time.time(), max((d.time_modified for d in data_list), default=''), project_id)
+            )
+
+    def expire(self, project_id: str) -> None:
+        """다음 조회 때 증분 갱신하도록 TTL을 만료시킴 (업로드 등으로 원격 목록이 바뀐 경우)"""
+        with self._conn:
+            self._conn.execute('UPDATE listing_state SET refreshed_at = 0 WHERE project_id = ?', (project_id,))
+
+    def clear(self, project_id: Optional[str] = None) -> None:
+        """프로젝트 캐시 삭제 (project_id가 없으면 전체 삭제)"""
+        with self._conn:
+            if project_id is None:
+                self._conn.execute('DELETE FROM project_data')
+                self._conn.execute('DELETE FROM listing_state')
+            else:
+                self._conn.execute('DELETE FROM project_data WHERE project_id = ?', (project_id,))
+                self._conn.execute('DELETE FROM listing_state WHERE project_id = ?', (project_id,))
+
+    def _insert(self, project_id: str, data_list: List[ProjectData]) -> None:
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO project_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (project_id, d.id, d.name, d.data_type, d.path, d.file_size, d.format, d.status,
+                 d.creator_id, d.time_created, d.time_modified, d.project_id, d.project_name,
+                 json.dumps(d.tags), d.object_etag)
+                for d in data_list
+            ]
+        )
@@ -1,14 +1,42 @@
 
+import os
+import time
 import click
-from typing import Optional
+from typing import Optional, Tuple
 from .project_manager import ProjectManager
-from .data_manager import DataManager
+from .data_manager import DataManager, DEFAULT_PAGE_SIZE
+from .cache import ProjectDataCache, DEFAULT_TTL
+from .telemetry import ProgressReporter, format_size, format_duration, writes_to_stdout
+from .search import DataFilter, DEFAULT_SEARCH_CONCURRENCY, parse_size, search_projects
+from .sync import SYNC_REASONS, plan_sync, run_sync
+from .backends import BACKENDS, create_backend
+
+
+def cache_options(func):
+    """데이터 목록 조회/캐시 관련 공통 옵션"""
+    func = click.option('--page-size', default=DEFAULT_PAGE_SIZE, show_default=True,
+                        help='목록 조회 시 페이지당 항목 수')(func)
+    func = click.option('--cache-ttl', default=DEFAULT_TTL, show_default=True,
+                        help='캐시된 목록을 그대로 사용하는 시간(초)')(func)
+    func = click.option('--refresh', is_flag=True, help='캐시를 무시하고 전체 목록을 다시 조회하여 캐시 갱신')(func)
+    func = click.option('--no-cache', is_flag=True, help='캐시를 사용하지 않고 전체 목록 조회')(func)
+    return func
+
+
+def create_data_manager(backend: str, no_cache: bool, cache_ttl: float, page_size: int) -> DataManager:
+    """백엔드/캐시 옵션에 따라 DataManager 생성"""
+    return DataManager(cache=None if no_cache else ProjectDataCache(ttl=cache_ttl), page_size=page_size,
+                       backend=create_backend(backend))
 
 
 @click.group()
-def cli():
+@click.option('--backend', type=click.Choice(list(BACKENDS)), default='cli', show_default=True,
+              envvar='ICA_MANAGER_BACKEND',
+              help='ICA 호출 방식: cli(icav2 실행) 또는 rest(REST API 직접 호출, ICAV2_X_API_KEY 필요)')
+@click.pass_context
+def cli(ctx, backend: str):
     """ICA (Illumina Connected Analytics) 데이터 관리 도구"""
-    pass
+    ctx.obj = {'backend': backend}
 
 
 @cli.group()
@@ -19,10 +47,11 @@ def projects():
 
 @projects.command('list')
 @click.option('--details', is_flag=True, help='상세 정보 표시')
-def list_projects(details: bool):
+@click.pass_obj
+def list_projects(obj, details: bool):
     """프로젝트 목록 조회"""
     try:
-        manager = ProjectManager()
+        manager = ProjectManager(backend=create_backend(obj['backend']))
         projects = manager.list_projects()
         manager.display_projects(projects)
     except Exception as e:
@@ -40,14 +69,15 @@ def data():
 @click.option('--project-id', required=True, help='프로젝트 ID')
 @click.option('--path', default='/', help='조회할 경로')
 @click.option('--details', is_flag=True, help='상세 정보 표시')
-def list_data(project_id: str, path: str, details: bool):
+@cache_options
+@click.pass_obj
+def list_data(obj, project_id: str, path: str, details: bool, no_cache: bool, refresh: bool, cache_ttl: float,
+              page_size: int):
     """프로젝트 데이터 목록 조회"""
     try:
-        manager = DataManager()
-        data_list = manager.list_project_data(project_id)
-        
-        if path != '/':
-            data_list = manager.get_data_by_path(data_list, path)
+        manager = create_data_manager(obj['backend'], no_cache, cache_ttl, page_size)
+        data_list = manager.iter_project_data(project_id, refresh=refresh,
+                                              path=None if path == '/' else path)
         
         manager.display_project_data(data_list, show_details=details)
     except Exception as e:
@@ -55,22 +85,192 @@ def list_data(project_id: str, path: str, details: bool):
         raise click.Abort()
 
 
+class SizeParamType(click.ParamType):
+    """'200M', '1.5G' 같은 크기 옵션"""
+    name = 'size'
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+        try:
+            return parse_size(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+@data.command('search')
+@click.option('--name', default=None, help="파일 이름 glob 패턴 (예: '*_R1*.fq.gz')")
+@click.option('--format', 'formats', multiple=True, help='데이터 형식 (예: FASTQ, 여러 번 지정 가능)')
+@click.option('--min-size', type=SizeParamType(), default=None, help='최소 크기 (예: 100M)')
+@click.option('--max-size', type=SizeParamType(), default=None, help='최대 크기 (예: 2G)')
+@click.option('--path', default=None, help='경로 접두사 (예: /sequencing_data/)')
+@click.option('--include-folders', is_flag=True, help='폴더도 검색')
+@click.option('--project-id', 'project_ids', multiple=True,
+              help='검색할 프로젝트 ID (여러 번 지정 가능, 없으면 활성 프로젝트 전체)')
+@click.option('--concurrency', default=DEFAULT_SEARCH_CONCURRENCY, show_default=True,
+              help='동시에 목록을 조회하는 프로젝트 수')
+@click.option('--limit', default=None, type=int, help='이 개수만큼 찾으면 검색 중단')
+@click.option('--page-size', default=DEFAULT_PAGE_SIZE, show_default=True, help='목록 조회 시 페이지당 항목 수')
+@click.pass_obj
+def search_data(obj, name: Optional[str], formats: Tuple[str, ...], min_size: Optional[int],
+                max_size: Optional[int], path: Optional[str], include_folders: bool,
+                project_ids: Tuple[str, ...], concurrency: int, limit: Optional[int], page_size: int):
+    """여러 프로젝트의 데이터를 동시에 조회하여 조건에 맞는 항목 검색 (찾는 대로 출력)"""
+    import asyncio
+    from contextlib import aclosing
+
+    try:
+        backend = create_backend(obj['backend'])
+        if not project_ids:
+            project_ids = [project.id for project in ProjectManager(backend=backend).list_projects()
+                           if project.active]
+        manager = DataManager(page_size=page_size, backend=backend)
+        data_filter = DataFilter(name=name, formats=formats, min_size=min_size, max_size=max_size,
+                                 path=path, files_only=not include_folders)
+
+        def report_error(project_id: str, error: Exception) -> None:
+            click.echo(f"오류: 프로젝트 {project_id}: {str(error)}", err=True)
+
+        async def run() -> Tuple[int, int]:
+            count = total_size = 0
+            # 도중에 멈추면(--limit) 남은 프로젝트 조회를 바로 취소하도록 aclosing 사용
+            async with aclosing(search_projects(manager, project_ids, data_filter, max_concurrency=concurrency,
+                                                on_error=report_error)) as results:
+                async for data in results:
+                    click.echo(f"{data.project_name}\t{data.file_size_readable}\t{data.path}")
+                    count += 1
+                    total_size += data.file_size
+                    if limit is not None and count >= limit:
+                        break
+            return count, total_size
+
+        started = time.monotonic()
+        count, total_size = asyncio.run(run())
+        click.echo(f"검색 완료: 프로젝트 {len(project_ids)}개, 일치 {count}개 ({format_size(total_size)}), "
+                   f"소요 시간 {format_duration(time.monotonic() - started)}", err=True)
+    except Exception as e:
+        click.echo(f"오류: {str(e)}", err=True)
+        raise click.Abort()
+
+
 @data.command('download-fastq')
 @click.option('--project-id', required=True, help='프로젝트 ID')
 @click.option('--path', required=True, help='FASTQ 파일이 있는 경로')
 @click.option('--output-dir', required=True, help='저장할 디렉토리 경로')
-@click.option('--workers', default=4, help='동시 다운로드 수 (기본값: 4)')
-def download_fastq(project_id: str, path: str, output_dir: str, workers: int):
+@click.option('--workers', default=4, help='동시 다운로드 파일 수 (기본값: 4)')
+@click.option('--connections', default=8,
+              help='모든 파일을 합친 동시 byte 범위 요청 수 상한, 실제 값은 처리량에 따라 자동 조절 (기본값: 8)')
+@click.option('--event-log', type=click.File('a'), default=None,
+              help='진행 상황/파일별 결과를 JSON-lines로 기록할 파일 (- 이면 표준 출력)')
+@click.option('--no-progress', is_flag=True, help='진행 막대 숨김')
+@cache_options
+@click.pass_obj
+def download_fastq(obj, project_id: str, path: str, output_dir: str, workers: int, connections: int,
+                   event_log, no_progress: bool,
+                   no_cache: bool, refresh: bool, cache_ttl: float, page_size: int):
     """FASTQ 파일 다운로드"""
     try:
-        manager = DataManager()
-        data_list = manager.list_project_data(project_id)
+        manager = create_data_manager(obj['backend'], no_cache, cache_ttl, page_size)
+        data_list = manager.iter_project_data(project_id, refresh=refresh, path=path)
         manager.download_fastq_files(
             project_id=project_id,
             data_list=data_list,
             path=path,
             output_dir=output_dir,
-            max_workers=workers
+            max_workers=workers,
+            max_connections=connections,
+            progress=ProgressReporter(event_log=event_log, show_progress=False if no_progress else None)
+        )
+    except Exception as e:
+        click.echo(f"오류: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@data.command('upload')
+@click.option('--project-id', required=True, help='프로젝트 ID')
+@click.option('--source', required=True, type=click.Path(exists=True),
+              help='업로드할 로컬 디렉토리 또는 매니페스트 파일 (한 줄에 <로컬 경로>[TAB<ICA 경로>])')
+@click.option('--remote-path', required=True, help='업로드할 ICA 폴더 (예: /runs/RUN1/)')
+@click.option('--workers', default=4, help='동시 업로드 파일 수 (기본값: 4)')
+@click.option('--connections', default=8,
+              help='모든 파일을 합친 동시 파트 요청 수 상한, 실제 값은 처리량에 따라 자동 조절 (기본값: 8)')
+@click.option('--checksum', is_flag=True, help='이미 있는 파일은 크기와 함께 ETag(MD5)도 비교')
+@click.option('--event-log', type=click.File('a'), default=None,
+              help='진행 상황/파일별 결과를 JSON-lines로 기록할 파일 (- 이면 표준 출력)')
+@click.option('--no-progress', is_flag=True, help='진행 막대 숨김')
+@cache_options
+@click.pass_obj
+def upload(obj, project_id: str, source: str, remote_path: str, workers: int, connections: int, checksum: bool,
+           event_log, no_progress: bool, no_cache: bool, refresh: bool, cache_ttl: float, page_size: int):
+    """로컬 디렉토리/매니페스트의 파일을 ICA로 업로드 (폴더 구조 유지, 이어올리기)"""
+    from .uploader import iter_directory, read_manifest
+    
+    try:
+        manager = create_data_manager(obj['backend'], no_cache, cache_ttl, page_size)
+        if os.path.isdir(source):
+            sources = iter_directory(source, remote_path)
+        else:
+            sources = read_manifest(source, remote_path)
+        manager.upload_files(
+            project_id=project_id,
+            sources=sources,
+            remote_folder=remote_path,
+            max_workers=workers,
+            max_connections=connections,
+            checksum=checksum,
+            refresh=refresh,
+            progress=ProgressReporter(event_log=event_log, show_progress=False if no_progress else None)
+        )
+    except Exception as e:
+        click.echo(f"오류: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@data.command('sync')
+@click.option('--project-id', required=True, help='프로젝트 ID')
+@click.option('--remote-path', required=True, help='동기화할 ICA 폴더 (예: /runs/RUN1/)')
+@click.option('--local-dir', required=True, help='미러링할 로컬 디렉토리 (하위 폴더 구조 유지)')
+@click.option('--include', multiple=True,
+              help="포함할 glob 패턴, 여러 번 지정 가능 ('/'가 없으면 파일 이름, 있으면 상대 경로에 적용)")
+@click.option('--exclude', multiple=True, help='제외할 glob 패턴, 여러 번 지정 가능')
+@click.option('--checksum', is_flag=True, help='크기가 같은 파일은 수정 시각 대신 ETag(MD5)로 비교')
+@click.option('--dry-run', is_flag=True, help='받을 파일과 전송량만 출력하고 다운로드하지 않음')
+@click.option('--workers', default=4, help='동시 다운로드 파일 수 (기본값: 4)')
+@click.option('--connections', default=8,
+              help='모든 파일을 합친 동시 byte 범위 요청 수 상한, 실제 값은 처리량에 따라 자동 조절 (기본값: 8)')
+@click.option('--event-log', type=click.File('a'), default=None,
+              help='진행 상황/파일별 결과를 JSON-lines로 기록할 파일 (- 이면 표준 출력)')
+@click.option('--no-progress', is_flag=True, help='진행 막대 숨김')
+@cache_options
+@click.pass_obj
+def sync(obj, project_id: str, remote_path: str, local_dir: str, include: Tuple[str, ...],
+         exclude: Tuple[str, ...], checksum: bool, dry_run: bool, workers: int, connections: int,
+         event_log, no_progress: bool, no_cache: bool, refresh: bool, cache_ttl: float, page_size: int):
+    """ICA 폴더를 로컬 디렉토리로 미러링 (바뀐 파일만 받음)"""
+    try:
+        manager = create_data_manager(obj['backend'], no_cache, cache_ttl, page_size)
+        data_list = manager.iter_project_data(project_id, refresh=refresh, path=remote_path)
+        plan = plan_sync(data_list, remote_path, local_dir, include=include, exclude=exclude, checksum=checksum)
+        
+        if dry_run:
+            for entry in sorted(plan.transfers, key=lambda entry: entry.data.path):
+                click.echo(f"{SYNC_REASONS[entry.reason]}\t{entry.data.file_size_readable}\t{entry.local_path}")
+        reasons = ', '.join(f"{SYNC_REASONS[reason]} {count}개"
+                            for reason, count in plan.count_by_reason().items() if count)
+        # --event-log - 이면 표준 출력에는 JSON-lines만 남김
+        to_stderr = event_log is not None and writes_to_stdout(event_log)
+        click.echo(f"받을 파일: {len(plan.transfers)}개 ({format_size(plan.transfer_bytes)})"
+                   + (f" - {reasons}" if reasons else ''), err=to_stderr)
+        click.echo(f"변경 없음: {plan.unchanged_files}개 ({format_size(plan.unchanged_bytes)}), "
+                   f"제외: {plan.excluded_files}개", err=to_stderr)
+        if dry_run or not plan.transfers:
+            return
+        
+        run_sync(
+            manager, project_id, plan,
+            max_workers=workers,
+            max_connections=connections,
+            progress=ProgressReporter(event_log=event_log, show_progress=False if no_progress else None)
         )
     except Exception as e:
         click.echo(f"오류: {str(e)}", err=True)
@@ -1,18 +1,53 @@
 
-import subprocess
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable, Iterator, AsyncIterator, Union, TYPE_CHECKING
 import json
 from dataclasses import dataclass
-from pathlib import Path
-from datetime import datetime
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tabulate import tabulate
+import heapq
+import threading
+import time
 
+from .backends import Backend, CliBackend
 
-@dataclass
+if TYPE_CHECKING:
+    from .cache import ProjectDataCache
+    from .index import PathIndex
+    from .table import ProjectDataTable
+    from .downloader import ResumableDownloader
+    from .scheduler import AdaptiveConcurrency
+    from .telemetry import DownloadResult, ProgressReporter, UploadResult
+    from .uploader import ResumableUploader
+
+
+# 목록 조회 시 한 번에 가져오는 항목 수 (icav2 최대값)
+DEFAULT_PAGE_SIZE = 1000
+# 스트리밍 출력 시 열 너비를 정하는 데 쓰는 첫 묶음의 항목 수
+DISPLAY_BATCH_SIZE = 1000
+# 전송 방향별 결과 요약 문구 (작업, 이어서 전송, 전송한 크기)
+TRANSFER_WORDS = {
+    'download': ('다운로드', '이어받기', '받은'),
+    'upload': ('업로드', '이어올리기', '보낸'),
+}
+
+
+def parent_folders(path: str) -> List[str]:
+    """경로의 상위 폴더 목록 (루트 제외, 얕은 순서, 예: '/a/b/c.fq' -> ['/a/', '/a/b/'])"""
+    parts = path.strip('/').split('/')[:-1]
+    return ['/' + '/'.join(parts[:depth]) + '/' for depth in range(1, len(parts) + 1)]
+
+
+def folder_chain(folder: str) -> List[str]:
+    """폴더와 그 상위 폴더 목록 (루트 제외, 얕은 순서, 예: '/a/b/' -> ['/a/', '/a/b/'])"""
+    return parent_folders(folder) + [folder] if folder.strip('/') else []
+
+
+@dataclass(slots=True)
 class ProjectData:
-    """ICA 프로젝트 데이터 정보를 담는 클래스"""
+    """
+    ICA 프로젝트 데이터 정보를 담는 클래스
+
+    큰 목록은 ProjectDataTable(열 기반 저장)에 담고 필요한 행만 ProjectData로 꺼내 쓰세요.
+    """
     id: str
     name: str
     data_type: str  # FILE or FOLDER
@@ -26,6 +61,7 @@ class ProjectData:
     project_id: str
     project_name: str
     tags: Dict[str, List[str]]
+    object_etag: str = ''  # 체크섬 검증용 S3 ETag (멀티파트 업로드면 '<md5>-<파트 수>')
 
     @property
     def file_size_readable(self) -> str:
@@ -51,37 +87,241 @@ class ProjectData:
 class DataManager:
     """ICA 프로젝트 데이터 관리 클래스"""
 
-    @staticmethod
-    def list_project_data(project_id: str) -> List[ProjectData]:
+    def __init__(self, cache: Optional["ProjectDataCache"] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                 backend: Optional[Backend] = None):
+        """
+        Args:
+            cache: 프로젝트 데이터 목록 캐시 (None이면 매번 전체 목록을 조회)
+            page_size: 목록 조회 시 페이지당 항목 수
+            backend: ICA API 호출 백엔드 (None이면 icav2 CLI)
+        """
+        self.cache = cache
+        self.page_size = page_size
+        self.backend = backend or CliBackend()
+
+    def list_project_data(self, project_id: str, refresh: bool = False,
+                          path: Optional[str] = None) -> List[ProjectData]:
         """
         프로젝트 내 데이터 목록 조회
+
+        iter_project_data의 결과를 리스트로 모아 반환합니다.
         
         Args:
             project_id: 프로젝트 ID
+            refresh: 캐시를 무시하고 전체 목록을 다시 조회할지 여부
+            path: 이 경로 아래의 데이터만 조회
             
         Returns:
             List[ProjectData]: 데이터 목록
             
         Raises:
-            subprocess.CalledProcessError: icav2 명령어 실행 실패시
-            json.JSONDecodeError: JSON 파싱 실패시
+            RuntimeError: 조회 또는 응답 파싱 실패시
         """
-        try:
-            # icav2 명령어로 프로젝트 데이터 목록 조회
-            result = subprocess.run(
-                ['icav2', 'projectdata', 'list', 
-                 '--project-id', project_id,
-                 '--output-format', 'json'],
-                capture_output=True,
-                text=True,
-                check=True
+        return list(self.iter_project_data(project_id, refresh=refresh, path=path))
+
+    def load_table(self, project_id: str, refresh: bool = False,
+                   path: Optional[str] = None) -> "ProjectDataTable":
+        """
+        프로젝트 내 데이터 목록을 열 기반 테이블로 조회
+
+        iter_project_data의 결과를 페이지 단위로 배열에 옮기므로 항목 수가 많은
+        프로젝트도 ProjectData 객체 리스트보다 훨씬 적은 메모리를 사용합니다.
+
+        Args:
+            project_id: 프로젝트 ID
+            refresh: 캐시를 무시하고 전체 목록을 다시 조회할지 여부
+            path: 이 경로 아래의 데이터만 조회
+
+        Returns:
+            ProjectDataTable: 데이터 테이블
+
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        from .table import ProjectDataTable
+        return ProjectDataTable.from_items(self.iter_project_data(project_id, refresh=refresh, path=path))
+
+    def iter_project_data(self, project_id: str, refresh: bool = False,
+                          path: Optional[str] = None) -> Iterator[ProjectData]:
+        """
+        프로젝트 내 데이터를 페이지 단위로 조회하며 도착하는 대로 반환
+
+        캐시가 설정되어 있으면 TTL 이내의 목록은 캐시에서 반환하고, TTL이 지나면
+        마지막 조회 이후 수정된 항목만 가져와 캐시를 갱신합니다. 전체 갱신 주기가
+        지났거나 refresh가 참이면 전체 목록을 다시 조회하며, 끝까지 소비된
+        경우에만 캐시를 교체합니다.
+        
+        path가 주어지면 캐시에서는 경로 인덱스로 범위 검색합니다. 캐시가 비었거나
+        오래되었으면 전체 목록을 한 번 조회하여 캐시를 채운 뒤 해당 경로 아래만
+        반환하고, 캐시가 설정되지 않았으면 해당 폴더 아래만 조회합니다.
+        
+        Args:
+            project_id: 프로젝트 ID
+            refresh: 캐시를 무시하고 전체 목록을 다시 조회할지 여부
+            path: 이 경로 아래의 데이터만 조회
+            
+        Yields:
+            ProjectData: 데이터
+            
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        if self.cache is None:
+            if path:
+                yield from self.iter_folder_pages(project_id, path, page_size=self.page_size)
+            else:
+                yield from self.iter_pages(project_id, page_size=self.page_size)
+            return
+
+        if refresh or self.cache.needs_full_refresh(project_id):
+            # 캐시는 프로젝트 전체 단위로 관리하므로 path가 있어도 전체 목록으로 채움
+            data_list = []
+            for data in self.iter_pages(project_id, page_size=self.page_size):
+                data_list.append(data)
+                if not path or data.path.startswith(path):
+                    yield data
+            self.cache.replace(project_id, data_list)
+            return
+
+        if not self.cache.is_fresh(project_id):
+            self.cache.upsert(project_id, list(self.iter_modified_since(
+                project_id, self.cache.high_water(project_id), page_size=self.page_size
+            )))
+        yield from self.cache.load(project_id, path=path)
+
+    def iter_pages(self, project_id: str, page_size: Optional[int] = None,
+                   parent_folder: Optional[str] = None, sort_by: Optional[str] = None) -> Iterator[ProjectData]:
+        """
+        프로젝트 데이터를 한 페이지씩 조회 (캐시 미사용)
+        
+        응답에 nextPageToken이 있으면 토큰으로, 없으면 오프셋으로 다음 페이지를
+        요청하며, 한 페이지만 메모리에 올려 파싱한 뒤 바로 반환합니다.
+        
+        Args:
+            project_id: 프로젝트 ID
+            page_size: 페이지당 항목 수 (None이면 self.page_size)
+            parent_folder: 이 폴더 바로 아래 항목만 조회
+            sort_by: 정렬 기준 (예: 'timeModified desc')
+            
+        Yields:
+            ProjectData: 데이터
+            
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        page_size = page_size or self.page_size
+        page_offset = 0
+        page_token = None
+        while True:
+            response_data = self.backend.list_project_data_page(
+                project_id, page_size, page_offset=page_offset, page_token=page_token,
+                parent_folder=parent_folder, sort_by=sort_by
             )
+            items = self._parse_items(response_data.get('items', []))
+            yield from items
             
-            # JSON 파싱
-            response_data = json.loads(result.stdout)
-            items_data = response_data.get('items', [])
+            page_token = response_data.get('nextPageToken')
+            if not items or (not page_token and len(items) < page_size):
+                return
+            page_offset += len(items)
+
+    async def aiter_pages(self, project_id: str, page_size: Optional[int] = None,
+                          parent_folder: Optional[str] = None,
+                          sort_by: Optional[str] = None) -> AsyncIterator[ProjectData]:
+        """
+        iter_pages의 asyncio 버전 (여러 프로젝트를 동시에 조회할 때 사용)
+        
+        Yields:
+            ProjectData: 데이터
+            
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        page_size = page_size or self.page_size
+        page_offset = 0
+        page_token = None
+        while True:
+            response_data = await self.backend.alist_project_data_page(
+                project_id, page_size, page_offset=page_offset, page_token=page_token,
+                parent_folder=parent_folder, sort_by=sort_by
+            )
+            items = self._parse_items(response_data.get('items', []))
+            for data in items:
+                yield data
+            
+            page_token = response_data.get('nextPageToken')
+            if not items or (not page_token and len(items) < page_size):
+                return
+            page_offset += len(items)
+
+    def iter_folder_pages(self, project_id: str, path: str,
+                          page_size: Optional[int] = None) -> Iterator[ProjectData]:
+        """
+        parent folder 필터로 path 폴더 아래만 너비 우선으로 조회 (캐시 미사용)
+        
+        프로젝트 전체가 아닌 하위 트리의 폴더 수만큼만 목록을 조회합니다.
+        
+        Args:
+            project_id: 프로젝트 ID
+            path: 조회할 폴더 경로
+            page_size: 페이지당 항목 수
             
-            # ProjectData 객체 리스트로 변환
+        Yields:
+            ProjectData: 데이터
+        """
+        folders = [path if path.endswith('/') else path + '/']
+        while folders:
+            folder = folders.pop(0)
+            for data in self.iter_pages(project_id, page_size, parent_folder=folder):
+                if data.is_folder:
+                    folders.append(data.path)
+                yield data
+
+    def fetch_project_data(self, project_id: str) -> List[ProjectData]:
+        """
+        프로젝트 내 전체 데이터 목록 조회 (캐시 미사용)
+        
+        Args:
+            project_id: 프로젝트 ID
+            
+        Returns:
+            List[ProjectData]: 데이터 목록
+            
+        Raises:
+            RuntimeError: 조회 또는 응답 파싱 실패시
+        """
+        return list(self.iter_pages(project_id))
+
+    def iter_modified_since(self, project_id: str, high_water: str,
+                            page_size: Optional[int] = None) -> Iterator[ProjectData]:
+        """
+        수정 시각 역순으로 페이지를 조회하며 high_water 이후 수정된 항목만 반환
+        
+        high_water보다 오래된 항목이 나오면 이후 페이지는 조회하지 않습니다.
+        같은 시각의 항목은 갱신되었을 수 있으므로 다시 반환합니다.
+        
+        Args:
+            project_id: 프로젝트 ID
+            high_water: 캐시에 저장된 가장 최근 수정 시각
+            page_size: 페이지당 항목 수
+            
+        Yields:
+            ProjectData: 수정된 데이터
+        """
+        for data in self.iter_pages(project_id, page_size, sort_by='timeModified desc'):
+            if data.time_modified < high_water:
+                return
+            yield data
+
+    @staticmethod
+    def _parse_items(items_data: List[Dict[str, Any]]) -> List[ProjectData]:
+        """
+        백엔드 응답 항목(icav2 JSON 형식)을 ProjectData 객체 리스트로 변환
+        
+        Raises:
+            RuntimeError: 응답 형식이 올바르지 않은 경우
+        """
+        try:
             return [
                 ProjectData(
                     id=item['id'],
@@ -96,193 +336,592 @@ class DataManager:
                     time_modified=item['details'].get('timeModified', ''),
                     project_id=item['details'].get('owningProjectId', ''),
                     project_name=item['details'].get('owningProjectName', ''),
-                    tags=item['details'].get('tags', {'technicalTags': [], 'userTags': []})
+                    tags=item['details'].get('tags', {'technicalTags': [], 'userTags': []}),
+                    object_etag=item['details'].get('objectETag', '')
                 )
                 for item in items_data
             ]
-            
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"프로젝트 데이터 목록 조회 실패: {str(e)}")
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"프로젝트 데이터 파싱 실패: {str(e)}")
         except KeyError as e:
             raise RuntimeError(f"프로젝트 데이터 형식 오류: {str(e)}")
 
     @staticmethod
-    def display_project_data(data_list: List[ProjectData], show_details: bool = False) -> None:
+    def display_project_data(data_list: Iterable[ProjectData], show_details: bool = False) -> None:
         """
         프로젝트 데이터 목록을 테이블 형식으로 출력
         
+        리스트가 아닌 반복자(iter_project_data 등)를 받으면 목록 조회가 끝나기를
+        기다리지 않고 첫 묶음으로 열 너비를 정해 도착하는 대로 출력합니다.
+        
         Args:
-            data_list: 출력할 데이터 목록
+            data_list: 출력할 데이터 목록 또는 반복자
             show_details: 상세 정보 표시 여부
         """
         if show_details:
             headers = ['TYPE', 'NAME', 'PATH', 'SIZE', 'FORMAT', 'STATUS', 'CREATED', 'MODIFIED']
-            data = [
-                [
-                    d.data_type,
-                    d.name,
-                    d.path,
-                    d.file_size_readable,
-                    d.format or '-',
-                    d.status,
-                    d.time_created,
-                    d.time_modified
-                ]
-                for d in data_list
+            to_row = lambda d: [
+                d.data_type,
+                d.name,
+                d.path,
+                d.file_size_readable,
+                d.format or '-',
+                d.status,
+                d.time_created,
+                d.time_modified
             ]
         else:
             headers = ['TYPE', 'NAME', 'PATH', 'SIZE', 'STATUS']
-            data = [
-                [
-                    d.data_type,
-                    d.name,
-                    d.path,
-                    d.file_size_readable,
-                    d.status
-                ]
-                for d in data_list
+            to_row = lambda d: [
+                d.data_type,
+                d.name,
+                d.path,
+                d.file_size_readable,
+                d.status
             ]
         
-        print(tabulate(data, headers=headers, tablefmt='simple'))
-        print(f"\nNo of items : {len(data_list)}")
+        # tabulate는 출력할 때만 필요하므로 패키지 임포트 시간에서 제외
+        from tabulate import tabulate
+        
+        if isinstance(data_list, list):
+            print(tabulate([to_row(d) for d in data_list], headers=headers, tablefmt='simple'))
+            print(f"\nNo of items : {len(data_list)}")
+            return
+        
+        # 스트리밍 출력: 첫 묶음의 열 너비를 이후 행에도 사용
+        rows = (to_row(d) for d in data_list)
+        first = [row for _, row in zip(range(DISPLAY_BATCH_SIZE), rows)]
+        table = tabulate(first, headers=headers, tablefmt='simple')
+        print(table, flush=True)
+        count = len(first)
+        widths = [len(col) for col in table.splitlines()[1].split('  ')]
+        for row in rows:
+            print('  '.join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+            count += 1
+        print(f"\nNo of items : {count}")
 
     @staticmethod
-    def get_files_by_extension(data_list: List[ProjectData], extension: str) -> List[ProjectData]:
+    def get_files_by_extension(data_list: Union[Iterable[ProjectData], "PathIndex", "ProjectDataTable"],
+                               extension: str) -> Union[List[ProjectData], "ProjectDataTable"]:
         """
         특정 확장자를 가진 파일들만 필터링
         
         Args:
-            data_list: 데이터 목록
+            data_list: 데이터 목록 (PathIndex이면 이진 탐색, ProjectDataTable이면 배열 연산으로 검색)
             extension: 확장자 (예: '.fastq', '.bam')
             
         Returns:
-            List[ProjectData]: 필터링된 파일 목록
+            List[ProjectData]: 필터링된 파일 목록 (ProjectDataTable을 넘기면 ProjectDataTable)
         """
+        from .index import PathIndex
+        from .table import ProjectDataTable
+        if isinstance(data_list, (PathIndex, ProjectDataTable)):
+            return data_list.with_extension(extension)
         return [
             data for data in data_list 
             if data.is_file and data.name.lower().endswith(extension.lower())
         ]
 
     @staticmethod
-    def get_folders(data_list: List[ProjectData]) -> List[ProjectData]:
+    def get_folders(data_list: Union[Iterable[ProjectData], "ProjectDataTable"]
+                    ) -> Union[List[ProjectData], "ProjectDataTable"]:
         """
         폴더 목록만 필터링
         
         Args:
-            data_list: 데이터 목록
+            data_list: 데이터 목록 (ProjectDataTable이면 배열 연산으로 검색)
             
         Returns:
-            List[ProjectData]: 폴더 목록
+            List[ProjectData]: 폴더 목록 (ProjectDataTable을 넘기면 ProjectDataTable)
         """
+        from .table import ProjectDataTable
+        if isinstance(data_list, ProjectDataTable):
+            return data_list.folders()
         return [data for data in data_list if data.is_folder]
 
     @staticmethod
-    def get_data_by_path(data_list: List[ProjectData], path: str) -> List[ProjectData]:
+    def get_data_by_path(data_list: Union[Iterable[ProjectData], "PathIndex", "ProjectDataTable"],
+                         path: str) -> Union[List[ProjectData], "ProjectDataTable"]:
         """
         특정 경로에 있는 데이터 필터링
         
         Args:
-            data_list: 데이터 목록
+            data_list: 데이터 목록 (PathIndex이면 이진 탐색, ProjectDataTable이면 배열 연산으로 검색)
             path: 필터링할 경로
             
         Returns:
-            List[ProjectData]: 필터링된 데이터 목록
+            List[ProjectData]: 필터링된 데이터 목록 (ProjectDataTable을 넘기면 ProjectDataTable)
         """
+        from .index import PathIndex
+        from .table import ProjectDataTable
+        if isinstance(data_list, (PathIndex, ProjectDataTable)):
+            return data_list.under(path)
         return [data for data in data_list if data.path.startswith(path)]
 
-    @staticmethod
-    def download_file(project_id: str, file_data: ProjectData, output_dir: str) -> Tuple[bool, str]:
+    def get_download_url(self, project_id: str, data_id: str) -> str:
+        """
+        파일의 presigned 다운로드 URL 발급
+        
+        Args:
+            project_id: 프로젝트 ID
+            data_id: 데이터 ID
+            
+        Returns:
+            str: 다운로드 URL
+            
+        Raises:
+            RuntimeError: 발급 실패시
         """
-        단일 파일 다운로드
+        return self.backend.get_download_url(project_id, data_id)
+
+    def download_file(self, project_id: str, file_data: ProjectData, output_dir: str,
+                      downloader: Optional["ResumableDownloader"] = None,
+                      progress: Optional["ProgressReporter"] = None,
+                      output_path: Optional[str] = None, overwrite: bool = False) -> "DownloadResult":
+        """
+        단일 파일 다운로드 (이어받기)
+        
+        presigned URL에 byte 범위 요청을 보내 '<파일>.part'에 받고, 완료된
+        범위와 파트별 MD5를 '<파일>.part.journal'에 기록합니다. 중단된 뒤 다시
+        실행하면 빠진 범위만 받으며, 완료 시 ICA ETag와 비교하여 검증합니다.
         
         Args:
             project_id: 프로젝트 ID
             file_data: 다운로드할 파일 정보
             output_dir: 저장할 디렉토리 경로
+            downloader: 여러 파일이 연결 풀과 동시 요청 수 제한을 공유할 다운로더
+                (None이면 이 파일만을 위한 다운로더를 만듦)
+            progress: 받은 byte 수를 전달받을 진행 상황 기록기
+            output_path: 저장할 파일 경로 (None이면 output_dir 아래에 파일 이름으로)
+            overwrite: 크기가 같은 파일이 이미 있어도 다시 받을지 여부
             
         Returns:
-            Tuple[bool, str]: (성공 여부, 메시지)
+            DownloadResult: 다운로드 결과 (상태, 받은 byte 수, 소요 시간, 재시도 횟수)
         """
+        from .telemetry import DownloadResult, DownloadStatus
+        
+        if downloader is None:
+            from .downloader import ResumableDownloader
+            with ResumableDownloader() as downloader:
+                return self.download_file(project_id, file_data, output_dir, downloader, progress,
+                                          output_path, overwrite)
+        
+        # 파일 저장 경로
+        if output_path is None:
+            output_path = os.path.join(output_dir, file_data.name)
+        else:
+            output_dir = os.path.dirname(output_path) or '.'
+        result = DownloadResult(
+            name=file_data.name,
+            data_id=file_data.id,
+            output_path=output_path,
+            status=DownloadStatus.DOWNLOADED,
+            file_size=file_data.file_size
+        )
+        started = time.monotonic()
+        
         try:
             # 출력 디렉토리 생성
             os.makedirs(output_dir, exist_ok=True)
             
-            # 파일 저장 경로
-            output_path = os.path.join(output_dir, file_data.name)
-            
             # 파일이 이미 존재하는지 확인
-            if os.path.exists(output_path):
+            if not overwrite and os.path.exists(output_path):
                 # 파일 크기 비교
                 local_size = os.path.getsize(output_path)
                 if local_size == file_data.file_size:
-                    return True, f"이미 존재: {file_data.name} ({file_data.file_size_readable})"
-            
-            # icav2 명령어로 파일 다운로드
-            result = subprocess.run(
-                ['icav2', 'projectdata', 'download', 
-                 '--project-id', project_id,
-                 file_data.id, output_path],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+                    result.status = DownloadStatus.SKIPPED
+                    return result
             
-            return True, f"다운로드 완료: {file_data.name} ({file_data.file_size_readable})"
+            stats = downloader.download(
+                lambda: self.get_download_url(project_id, file_data.id),
+                file_data.id, file_data.file_size, file_data.object_etag, output_path,
+                progress=progress
+            )
+            result.bytes_downloaded = stats.bytes_downloaded
+            result.retries = stats.retries
+            if stats.resumed_bytes:
+                result.status = DownloadStatus.RESUMED
             
-        except subprocess.CalledProcessError as e:
-            return False, f"다운로드 실패: {file_data.name} - {str(e)}"
+        except RuntimeError as e:
+            result.status = DownloadStatus.FAILED
+            result.error = str(e)
+            result.retries = getattr(e, 'retries', 0)
         except Exception as e:
-            return False, f"예상치 못한 오류: {file_data.name} - {str(e)}"
+            result.status = DownloadStatus.FAILED
+            result.error = f"예상치 못한 오류: {str(e)}"
+        
+        result.duration = time.monotonic() - started
+        return result
 
-    def download_fastq_files(self, project_id: str, data_list: List[ProjectData], 
-                           path: str, output_dir: str, max_workers: int = 4) -> None:
+    def download_fastq_files(self, project_id: str, data_list: Iterable[ProjectData], 
+                           path: str, output_dir: str, max_workers: int = 4,
+                           max_connections: int = 8,
+                           progress: Optional["ProgressReporter"] = None) -> List["DownloadResult"]:
         """
         특정 경로의 FASTQ 파일들을 병렬로 다운로드
         
+        data_list가 반복자(iter_project_data 등)이면 목록 조회가 끝나기 전에도
+        도착한 파일부터 다운로드를 시작합니다. 작업자가 비면 그때까지 도착한
+        파일 중 가장 큰 파일을 먼저 받아, 큰 파일이 마지막에 남아 전체 시간을
+        늘리지 않도록 합니다.
+        
+        큰 파일은 byte 범위로 나누어 동시에 받으며, 모든 파일의 범위 요청이
+        하나의 연결 풀을 공유합니다. 전체 동시 요청 수는 처리량과 오류율에 따라
+        max_connections 안에서 자동으로 조절됩니다.
+        
+        진행 상황은 progress에 전달되어 진행 막대(ETA 포함)와 JSON-lines
+        이벤트 로그로 기록되며, 끝나면 전체 소요 시간과 실효 대역폭을 출력합니다.
+        
         Args:
             project_id: 프로젝트 ID
-            data_list: 데이터 목록
+            data_list: 데이터 목록 또는 반복자
             path: 대상 경로
             output_dir: 저장할 디렉토리 경로
-            max_workers: 최대 동시 다운로드 수
+            max_workers: 최대 동시 다운로드 파일 수
+            max_connections: 모든 파일을 합친 동시 byte 범위 요청 수 상한
+            progress: 진행 상황 기록기 (None이면 터미널일 때만 진행 막대 표시)
+            
+        Returns:
+            List[DownloadResult]: 파일별 다운로드 결과 (완료순)
         """
+        from .telemetry import ProgressReporter
+        
+        if progress is None:
+            progress = ProgressReporter()
+        
         # 경로 내의 FASTQ 파일 필터링
-        path_data = self.get_data_by_path(data_list, path)
-        fastq_files = [
-            data for data in path_data 
-            if data.is_file and (data.name.endswith('.fq.gz') or data.name.endswith('.fastq.gz'))
-        ]
+        fastq_files = (
+            (data, os.path.join(output_dir, data.name)) for data in data_list 
+            if data.path.startswith(path) and data.is_file
+            and (data.name.endswith('.fq.gz') or data.name.endswith('.fastq.gz'))
+        )
         
-        if not fastq_files:
-            print(f"지정된 경로에 FASTQ 파일이 없습니다: {path}")
-            return
+        progress.event('start', project_id=project_id, path=path, output_dir=output_dir,
+                       max_workers=max_workers, max_connections=max_connections)
         
-        print(f"다운로드할 FASTQ 파일 수: {len(fastq_files)}")
-        total_size = sum(f.file_size for f in fastq_files)
-        print(f"전체 크기: {ProjectData(id='', name='', data_type='', path='', file_size=total_size, format=None, status='', creator_id='', time_created='', time_modified='', project_id='', project_name='', tags={}).file_size_readable}")
+        results = self.download_files(project_id, fastq_files, max_workers, max_connections,
+                                      progress=progress, label='FASTQ 파일')
+        if not results:
+            progress.write(f"지정된 경로에 FASTQ 파일이 없습니다: {path}")
+        return results
+
+    def download_files(self, project_id: str, targets: Iterable[Tuple[ProjectData, str]],
+                       max_workers: int = 4, max_connections: int = 8,
+                       progress: Optional["ProgressReporter"] = None, label: str = '파일',
+                       overwrite: bool = False) -> List["DownloadResult"]:
+        """
+        (파일, 저장 경로) 목록을 큰 파일부터 병렬로 다운로드
+        
+        targets가 반복자이면 도착한 파일부터 다운로드를 시작하고, 작업자가 비면
+        그때까지 도착한 파일 중 가장 큰 파일을 먼저 받습니다. 모든 파일의 범위
+        요청은 하나의 연결 풀과 동시 요청 수 제한을 공유합니다.
+        
+        Args:
+            project_id: 프로젝트 ID
+            targets: (다운로드할 파일 정보, 저장할 파일 경로) 목록 또는 반복자
+            max_workers: 최대 동시 다운로드 파일 수
+            max_connections: 모든 파일을 합친 동시 byte 범위 요청 수 상한
+            progress: 진행 상황 기록기 (None이면 터미널일 때만 진행 막대 표시)
+            label: 진행 상황 출력에 쓰는 파일 종류 (예: 'FASTQ 파일')
+            overwrite: 크기가 같은 파일이 이미 있어도 다시 받을지 여부
+            
+        Returns:
+            List[DownloadResult]: 파일별 다운로드 결과 (완료순, 파일이 없으면 빈 목록)
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from .downloader import ResumableDownloader
+        from .telemetry import ProgressReporter, format_size
+        
+        if progress is None:
+            progress = ProgressReporter()
+        
+        # 도착한 파일을 크기 내림차순으로 꺼내는 대기열
+        pending = []
+        pending_lock = threading.Lock()
+        
+        def download_largest() -> "DownloadResult":
+            with pending_lock:
+                _, _, file_data, output_path = heapq.heappop(pending)
+            result = self.download_file(project_id, file_data, os.path.dirname(output_path), downloader,
+                                        progress, output_path, overwrite)
+            progress.file_done(result)
+            return result
+        
+        # 병렬 다운로드 실행 (작업 하나가 대기열에서 파일 하나를 꺼냄)
+        with ResumableDownloader(max_connections=max_connections) as downloader, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for file_data, output_path in targets:
+                with pending_lock:
+                    heapq.heappush(pending, (-file_data.file_size, len(futures), file_data, output_path))
+                progress.add_file(file_data.name, file_data.id, file_data.file_size)
+                futures.append(executor.submit(download_largest))
+            
+            if not futures:
+                return []
+            
+            progress.write(f"다운로드할 {label} 수: {progress.total_files}")
+            progress.write(f"전체 크기: {format_size(progress.total_bytes)}")
+            
+            results = [future.result() for future in as_completed(futures)]
+        
+        self._report_transfers(results, progress, downloader.concurrency, 'download')
+        return results
+
+    def _report_transfers(self, results: List["DownloadResult"], progress: "ProgressReporter",
+                          concurrency: "AdaptiveConcurrency", direction: str) -> None:
+        """전송 결과 요약 출력 및 finish 이벤트 기록"""
+        from .telemetry import DownloadStatus, format_duration, format_size
+        
+        action, resumed, transferred = TRANSFER_WORDS[direction]
+        counts = {status: 0 for status in DownloadStatus}
+        for result in results:
+            counts[result.status] += 1
+        totals = progress.finish()
+        bandwidth = totals['transferred_bytes'] / totals['elapsed'] / (1024 * 1024) if totals['elapsed'] else 0.0
+        
+        out = progress.message_stream
+        print(f"\n{action} 결과:", file=out)
+        print(f"- 성공: {counts[DownloadStatus.DOWNLOADED] + counts[DownloadStatus.RESUMED]}개"
+              f" ({resumed} {counts[DownloadStatus.RESUMED]}개)", file=out)
+        print(f"- 건너뜀: {counts[DownloadStatus.SKIPPED]}개", file=out)
+        print(f"- 실패: {counts[DownloadStatus.FAILED]}개", file=out)
+        print(f"- {transferred} 크기: {format_size(totals['transferred_bytes'])}", file=out)
+        print(f"- 소요 시간: {format_duration(totals['elapsed'])}", file=out)
+        print(f"- 실효 대역폭: {bandwidth:.1f}MB/s "
+              f"(동시 요청 수 최대 {concurrency.peak_limit}, "
+              f"오류 {concurrency.total_errors}회)", file=out)
         
-        # 병렬 다운로드 실행
+        progress.event('finish', **{status.value: count for status, count in counts.items()},
+                       transferred_bytes=totals['transferred_bytes'], elapsed=totals['elapsed'],
+                       bandwidth_mb=round(bandwidth, 3),
+                       peak_concurrency=concurrency.peak_limit,
+                       errors=concurrency.total_errors)
+
+    def create_folders(self, project_id: str, folder_paths: Iterable[str], existing: Set[str],
+                       max_workers: int = 4) -> List[str]:
+        """
+        없는 폴더를 얕은 폴더부터 한 단계씩 동시에 생성
+        
+        Args:
+            project_id: 프로젝트 ID
+            folder_paths: 필요한 폴더 경로 ('/'로 끝남, 상위 폴더는 자동으로 포함)
+            existing: 이미 있는 폴더 경로 (생성한 폴더가 추가됨)
+            max_workers: 동시에 생성하는 폴더 수
+            
+        Returns:
+            List[str]: 새로 만든 폴더 경로 (얕은 순서)
+            
+        Raises:
+            RuntimeError: 생성 실패시
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        missing = set()
+        for folder in folder_paths:
+            missing.update(f for f in folder_chain(folder) if f not in existing)
+        
+        by_depth: Dict[int, List[str]] = {}
+        for folder in missing:
+            by_depth.setdefault(folder.count('/'), []).append(folder)
+        
+        def create(folder: str) -> str:
+            name = folder.rstrip('/').rsplit('/', 1)[1]
+            self.backend.create_data(project_id, name, folder[:-len(name) - 1], 'FOLDER')
+            return folder
+        
+        created = []
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
-                executor.submit(self.download_file, project_id, file_data, output_dir)
-                for file_data in fastq_files
-            ]
+            # 상위 폴더가 먼저 있어야 하므로 깊이별로 나누어 생성
+            for depth in sorted(by_depth):
+                for folder in executor.map(create, sorted(by_depth[depth])):
+                    existing.add(folder)
+                    created.append(folder)
+        return created
+
+    def _existing_ancestors(self, project_id: str, folder: str) -> Set[str]:
+        """folder와 그 상위 폴더 중 ICA에 있는 폴더 (부모 폴더의 하위 목록으로 확인)"""
+        existing = set()
+        for ancestor in folder_chain(folder):
+            name = ancestor.rstrip('/').rsplit('/', 1)[1]
+            parent = ancestor[:-len(name) - 1]
+            if not any(d.is_folder and d.name == name
+                       for d in self.iter_pages(project_id, parent_folder=parent if parent != '/' else None)):
+                break
+            existing.add(ancestor)
+        return existing
+
+    def upload_file(self, project_id: str, local_path: str, remote_path: str,
+                    uploader: Optional["ResumableUploader"] = None, existing: Optional[ProjectData] = None,
+                    checksum: bool = False, progress: Optional["ProgressReporter"] = None) -> "UploadResult":
+        """
+        단일 파일 업로드 (이어올리기)
+        
+        같은 경로에 크기가 같은 파일이 이미 있으면 건너뛰고(checksum이면 ETag도 비교),
+        이전 실행에서 중단된 업로드가 있으면 저널로 빠진 파트만 올립니다.
+        상위 폴더는 이미 있어야 합니다 (create_folders).
+        
+        Args:
+            project_id: 프로젝트 ID
+            local_path: 로컬 파일 경로
+            remote_path: 올릴 ICA 경로 (예: /runs/RUN1/S1_R1.fq.gz)
+            uploader: 여러 파일이 연결 풀과 동시 요청 수 제한을 공유할 업로더
+                (None이면 이 파일만을 위한 업로더를 만듦)
+            existing: 같은 경로에 이미 있는 ICA 데이터 (목록 조회 결과)
+            checksum: 이미 있는 파일의 ETag를 로컬 파일과 비교할지 여부
+            progress: 보낸 byte 수를 전달받을 진행 상황 기록기
             
-            # 결과 집계
-            success = 0
-            skipped = 0
-            for future in as_completed(futures):
-                result, message = future.result()
-                print(message)
-                if result:
-                    if "이미 존재" in message:
-                        skipped += 1
-                    else:
-                        success += 1
-            
-            print(f"\n다운로드 결과:")
-            print(f"- 성공: {success}개")
-            print(f"- 건너뜀: {skipped}개")
-            print(f"- 실패: {len(fastq_files) - success - skipped}개") 
+        Returns:
+            UploadResult: 업로드 결과 (상태, 보낸 byte 수, 소요 시간, 재시도 횟수)
+        """
+        from .telemetry import DownloadStatus, UploadResult
+        from .uploader import journal_path_for
+        
+        if uploader is None:
+            from .uploader import ResumableUploader
+            with ResumableUploader() as uploader:
+                return self.upload_file(project_id, local_path, remote_path, uploader, existing, checksum,
+                                        progress)
+        
+        name = remote_path.rsplit('/', 1)[1]
+        result = UploadResult(
+            name=name,
+            data_id=existing.id if existing else '',
+            output_path=remote_path,
+            status=DownloadStatus.DOWNLOADED,
+            file_size=0,
+            local_path=local_path
+        )
+        started = time.monotonic()
+        
+        try:
+            result.file_size = os.path.getsize(local_path)
+            if existing is not None and (existing.is_folder or existing.status == 'AVAILABLE'):
+                if existing.is_folder or existing.file_size != result.file_size:
+                    raise RuntimeError(f"같은 경로에 다른 {'폴더' if existing.is_folder else '파일'}가 "
+                                       f"이미 있습니다 ({existing.file_size_readable})")
+                if checksum and not self._same_content(local_path, existing):
+                    raise RuntimeError(f"같은 경로에 내용이 다른 파일이 이미 있습니다 (ETag {existing.object_etag})")
+                result.status = DownloadStatus.SKIPPED
+                return result
+            
+            # 중단된 업로드(PARTIAL)이면 같은 데이터에 이어서 올림
+            if existing is None:
+                result.data_id = self.backend.create_data(project_id, name, remote_path[:-len(name)], 'FILE')['id']
+            stats = uploader.upload(
+                lambda: self.backend.get_temporary_credentials(project_id, result.data_id),
+                result.data_id, local_path, journal_path_for(project_id, remote_path), progress=progress
+            )
+            result.bytes_downloaded = stats.bytes_downloaded
+            result.retries = stats.retries
+            if stats.resumed_bytes:
+                result.status = DownloadStatus.RESUMED
+            
+        except RuntimeError as e:
+            result.status = DownloadStatus.FAILED
+            result.error = str(e)
+            result.retries = getattr(e, 'retries', 0)
+        except Exception as e:
+            result.status = DownloadStatus.FAILED
+            result.error = f"예상치 못한 오류: {str(e)}"
+        
+        result.duration = time.monotonic() - started
+        return result
+
+    @staticmethod
+    def _same_content(local_path: str, existing: ProjectData) -> bool:
+        """로컬 파일로 ICA ETag를 다시 계산하여 비교 (비교할 수 없는 ETag이면 같다고 봄)"""
+        from .downloader import local_etag_matches
+        
+        return local_etag_matches(local_path, existing.file_size, existing.object_etag) is not False
+
+    def upload_files(self, project_id: str, sources: Iterable[Tuple[str, str]], remote_folder: str,
+                     max_workers: int = 4, max_connections: int = 8, checksum: bool = False,
+                     refresh: bool = False, progress: Optional["ProgressReporter"] = None) -> List["UploadResult"]:
+        """
+        여러 파일을 병렬로 업로드 (폴더 일괄 생성, 이미 있는 파일 건너뛰기, 이어올리기)
+        
+        remote_folder 아래의 기존 목록을 (캐시가 있으면 캐시로) 한 번 조회하여
+        없는 폴더만 깊이별로 한꺼번에 만들고, 크기(checksum이면 ETag도)가 같은
+        파일은 건너뜁니다. 나머지는 큰 파일부터 올리며, 큰 파일은 파트로 나누어
+        동시에 올립니다. 모든 파일의 파트 요청은 하나의 연결 풀을 공유하고 동시
+        요청 수는 max_connections 안에서 자동으로 조절됩니다.
+        
+        Args:
+            project_id: 프로젝트 ID
+            sources: (로컬 경로, ICA 경로) 목록 (uploader.iter_directory, read_manifest)
+            remote_folder: 업로드 대상 ICA 폴더 (모든 ICA 경로가 이 아래에 있어야 함)
+            max_workers: 최대 동시 업로드 파일 수
+            max_connections: 모든 파일을 합친 동시 파트 요청 수 상한
+            checksum: 이미 있는 파일의 ETag를 로컬 파일과 비교할지 여부
+            refresh: 캐시를 무시하고 기존 목록을 다시 조회할지 여부
+            progress: 진행 상황 기록기 (None이면 터미널일 때만 진행 막대 표시)
+            
+        Returns:
+            List[UploadResult]: 파일별 업로드 결과 (완료순)
+            
+        Raises:
+            RuntimeError: 목록 조회 또는 폴더 생성 실패, ICA 경로가 remote_folder 밖에 있는 경우
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from .telemetry import ProgressReporter, format_size
+        from .uploader import ResumableUploader
+        
+        if progress is None:
+            progress = ProgressReporter()
+        remote_folder = '/' + remote_folder.strip('/') + '/' if remote_folder.strip('/') else '/'
+        sources = list(sources)
+        for _, remote_path in sources:
+            if not remote_path.startswith(remote_folder):
+                raise RuntimeError(f"ICA 경로가 대상 폴더({remote_folder}) 밖에 있습니다: {remote_path}")
+        
+        remote = {d.path: d for d in self.iter_project_data(
+            project_id, refresh=refresh, path=None if remote_folder == '/' else remote_folder)}
+        # 새로 만드는 폴더/파일(중단되면 PARTIAL)이 다음 목록 조회에 반영되도록 업로드 전에 캐시 만료
+        # (중단된 뒤 TTL 안에 다시 실행해도 같은 경로에 데이터를 다시 만들지 않고 이어서 올림)
+        if self.cache is not None:
+            self.cache.expire(project_id)
+        existing_folders = {path for path, d in remote.items() if d.is_folder}
+        if remote or remote_folder == '/':
+            existing_folders.update(folder_chain(remote_folder))
+        else:
+            existing_folders.update(self._existing_ancestors(project_id, remote_folder))
+        
+        progress.event('start', project_id=project_id, remote_folder=remote_folder,
+                       max_workers=max_workers, max_connections=max_connections)
+        created = self.create_folders(project_id, [remote_folder] + [path[:path.rindex('/') + 1]
+                                                                     for _, path in sources],
+                                      existing_folders, max_workers)
+        if created:
+            progress.write(f"폴더 생성: {len(created)}개")
+            progress.event('folders_created', folders=created)
+        
+        # 큰 파일부터 꺼내는 대기열
+        pending = []
+        pending_lock = threading.Lock()
+        
+        def upload_largest() -> "UploadResult":
+            with pending_lock:
+                _, _, local_path, remote_path = heapq.heappop(pending)
+            result = self.upload_file(project_id, local_path, remote_path, uploader, remote.get(remote_path),
+                                      checksum, progress)
+            progress.file_done(result)
+            return result
+        
+        with ResumableUploader(max_connections=max_connections) as uploader, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for order, (local_path, remote_path) in enumerate(sources):
+                file_size = os.path.getsize(local_path)
+                heapq.heappush(pending, (-file_size, order, local_path, remote_path))
+                progress.add_file(remote_path, remote.get(remote_path).id if remote_path in remote else '',
+                                  file_size)
+            
+            if not pending:
+                progress.write("업로드할 파일이 없습니다.")
+                return []
+            
+            progress.write(f"업로드할 파일 수: {progress.total_files}")
+            progress.write(f"전체 크기: {format_size(progress.total_bytes)}")
+            futures = [executor.submit(upload_largest) for _ in range(len(pending))]
+            results = [future.result() for future in as_completed(futures)]
+        
+        self._report_transfers(results, progress, uploader.concurrency, 'upload')
+        return results
@@ -0,0 +1,501 @@
+"""ICA 파일 이어받기(resumable) 다운로드 모듈"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .scheduler import AdaptiveConcurrency
+
+if TYPE_CHECKING:
+    from .telemetry import ProgressReporter
+
+
+MiB = 1024 * 1024
+# ETag로 업로드 파트 크기를 알 수 없을 때 쓰는 파트 크기
+DEFAULT_PART_SIZE = 64 * MiB
+# S3 멀티파트 업로드에서 흔히 쓰는 파트 크기 후보 (MiB, 우선순위순)
+ETAG_PART_SIZE_CANDIDATES = [8, 16, 5, 32, 64, 100, 128, 256, 512, 1024]
+# 응답 본문을 읽고 쓰는 단위
+READ_CHUNK_SIZE = 1 * MiB
+# 파트별 재시도 횟수
+MAX_PART_RETRIES = 3
+# 요청 타임아웃 (연결, 읽기) 초
+REQUEST_TIMEOUT = (10, 60)
+# 모든 파일을 합친 동시 byte 범위 요청 수 상한
+DEFAULT_MAX_CONNECTIONS = 8
+# 동시 요청 수를 줄여야 하는 응답 코드 (스로틀링/서버 과부하)
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def make_session(max_connections: int = DEFAULT_MAX_CONNECTIONS) -> requests.Session:
+    """동시 요청 수만큼 연결을 재사용하는 HTTP 세션 생성"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def normalize_etag(etag: Optional[str]) -> str:
+    """ETag의 따옴표 제거 및 소문자 변환"""
+    return (etag or '').strip().strip('"').lower()
+
+
+def candidate_part_sizes(file_size: int, etag: str) -> List[int]:
+    """
+    멀티파트 ETag('<md5>-<파트 수>')와 파일 크기에 맞는 업로드 파트 크기 후보
+
+    Args:
+        file_size: 파일 크기
+        etag: 정규화된 ETag
+
+    Returns:
+        List[int]: 파트 수가 일치하는 파트 크기 목록 (우선순위순)
+    """
+    if '-' not in etag:
+        return []
+    n_parts = int(etag.rsplit('-', 1)[1])
+    return [
+        mib * MiB for mib in ETAG_PART_SIZE_CANDIDATES
+        if math.ceil(file_size / (mib * MiB)) == n_parts
+    ]
+
+
+def plan_part_size(file_size: int, etag: str) -> int:
+    """
+    다운로드 파트 크기 결정
+
+    멀티파트 ETag이면 업로드 파트 크기와 같게 나누어 파트별 MD5로 ETag를
+    다시 계산할 수 있게 합니다.
+    """
+    candidates = candidate_part_sizes(file_size, etag)
+    return candidates[0] if candidates else DEFAULT_PART_SIZE
+
+
+def multipart_etag(part_md5s: List[str]) -> str:
+    """파트별 MD5로 S3 멀티파트 ETag 계산"""
+    digest = hashlib.md5(b''.join(bytes.fromhex(md5) for md5 in part_md5s)).hexdigest()
+    return f"{digest}-{len(part_md5s)}"
+
+
+def range_md5(fd: int, start: int, end: int) -> str:
+    """열린 파일의 byte 범위(끝 포함) MD5"""
+    digest = hashlib.md5()
+    offset = start
+    while offset <= end:
+        chunk = os.pread(fd, min(READ_CHUNK_SIZE, end - offset + 1), offset)
+        if not chunk:
+            break
+        digest.update(chunk)
+        offset += len(chunk)
+    return digest.hexdigest()
+
+
+def file_part_md5s(path: str, part_size: int) -> List[str]:
+    """로컬 파일을 part_size 단위로 읽어 파트별 MD5 계산"""
+    file_size = os.path.getsize(path)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return [range_md5(fd, start, min(start + part_size, file_size) - 1)
+                for start in range(0, file_size, part_size)]
+    finally:
+        os.close(fd)
+
+
+def verify_etag(path: str, file_size: int, etag: str, part_size: int, part_md5s: List[str]) -> Optional[bool]:
+    """
+    다운로드한 파일을 ICA가 보고한 ETag와 비교
+
+    Args:
+        path: 로컬 파일 경로
+        file_size: 파일 크기
+        etag: 정규화된 ETag
+        part_size: 다운로드 파트 크기
+        part_md5s: 다운로드 중 계산한 파트별 MD5
+
+    Returns:
+        Optional[bool]: 일치 여부 (검증할 수 없는 ETag이거나 멀티파트 ETag의 파트
+            크기를 추정할 수 없으면 None)
+    """
+    if not etag:
+        return None
+    if '-' not in etag:
+        if len(etag) != 32:
+            return None
+        if len(part_md5s) == 1:
+            return part_md5s[0] == etag
+        whole = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                whole.update(chunk)
+        return whole.hexdigest() == etag
+
+    if multipart_etag(part_md5s) == etag:
+        return True
+    # 파트 크기 추정이 틀렸을 수 있으므로 다른 후보로 다시 계산
+    candidates = candidate_part_sizes(file_size, etag)
+    for candidate in candidates:
+        if candidate != part_size and multipart_etag(file_part_md5s(path, candidate)) == etag:
+            return True
+    # 파트 수에 맞는 후보가 없으면 업로드 파트 크기를 알 수 없으므로 검증 불가
+    return False if candidates else None
+
+
+def local_etag_matches(path: str, file_size: int, etag: Optional[str]) -> Optional[bool]:
+    """
+    이미 있는 로컬 파일을 ICA ETag와 비교 (파트 크기를 ETag로 추정하여 다시 계산)
+
+    Returns:
+        Optional[bool]: 일치 여부 (비교할 수 없는 ETag이거나 파트 크기를 추정할 수 없으면 None)
+    """
+    etag = normalize_etag(etag)
+    if not etag:
+        return None
+    part_size = plan_part_size(file_size, etag)
+    return verify_etag(path, file_size, etag, part_size, file_part_md5s(path, part_size))
+
+
+@dataclass
+class TransferStats:
+    """파일 하나의 전송 통계 (업로드에서는 bytes_downloaded가 보낸 byte 수)"""
+    bytes_downloaded: int = 0  # 이번 실행에서 받은 byte 수
+    resumed_bytes: int = 0     # 이전 실행에서 전송해 둔 byte 수
+    retries: int = 0           # 파트 재시도 횟수 합계
+
+
+class DownloadJournal:
+    """
+    이어받기 저널 클래스
+
+    '<출력 파일>.part.journal'의 첫 줄에 대상 파일 정보를, 이후 줄마다 완료된
+    파트(byte 범위)의 번호와 MD5를 JSON으로 덧붙여 기록합니다. 파트 데이터를
+    쓴 뒤에 저널에 기록하므로, 중단된 시점에 쓰던 파트는 저널에 없고 다음
+    실행에서 다시 받습니다. 마지막 줄이 중간에 잘린 경우 그 줄은 무시합니다.
+    """
+
+    def __init__(self, path: str, data_id: str, file_size: int, etag: str, part_size: int,
+                 parts: Optional[Dict[int, str]] = None):
+        self.path = path
+        self.data_id = data_id
+        self.file_size = file_size
+        self.etag = etag
+        self.part_size = part_size
+        self.parts = parts or {}
+
+    @classmethod
+    def load(cls, path: str) -> Optional["DownloadJournal"]:
+        """저널 파일 로드 (없거나 손상되었으면 None)"""
+        try:
+            with open(path) as f:
+                header = json.loads(f.readline())
+                journal = cls(path, header['data_id'], header['file_size'], header['etag'],
+                              header['part_size'])
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    journal.parts[entry['part']] = entry['md5']
+            return journal
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def matches(self, data_id: str, file_size: int, etag: str) -> bool:
+        """같은 원격 파일에 대한 저널인지 확인"""
+        return (self.data_id, self.file_size, self.etag) == (data_id, file_size, etag)
+
+    @property
+    def n_parts(self) -> int:
+        return max(1, math.ceil(self.file_size / self.part_size))
+
+    def part_range(self, index: int) -> Tuple[int, int]:
+        """파트의 (시작, 끝) byte 위치 (끝 포함)"""
+        start = index * self.part_size
+        return start, min(start + self.part_size, self.file_size) - 1
+
+    def missing_parts(self) -> List[int]:
+        """아직 완료되지 않은 파트 번호 목록"""
+        return [idx for idx in range(self.n_parts) if idx not in self.parts]
+
+    def mark_done(self, index: int, md5: str) -> None:
+        """파트 완료 기록 (저널 끝에 한 줄 추가)"""
+        self.parts[index] = md5
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'part': index, 'md5': md5}) + '\n')
+
+    def save(self) -> None:
+        """저널 전체를 다시 기록 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({
+                'data_id': self.data_id,
+                'file_size': self.file_size,
+                'etag': self.etag,
+                'part_size': self.part_size,
+            }) + '\n')
+            for index, md5 in sorted(self.parts.items()):
+                f.write(json.dumps({'part': index, 'md5': md5}) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+class ResumableDownloader:
+    """
+    presigned URL byte 범위 요청으로 파일을 파트 단위로 받는 이어받기 다운로더
+
+    파트들을 공유 스레드 풀에서 동시에 받아 '<출력 파일>.part'의 해당 위치에
+    os.pwrite로 쓰고, 완료된 파트를 저널에 기록합니다. 스레드 풀과 HTTP 연결
+    풀은 다운로더 하나를 쓰는 모든 파일이 공유하므로 동시 요청 수는 파일 수와
+    관계없이 max_connections로 제한됩니다. 그 안에서 실제 동시 요청 수는
+    AdaptiveConcurrency가 처리량과 오류에 따라 AIMD 방식으로 조절합니다.
+
+    다시 실행하면 저널에 기록된 파트의 MD5를 로컬 데이터로 확인한 뒤 빠진
+    파트만 받습니다. 모든 파트를 받으면 ICA ETag와 비교한 뒤 최종 파일 이름으로
+    바꿉니다.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, max_retries: int = MAX_PART_RETRIES,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        """
+        Args:
+            session: HTTP 세션 (None이면 max_connections 크기의 연결 풀로 생성)
+            max_retries: 파트별 재시도 횟수
+            max_connections: 모든 파일을 합친 최대 동시 요청 수
+        """
+        self.session = session or make_session(max_connections)
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.concurrency = AdaptiveConcurrency(max_connections)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='ica-range')
+
+    def close(self) -> None:
+        """파트 다운로드 스레드 풀 종료"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ResumableDownloader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def download(self, url_factory: Callable[[], str], data_id: str, file_size: int, etag: str,
+                 output_path: str, progress: Optional["ProgressReporter"] = None) -> TransferStats:
+        """
+        파일 다운로드 (이어받기)
+
+        여러 스레드에서 동시에 호출할 수 있습니다.
+
+        Args:
+            url_factory: presigned 다운로드 URL을 발급하는 함수 (만료 시 다시 호출)
+            data_id: ICA 데이터 ID
+            file_size: 파일 크기
+            etag: ICA가 보고한 ETag (없으면 빈 문자열)
+            output_path: 저장할 파일 경로
+            progress: 받은 byte 수를 전달받을 진행 상황 기록기
+
+        Returns:
+            TransferStats: 전송 통계
+
+        Raises:
+            RuntimeError: 파트 다운로드 또는 체크섬 검증 실패시
+        """
+        etag = normalize_etag(etag)
+        part_path = f"{output_path}.part"
+
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            journal = self._open_journal(fd, part_path, data_id, file_size, etag)
+            # 파일 크기만큼 미리 확보 (파트를 제자리에 쓰기 위해)
+            os.ftruncate(fd, file_size)
+            stats = TransferStats(resumed_bytes=sum(
+                end - start + 1 for start, end in map(journal.part_range, journal.parts)))
+            if progress is not None and stats.resumed_bytes:
+                progress.credit(stats.resumed_bytes)
+            self._download_parts(fd, url_factory, journal, stats, progress)
+        finally:
+            os.close(fd)
+
+        part_md5s = [journal.parts[idx] for idx in range(journal.n_parts)]
+        if verify_etag(part_path, file_size, etag, journal.part_size, part_md5s) is False:
+            # 손상된 데이터로 다시 이어받지 않도록 저널과 임시 파일 삭제
+            os.remove(journal.path)
+            os.remove(part_path)
+            raise RuntimeError(f"체크섬 불일치: {os.path.basename(output_path)} (ETag {etag})")
+
+        os.replace(part_path, output_path)
+        os.remove(journal.path)
+        return stats
+
+    def _open_journal(self, fd: int, part_path: str, data_id: str, file_size: int,
+                      etag: str) -> DownloadJournal:
+        """기존 저널을 검증하여 재사용하거나 새 저널 생성"""
+        journal_path = f"{part_path}.journal"
+        journal = DownloadJournal.load(journal_path)
+        if journal and journal.matches(data_id, file_size, etag):
+            # 저널에 기록된 파트가 실제로 디스크에 있는지 확인
+            for index in list(journal.parts):
+                start, end = journal.part_range(index)
+                if range_md5(fd, start, end) != journal.parts[index]:
+                    del journal.parts[index]
+        else:
+            os.ftruncate(fd, 0)
+            journal = DownloadJournal(journal_path, data_id, file_size, etag, plan_part_size(file_size, etag))
+        journal.save()
+        return journal
+
+    def _download_parts(self, fd: int, url_factory: Callable[[], str], journal: DownloadJournal,
+                        stats: TransferStats, progress: Optional["ProgressReporter"]) -> None:
+        """
+        빠진 파트를 공유 스레드 풀에서 동시에 받고 완료되는 대로 저널과 통계에 기록
+
+        Raises:
+            RuntimeError: 재시도 후에도 실패한 파트가 있는 경우 (나머지 파트는 모두
+                기다려 저널에 기록한 뒤 발생)
+        """
+        missing = journal.missing_parts()
+        if not missing:
+            return
+
+        url = _SharedUrl(url_factory)
+        futures = {
+            self._executor.submit(self._download_part, fd, url, *journal.part_range(index), progress): index
+            for index in missing
+        }
+        errors = []
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    md5, retries = future.result()
+                except _PartFailed as e:
+                    stats.retries += e.retries
+                    errors.append(e)
+                    continue
+                journal.mark_done(index, md5)
+                start, end = journal.part_range(index)
+                stats.bytes_downloaded += end - start + 1
+                stats.retries += retries
+        finally:
+            # 호출자가 fd를 닫기 전에 남은 파트를 취소하거나 끝날 때까지 기다림
+            for future in futures:
+                future.cancel()
+            wait(futures)
+
+        if errors:
+            raise _PartFailed(str(errors[0]), stats.retries)
+
+    def _download_part(self, fd: int, url: "_SharedUrl", start: int, end: int,
+                       progress: Optional["ProgressReporter"]) -> Tuple[str, int]:
+        """
+        파트 하나를 받아 제자리에 쓰고 MD5 반환 (실패 시 재시도)
+
+        Returns:
+            Tuple[str, int]: (파트 MD5, 재시도 횟수)
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(min(2 ** attempt, 30))
+            try:
+                current = url.get()
+            except (RuntimeError, requests.RequestException) as e:
+                # URL 발급 실패도 다른 파트 오류처럼 재시도
+                last_error = e
+                continue
+            token = self.concurrency.acquire()
+            transferred, throttled = 0, False
+            try:
+                md5 = self._fetch_range(current, fd, start, end, progress)
+                transferred = end - start + 1
+                return md5, attempt
+            except requests.HTTPError as e:
+                last_error = e
+                status = e.response.status_code if e.response is not None else None
+                throttled = status in THROTTLE_STATUS_CODES
+                # presigned URL 만료 시 새로 발급
+                if status in (401, 403):
+                    url.refresh(current)
+            except requests.RequestException as e:
+                last_error = e
+                throttled = True
+            except RuntimeError as e:
+                last_error = e
+            except OSError as e:
+                # 디스크 쓰기 실패 (ENOSPC 등)는 재시도해도 같으므로 바로 실패 처리
+                raise _PartFailed(f"파트 쓰기 실패 (bytes {start}-{end}): {e}", attempt) from e
+            finally:
+                self.concurrency.release(token, transferred, error=throttled)
+        raise _PartFailed(f"파트 다운로드 실패 (bytes {start}-{end}): {last_error}", self.max_retries)
+
+    def _fetch_range(self, url: str, fd: int, start: int, end: int,
+                     progress: Optional["ProgressReporter"]) -> str:
+        """byte 범위 요청 결과를 파일의 해당 위치에 쓰면서 MD5 계산"""
+        if end < start:
+            return hashlib.md5().hexdigest()
+        response = self.session.get(url, headers={'Range': f'bytes={start}-{end}'},
+                                    stream=True, timeout=REQUEST_TIMEOUT)
+        digest = hashlib.md5()
+        offset = start
+        try:
+            with response:
+                response.raise_for_status()
+                # Range를 무시한 200 응답은 파일 전체가 이 파트와 같을 때만 허용
+                if response.status_code != 206 and not (start == 0 and end == self.file_size_of(response) - 1):
+                    raise RuntimeError("서버가 byte 범위 요청을 지원하지 않습니다.")
+
+                for chunk in response.iter_content(READ_CHUNK_SIZE):
+                    os.pwrite(fd, chunk, offset)
+                    digest.update(chunk)
+                    offset += len(chunk)
+                    if progress is not None:
+                        progress.update(len(chunk))
+            if offset != end + 1:
+                raise RuntimeError(f"받은 크기 불일치: {offset - start} != {end - start + 1}")
+        except Exception:
+            # 실패한 요청에서 받은 만큼 진행률을 되돌림 (재시도에서 다시 받음)
+            if progress is not None and offset > start:
+                progress.update(start - offset)
+            raise
+        return digest.hexdigest()
+
+    @staticmethod
+    def file_size_of(response: requests.Response) -> int:
+        """200 응답의 전체 크기 (Content-Length가 없으면 -1)"""
+        return int(response.headers.get('Content-Length', -1))
+
+
+class _PartFailed(RuntimeError):
+    """재시도 후에도 실패한 파트 (재시도 횟수 포함)"""
+
+    def __init__(self, message: str, retries: int):
+        super().__init__(message)
+        self.retries = retries
+
+
+class _SharedUrl:
+    """한 파일의 파트들이 공유하는 presigned URL (만료 시 한 번만 다시 발급)"""
+
+    def __init__(self, factory: Callable[[], str]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._url = None
+
+    def get(self) -> str:
+        with self._lock:
+            if self._url is None:
+                self._url = self._factory()
+            return self._url
+
+    def refresh(self, stale: str) -> None:
+        """stale URL이 아직 현재 URL이면 무효화 (다른 파트가 이미 갱신했으면 무시)"""
+        with self._lock:
+            if self._url == stale:
+                self._url = None
@@ -0,0 +1,76 @@
+"""ICA 프로젝트 데이터 경로/확장자 인덱스 모듈"""
+
+from bisect import bisect_left
+from typing import Iterable, List
+
+from .data_manager import ProjectData
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """prefix로 시작하는 모든 문자열보다 큰 가장 작은 문자열 반환 (범위 검색의 상한)"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PathIndex:
+    """
+    ProjectData 목록의 정렬 인덱스 클래스
+
+    경로 정렬 배열과 파일 이름을 뒤집은(소문자) 정렬 배열을 유지하여
+    경로 접두사 검색과 확장자(접미사) 검색을 모두 이진 탐색으로 처리합니다.
+    검색 비용은 O(log n + k) 입니다.
+    """
+
+    def __init__(self, data_list: Iterable[ProjectData]):
+        """
+        Args:
+            data_list: 인덱싱할 데이터 목록
+        """
+        by_path = sorted(data_list, key=lambda d: d.path)
+        self._paths = [d.path for d in by_path]
+        self._items = by_path
+
+        files = sorted(
+            ((d.name.lower()[::-1], d) for d in by_path if d.is_file),
+            key=lambda pair: pair[0]
+        )
+        self._reversed_names = [name for name, _ in files]
+        self._files = [d for _, d in files]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def under(self, path: str) -> List[ProjectData]:
+        """
+        경로가 path로 시작하는 데이터 (경로순)
+
+        Args:
+            path: 경로 접두사
+
+        Returns:
+            List[ProjectData]: 데이터 목록
+        """
+        if not path:
+            return list(self._items)
+        lo = bisect_left(self._paths, path)
+        hi = bisect_left(self._paths, prefix_upper_bound(path), lo)
+        return self._items[lo:hi]
+
+    def with_extension(self, extension: str) -> List[ProjectData]:
+        """
+        이름이 extension으로 끝나는 파일 (대소문자 무시)
+
+        Args:
+            extension: 확장자 (예: '.fastq', '.bam')
+
+        Returns:
+            List[ProjectData]: 파일 목록
+        """
+        if not extension:
+            return list(self._files)
+        suffix = extension.lower()[::-1]
+        lo = bisect_left(self._reversed_names, suffix)
+        hi = bisect_left(self._reversed_names, prefix_upper_bound(suffix), lo)
+        return self._files[lo:hi]
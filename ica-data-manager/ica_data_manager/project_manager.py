@@ -1,10 +1,9 @@
 """ICA 프로젝트 관리 모듈"""
 
-import subprocess
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
-from tabulate import tabulate
+
+from .backends import Backend, CliBackend
 
 
 @dataclass
@@ -26,8 +25,14 @@ class Project:
 class ProjectManager:
     """ICA 프로젝트 관리 클래스"""
 
-    @staticmethod
-    def list_projects() -> List[Project]:
+    def __init__(self, backend: Optional[Backend] = None):
+        """
+        Args:
+            backend: ICA API 호출 백엔드 (None이면 icav2 CLI)
+        """
+        self.backend = backend or CliBackend()
+
+    def list_projects(self) -> List[Project]:
         """
         ICA 프로젝트 목록 조회
         
@@ -35,21 +40,11 @@ class ProjectManager:
             List[Project]: 프로젝트 목록
         
         Raises:
-            subprocess.CalledProcessError: icav2 명령어 실행 실패시
-            json.JSONDecodeError: JSON 파싱 실패시
+            RuntimeError: 조회 또는 응답 파싱 실패시
         """
         try:
-            # icav2 명령어로 프로젝트 목록 조회 (JSON 형식)
-            result = subprocess.run(
-                ['icav2', 'projects', 'list', '--output-format', 'json'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # JSON 파싱
-            response_data = json.loads(result.stdout)
-            projects_data = response_data.get('items', [])
+            # 백엔드로 프로젝트 목록 조회 (icav2 JSON 형식)
+            projects_data = self.backend.list_projects()
             
             # Project 객체 리스트로 변환
             return [
@@ -69,10 +64,6 @@ class ProjectManager:
                 for project in projects_data
             ]
             
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"프로젝트 목록 조회 실패: {str(e)}")
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"프로젝트 데이터 파싱 실패: {str(e)}")
         except KeyError as e:
             raise RuntimeError(f"프로젝트 데이터 형식 오류: {str(e)}")
 
@@ -100,7 +91,8 @@ class ProjectManager:
             for p in projects
         ]
         
-        # 테이블 출력
+        # 테이블 출력 (tabulate는 출력할 때만 임포트)
+        from tabulate import tabulate
         print(tabulate(data, headers=headers, tablefmt='simple'))
         print(f"\nNo of items : {len(projects)}")
 
@@ -0,0 +1,116 @@
+"""ICA 다운로드 동시 요청 수 적응 조절 모듈"""
+
+import threading
+import time
+from typing import Optional
+
+
+# 처음 허용하는 동시 요청 수
+DEFAULT_INITIAL_CONCURRENCY = 4
+# 처리량이 이 비율 이상 늘어야 동시 요청 수를 더 늘림
+THROUGHPUT_GAIN = 1.05
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 방식으로 동시 요청 수를 조절하는 클래스
+
+    완료된 요청을 측정 구간(현재 한도만큼의 요청) 단위로 모아 처리량(byte/초)을 봅니다.
+    요청이 오류(스로틀링, 연결 오류 등)로 끝나면 동시 요청 수를 바로 절반으로
+    줄이고, 오류 없이 구간 처리량이 이전 최고치보다 늘었으면 하나 늘립니다.
+    처리량이 늘지 않았으면 그대로 유지하여 링크가 포화된 지점에 머뭅니다.
+    마지막으로 줄이기 전에 시작된 요청의 오류는 이미 반영된 것으로 보고 다시
+    줄이지 않습니다.
+    """
+
+    def __init__(self, max_concurrency: int, initial: int = DEFAULT_INITIAL_CONCURRENCY,
+                 min_concurrency: int = 1):
+        """
+        Args:
+            max_concurrency: 동시 요청 수 상한
+            initial: 처음 허용하는 동시 요청 수
+            min_concurrency: 동시 요청 수 하한
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.limit = max(self.min_concurrency, min(initial, max_concurrency))
+        self.peak_limit = self.limit
+        self.total_bytes = 0
+        self.total_errors = 0
+        self._in_flight = 0
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._started = None
+        self._best_throughput = 0.0
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_done = 0
+
+    def acquire(self) -> int:
+        """
+        동시 요청 수가 한도 아래로 내려갈 때까지 대기
+
+        Returns:
+            int: release에 넘길 토큰 (요청 시작 시점의 감소 세대)
+        """
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+            if self._started is None:
+                self._started = time.monotonic()
+                self._reset_window()
+            return self._generation
+
+    def release(self, token: int, nbytes: int, error: bool = False) -> None:
+        """
+        요청 완료 기록
+
+        Args:
+            token: acquire가 반환한 토큰
+            nbytes: 이 요청에서 받은 byte 수
+            error: 스로틀링/연결 오류로 실패했는지 여부
+        """
+        with self._cond:
+            self._in_flight -= 1
+            self.total_bytes += nbytes
+            self._window_bytes += nbytes
+            self._window_done += 1
+            if error:
+                self.total_errors += 1
+                # 오류는 구간이 끝나기를 기다리지 않고 바로 줄임
+                if token == self._generation:
+                    self._decrease()
+            elif self._window_done >= self.limit:
+                self._evaluate_window()
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.min_concurrency, self.limit // 2)
+        self._generation += 1
+        # 줄인 뒤에는 새 한도에서 처리량을 다시 측정
+        self._best_throughput = 0.0
+        self._reset_window()
+
+    def _evaluate_window(self) -> None:
+        elapsed = time.monotonic() - self._window_start
+        throughput = self._window_bytes / elapsed if elapsed > 0 else 0.0
+        if throughput > self._best_throughput * THROUGHPUT_GAIN and self.limit < self.max_concurrency:
+            self.limit += 1
+            self.peak_limit = max(self.peak_limit, self.limit)
+        self._best_throughput = max(self._best_throughput, throughput)
+        self._reset_window()
+
+    @property
+    def elapsed(self) -> float:
+        """첫 요청 이후 경과 시간(초)"""
+        return time.monotonic() - self._started if self._started is not None else 0.0
+
+    @property
+    def throughput_mb(self) -> Optional[float]:
+        """첫 요청 이후 평균 처리량 (MB/s, 요청이 없었으면 None)"""
+        elapsed = self.elapsed
+        return self.total_bytes / elapsed / (1024 * 1024) if elapsed > 0 else None
@@ -0,0 +1,122 @@
+"""여러 ICA 프로젝트 데이터 동시 검색 모듈"""
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterable, Optional, Sequence
+
+from .data_manager import DataManager, ProjectData
+
+
+# 동시에 목록을 조회하는 프로젝트 수 기본값
+DEFAULT_SEARCH_CONCURRENCY = 8
+
+# 크기 단위 (format_size와 같은 1024 단위)
+_SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4, 'P': 1024 ** 5}
+_SIZE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGTP]?)(?:I?B)?\s*$', re.IGNORECASE)
+
+# 모든 프로젝트 조회가 끝났음을 알리는 대기열 표시
+_DONE = object()
+
+
+def parse_size(text: str) -> int:
+    """
+    '500', '1.5G', '200MB' 같은 크기 문자열을 byte 수로 변환
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    match = _SIZE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"잘못된 크기 형식: {text} (예: 500, 200M, 1.5G)")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.upper()])
+
+
+@dataclass
+class DataFilter:
+    """프로젝트 데이터 검색 조건 (지정하지 않은 조건은 검사하지 않음)"""
+    name: Optional[str] = None        # 파일 이름 glob 패턴 (예: '*_R1*.fq.gz')
+    formats: Sequence[str] = ()       # ICA 데이터 형식 (예: 'FASTQ', 'BAM'), 대소문자 무시
+    min_size: Optional[int] = None    # 최소 크기 (byte)
+    max_size: Optional[int] = None    # 최대 크기 (byte)
+    path: Optional[str] = None        # 경로 접두사 (예: '/sequencing_data/')
+    files_only: bool = True           # 폴더 제외
+
+    def __post_init__(self):
+        self._formats = {fmt.upper() for fmt in self.formats}
+
+    def matches(self, data: ProjectData) -> bool:
+        """데이터가 모든 조건을 만족하는지 확인"""
+        if self.files_only and not data.is_file:
+            return False
+        if self.path and not data.path.startswith(self.path):
+            return False
+        if self.min_size is not None and data.file_size < self.min_size:
+            return False
+        if self.max_size is not None and data.file_size > self.max_size:
+            return False
+        if self._formats and (data.format or '').upper() not in self._formats:
+            return False
+        if self.name and not fnmatch.fnmatchcase(data.name, self.name):
+            return False
+        return True
+
+
+async def search_projects(manager: DataManager, project_ids: Iterable[str], data_filter: DataFilter,
+                          max_concurrency: int = DEFAULT_SEARCH_CONCURRENCY,
+                          on_error: Optional[Callable[[str, Exception], None]] = None
+                          ) -> AsyncIterator[ProjectData]:
+    """
+    여러 프로젝트의 데이터 목록을 동시에 조회하며 조건에 맞는 항목을 도착하는 대로 반환
+
+    프로젝트마다 하나의 작업이 페이지 단위로 목록을 조회하고, 동시에 조회하는
+    프로젝트 수는 max_concurrency로 제한합니다. 모든 프로젝트가 끝날 때까지
+    기다리지 않고 먼저 도착한 항목부터 반환하며, 호출한 쪽이 도중에 반복을
+    멈추면 남은 조회는 취소됩니다.
+
+    Args:
+        manager: 목록 조회에 사용할 DataManager (백엔드의 asyncio 조회 사용)
+        project_ids: 검색할 프로젝트 ID 목록
+        data_filter: 검색 조건
+        max_concurrency: 동시에 조회하는 프로젝트 수
+        on_error: 프로젝트 조회 실패시 호출할 함수 (project_id, 예외).
+            None이면 첫 실패에서 예외를 그대로 발생
+
+    Yields:
+        ProjectData: 조건에 맞는 데이터 (프로젝트 간 순서는 보장하지 않음)
+
+    Raises:
+        RuntimeError: on_error가 없고 프로젝트 조회에 실패한 경우
+    """
+    import asyncio
+
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def scan(project_id: str) -> None:
+        async with semaphore:
+            try:
+                async for data in manager.aiter_pages(project_id):
+                    if data_filter.matches(data):
+                        queue.put_nowait(data)
+            except RuntimeError as e:
+                if on_error is None:
+                    raise
+                on_error(project_id, e)
+
+    tasks = [asyncio.create_task(scan(project_id)) for project_id in project_ids]
+    finished = asyncio.gather(*tasks)
+    finished.add_done_callback(lambda _: queue.put_nowait(_DONE))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            yield item
+        # 실패한 프로젝트가 있으면 예외 발생
+        await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(finished, return_exceptions=True)
@@ -0,0 +1,185 @@
+"""ICA 폴더를 로컬 디렉토리로 미러링하는 동기화 모듈"""
+
+import fnmatch
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, TYPE_CHECKING
+
+from .data_manager import DataManager, ProjectData
+
+if TYPE_CHECKING:
+    from .telemetry import DownloadResult, ProgressReporter
+
+
+# 다시 받는 이유별 출력 문구
+SYNC_REASONS = {
+    'new': '새 파일',
+    'size': '크기 다름',
+    'newer': 'ICA가 더 최신',
+    'checksum': '내용 다름',
+}
+# 로컬/ICA 수정 시각 비교 허용 오차 (초, 파일 시스템의 시각 해상도 고려)
+MTIME_TOLERANCE = 1.0
+
+
+def parse_timestamp(text: str) -> Optional[float]:
+    """ICA 시각 문자열('2024-06-25T01:02:03.123Z')을 epoch 초로 변환 (형식이 다르면 None)"""
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def matches_patterns(relative_path: str, patterns: Sequence[str]) -> bool:
+    """
+    상대 경로가 glob 패턴 중 하나에 맞는지 확인
+
+    '/'가 없는 패턴은 파일 이름에, '/'가 있는 패턴은 동기화 폴더 기준 상대
+    경로에 맞춥니다 (예: '*.bam', 'Undetermined*', 'lane1/*.fq.gz').
+    """
+    name = relative_path.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatchcase(relative_path if '/' in pattern else name, pattern)
+               for pattern in patterns)
+
+
+@dataclass
+class SyncEntry:
+    """다운로드할 파일 하나 (ICA 데이터, 저장 경로, 다시 받는 이유)"""
+    data: ProjectData
+    local_path: str
+    reason: str
+
+
+@dataclass
+class SyncPlan:
+    """동기화 계획 (받을 파일 목록과 건너뛰는 파일 통계)"""
+    remote_path: str
+    local_dir: str
+    transfers: List[SyncEntry] = field(default_factory=list)
+    unchanged_files: int = 0
+    unchanged_bytes: int = 0
+    excluded_files: int = 0
+
+    @property
+    def transfer_bytes(self) -> int:
+        """받을 전체 크기 (byte)"""
+        return sum(entry.data.file_size for entry in self.transfers)
+
+    def count_by_reason(self) -> dict:
+        """다시 받는 이유별 파일 수"""
+        counts = {reason: 0 for reason in SYNC_REASONS}
+        for entry in self.transfers:
+            counts[entry.reason] += 1
+        return counts
+
+
+def compare_local(data: ProjectData, local_path: str, checksum: bool = False) -> Optional[str]:
+    """
+    ICA 파일과 로컬 파일을 비교하여 다시 받아야 하는 이유 반환
+
+    크기가 다르면 다시 받고, 크기가 같으면 checksum이면 ETag를, 아니면
+    수정 시각을 비교합니다 (ICA 쪽이 로컬보다 나중에 수정된 경우에만 다시 받음).
+
+    Returns:
+        Optional[str]: SYNC_REASONS의 키 (같으면 None)
+    """
+    from .downloader import local_etag_matches
+
+    try:
+        stat = os.stat(local_path)
+    except FileNotFoundError:
+        return 'new'
+    if stat.st_size != data.file_size:
+        return 'size'
+    if checksum:
+        matched = local_etag_matches(local_path, data.file_size, data.object_etag)
+        if matched is not None:
+            return None if matched else 'checksum'
+    remote_mtime = parse_timestamp(data.time_modified)
+    if remote_mtime is not None and remote_mtime > stat.st_mtime + MTIME_TOLERANCE:
+        return 'newer'
+    return None
+
+
+def plan_sync(data_list: Iterable[ProjectData], remote_path: str, local_dir: str,
+              include: Sequence[str] = (), exclude: Sequence[str] = (),
+              checksum: bool = False) -> SyncPlan:
+    """
+    remote_path 아래 파일을 local_dir에 같은 폴더 구조로 맞추기 위한 동기화 계획 작성
+
+    로컬 파일은 stat만 확인하므로 (checksum이면 크기가 같은 파일의 MD5도 계산)
+    변경되지 않은 파일이 많아도 계획 비용은 목록 크기에 비례합니다.
+
+    Args:
+        data_list: 프로젝트 데이터 목록 또는 반복자
+        remote_path: 동기화할 ICA 폴더 (예: /runs/RUN1/)
+        local_dir: 로컬 디렉토리
+        include: 포함할 glob 패턴 (지정하면 하나라도 맞는 파일만)
+        exclude: 제외할 glob 패턴
+        checksum: 크기가 같은 파일은 수정 시각 대신 ETag(MD5)로 비교할지 여부
+
+    Returns:
+        SyncPlan: 동기화 계획
+    """
+    if not remote_path.endswith('/'):
+        remote_path += '/'
+    plan = SyncPlan(remote_path=remote_path, local_dir=local_dir)
+    for data in data_list:
+        if not data.is_file or not data.path.startswith(remote_path):
+            continue
+        relative_path = data.path[len(remote_path):]
+        if (include and not matches_patterns(relative_path, include)) or \
+                matches_patterns(relative_path, exclude):
+            plan.excluded_files += 1
+            continue
+        local_path = os.path.join(local_dir, *relative_path.split('/'))
+        reason = compare_local(data, local_path, checksum)
+        if reason is None:
+            plan.unchanged_files += 1
+            plan.unchanged_bytes += data.file_size
+        else:
+            plan.transfers.append(SyncEntry(data, local_path, reason))
+    return plan
+
+
+def run_sync(manager: DataManager, project_id: str, plan: SyncPlan, max_workers: int = 4,
+             max_connections: int = 8, progress: Optional["ProgressReporter"] = None) -> List["DownloadResult"]:
+    """
+    동기화 계획의 파일만 병렬로 다운로드하고 로컬 수정 시각을 ICA 수정 시각으로 맞춤
+
+    계획에 있는 파일은 크기가 같은 로컬 파일이 있어도 덮어쓰며, 큰 파일부터
+    하나의 연결 풀을 공유하여 받습니다.
+
+    Args:
+        manager: 다운로드에 사용할 DataManager
+        project_id: 프로젝트 ID
+        plan: plan_sync로 만든 동기화 계획
+        max_workers: 최대 동시 다운로드 파일 수
+        max_connections: 모든 파일을 합친 동시 byte 범위 요청 수 상한
+        progress: 진행 상황 기록기 (None이면 터미널일 때만 진행 막대 표시)
+
+    Returns:
+        List[DownloadResult]: 파일별 다운로드 결과
+    """
+    from .telemetry import DownloadStatus, ProgressReporter
+
+    if progress is None:
+        progress = ProgressReporter()
+    progress.event('start', project_id=project_id, path=plan.remote_path, output_dir=plan.local_dir,
+                   max_workers=max_workers, max_connections=max_connections)
+
+    entries = {entry.local_path: entry for entry in plan.transfers}
+    results = manager.download_files(project_id, [(entry.data, entry.local_path) for entry in plan.transfers],
+                                     max_workers, max_connections, progress=progress, label='변경된 파일',
+                                     overwrite=True)
+
+    # 다음 동기화에서 수정 시각으로 변경 여부를 판단할 수 있도록 ICA 수정 시각을 기록
+    for result in results:
+        if result.status in (DownloadStatus.DOWNLOADED, DownloadStatus.RESUMED):
+            remote_mtime = parse_timestamp(entries[result.output_path].data.time_modified)
+            if remote_mtime is not None:
+                os.utime(result.output_path, (remote_mtime, remote_mtime))
+    return results
@@ -0,0 +1,310 @@
+"""ICA 프로젝트 데이터 열 기반(columnar) 테이블 모듈"""
+
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .data_manager import ProjectData
+
+
+# 목록을 numpy 배열로 옮기는 단위 (이만큼 모일 때마다 파이썬 객체를 버림)
+CHUNK_ROWS = 65536
+
+# 값의 종류가 적어 사전 부호화(정수 코드 + 값 목록)로 저장하는 열
+CATEGORICAL_COLUMNS = ('data_type', 'format', 'status', 'creator_id', 'project_id', 'project_name')
+# 항목마다 값이 다른 문자열 열
+STRING_COLUMNS = ('id', 'name', 'path', 'time_created', 'time_modified', 'object_etag')
+# ProjectData 생성자 인자 순서
+PROJECT_DATA_FIELDS = tuple(field.name for field in fields(ProjectData))
+
+# numpy 2의 가변 길이 문자열 dtype (없으면 고정 길이 유니코드 배열 사용)
+_STRING_DTYPE = np.dtypes.StringDType() if hasattr(np, 'dtypes') and hasattr(np.dtypes, 'StringDType') else str
+# 벡터화 문자열 함수 (numpy 2는 np.strings, 이전 버전은 np.char)
+_strings = getattr(np, 'strings', np.char)
+
+
+def _copy_tags(tags: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """tags 딕셔너리 복사 (태그 목록까지 새로 만들어 테이블과 ProjectData가 공유하지 않도록 함)"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in tags.items()}
+
+
+def _string_array(values: List[str]) -> np.ndarray:
+    return np.array(values, dtype=_STRING_DTYPE) if values else np.array([], dtype=_STRING_DTYPE)
+
+
+class ProjectDataTable:
+    """
+    ProjectData 목록을 열별 numpy 배열로 저장하는 테이블 클래스
+
+    항목마다 파이썬 객체(문자열 13개와 tags 딕셔너리)를 두는 대신 열마다 배열
+    하나를 둡니다. 크기는 int64 배열, 이름/경로 같은 문자열은 가변 길이 문자열
+    배열, 데이터 유형/형식/상태/프로젝트/tags처럼 값의 종류가 적은 열은 값 목록과
+    int32 코드 배열(사전 부호화)로 저장하여 같은 문자열을 한 번만 보관합니다.
+
+    필터와 정렬은 배열 연산으로 고른 행 번호만 새 테이블에 담고 열 배열은
+    원래 테이블과 공유하므로 문자열을 복사하지 않습니다. ProjectData 객체는
+    인덱싱하거나 반복할 때만 만들어지므로 기존 ProjectData API(이름, 경로,
+    file_size_readable 등)는 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], categories: Dict[str, List[Any]],
+                 rows: Optional[np.ndarray] = None, cache: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Args:
+            columns: 열 이름별 배열 (사전 부호화 열은 코드 배열)
+            categories: 사전 부호화 열 이름별 값 목록
+            rows: 이 테이블에 속한 columns의 행 번호 (None이면 전체 행)
+            cache: columns에서 계산한 파생 배열 (같은 columns를 쓰는 테이블끼리 공유)
+
+        보통은 from_items로 생성합니다.
+        """
+        self._columns = columns
+        self._categories = categories
+        self._rows = rows
+        self._cache = {} if cache is None else cache
+
+    @classmethod
+    def from_items(cls, data_list: Iterable[ProjectData]) -> "ProjectDataTable":
+        """
+        ProjectData 목록 또는 반복자로 테이블 생성
+
+        iter_project_data 같은 반복자를 넘기면 CHUNK_ROWS개씩 배열로 옮기므로
+        전체 목록을 파이썬 객체로 한꺼번에 들고 있지 않습니다.
+        """
+        lookups: Dict[str, Dict[Any, int]] = {name: {} for name in CATEGORICAL_COLUMNS + ('tags',)}
+        tag_values: List[Dict[str, List[str]]] = []
+        chunks: Dict[str, List[np.ndarray]] = {name: [] for name in
+                                               STRING_COLUMNS + CATEGORICAL_COLUMNS + ('tags', 'file_size')}
+
+        def add_chunk(rows: List[ProjectData]) -> None:
+            for name in STRING_COLUMNS:
+                chunks[name].append(_string_array([getattr(d, name) for d in rows]))
+            for name in CATEGORICAL_COLUMNS:
+                lookup = lookups[name]
+                chunks[name].append(np.array([lookup.setdefault(getattr(d, name), len(lookup)) for d in rows],
+                                             dtype=np.int32))
+            # tags 딕셔너리는 해시할 수 없으므로 repr을 키로 값 목록에 한 번만 보관
+            lookup = lookups['tags']
+            codes = []
+            for d in rows:
+                key = repr(d.tags)
+                code = lookup.get(key)
+                if code is None:
+                    code = lookup[key] = len(lookup)
+                    tag_values.append(_copy_tags(d.tags))
+                codes.append(code)
+            chunks['tags'].append(np.array(codes, dtype=np.int32))
+            chunks['file_size'].append(np.array([d.file_size for d in rows], dtype=np.int64))
+
+        rows: List[ProjectData] = []
+        for data in data_list:
+            rows.append(data)
+            if len(rows) >= CHUNK_ROWS:
+                add_chunk(rows)
+                rows = []
+        if rows or not chunks['file_size']:
+            add_chunk(rows)
+
+        # 열마다 이어 붙이고 바로 조각을 버려서 최대 메모리를 줄임
+        columns = {name: np.concatenate(chunks.pop(name)) for name in list(chunks)}
+        categories = {name: list(lookups[name]) for name in CATEGORICAL_COLUMNS}
+        categories['tags'] = tag_values
+        return cls(columns, categories)
+
+    def __len__(self) -> int:
+        return len(self._columns['file_size']) if self._rows is None else len(self._rows)
+
+    def __iter__(self) -> Iterator[ProjectData]:
+        # 행마다 배열 원소를 꺼내지 않고 CHUNK_ROWS개씩 파이썬 리스트로 바꿔서 만듦
+        for start in range(0, len(self), CHUNK_ROWS):
+            yield from self._make_rows(slice(start, start + CHUNK_ROWS))
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray, List[int]]) -> Union[ProjectData, "ProjectDataTable"]:
+        """
+        정수 인덱스는 ProjectData, 슬라이스/불리언 마스크/인덱스 배열은 부분 테이블 반환
+        """
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(f"인덱스 범위 초과: {key}")
+            return next(self._make_rows(slice(index, index + 1)))
+        return self.take(key)
+
+    def _select(self, array: np.ndarray, key: Union[slice, np.ndarray, None] = None) -> np.ndarray:
+        """columns 배열에서 이 테이블의 행(중 key 부분)만 꺼냄"""
+        rows = self._rows
+        if rows is None:
+            return array if key is None else array[key]
+        return array[rows if key is None else rows[key]]
+
+    def _make_rows(self, key: slice) -> Iterator[ProjectData]:
+        """key 범위의 ProjectData 생성"""
+        columns = {name: self._select(self._columns[name], key).tolist()
+                   for name in STRING_COLUMNS + ('file_size',)}
+        for name in CATEGORICAL_COLUMNS:
+            categories = self._categories[name]
+            columns[name] = [categories[code] for code in self._select(self._columns[name], key).tolist()]
+        tags = self._categories['tags']
+        columns['tags'] = [_copy_tags(tags[code]) for code in self._select(self._columns['tags'], key).tolist()]
+        for values in zip(*(columns[name] for name in PROJECT_DATA_FIELDS)):
+            yield ProjectData(*values)
+
+    def take(self, key: Union[slice, np.ndarray, List[int]]) -> "ProjectDataTable":
+        """
+        슬라이스, 불리언 마스크 또는 인덱스 배열로 고른 행의 테이블
+
+        고른 행 번호만 저장하고 열 배열과 값 목록은 이 테이블과 공유합니다.
+        """
+        if isinstance(key, list):
+            key = np.asarray(key, dtype=np.intp)
+        if isinstance(key, np.ndarray) and key.dtype == bool and key.all():
+            # 테이블은 바뀌지 않으므로 모든 행을 고르면 그대로 반환
+            return self
+        rows = np.arange(len(self), dtype=np.intp)[key] if self._rows is None else self._rows[key]
+        return ProjectDataTable(self._columns, self._categories, rows, self._cache)
+
+    def to_list(self) -> List[ProjectData]:
+        """모든 행을 ProjectData 리스트로 변환"""
+        return list(self)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        열 값 배열 (사전 부호화 열은 값으로 풀어서 반환)
+
+        Raises:
+            KeyError: 알 수 없는 열 이름인 경우
+        """
+        if name not in self._columns:
+            raise KeyError(f"알 수 없는 열: {name}")
+        values = self._select(self._columns[name])
+        if name in self._categories:
+            lookup = np.empty(len(self._categories[name]), dtype=object)
+            lookup[:] = self._categories[name]
+            return lookup[values]
+        return values
+
+    def _derived(self, name: str, compute) -> np.ndarray:
+        """columns 전체에서 한 번 계산해 두는 파생 배열 중 이 테이블의 행"""
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._select(self._cache[name])
+
+    def _category_mask(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        """사전 부호화 열이 values 중 하나인 행의 마스크 (값 목록에서 코드를 찾아 정수 비교)"""
+        wanted = set(values)
+        codes = [code for code, value in enumerate(self._categories[name]) if value in wanted]
+        return np.isin(self._select(self._columns[name]), codes)
+
+    @property
+    def is_file(self) -> np.ndarray:
+        """파일인 행의 마스크"""
+        return self._category_mask('data_type', ['FILE'])
+
+    @property
+    def is_folder(self) -> np.ndarray:
+        """폴더인 행의 마스크"""
+        return self._category_mask('data_type', ['FOLDER'])
+
+    @property
+    def file_size(self) -> np.ndarray:
+        """크기 열 (int64)"""
+        return self._select(self._columns['file_size'])
+
+    def files(self) -> "ProjectDataTable":
+        """파일만 고른 테이블"""
+        return self.take(self.is_file)
+
+    def folders(self) -> "ProjectDataTable":
+        """폴더만 고른 테이블"""
+        return self.take(self.is_folder)
+
+    def under(self, path: str) -> "ProjectDataTable":
+        """경로가 path로 시작하는 행의 테이블"""
+        if not path:
+            return self
+        return self.take(_strings.startswith(self._select(self._columns['path']), path))
+
+    def with_extension(self, extension: str) -> "ProjectDataTable":
+        """이름이 extension으로 끝나는 파일의 테이블 (대소문자 무시)"""
+        mask = self.is_file
+        if extension:
+            lower_names = self._derived('lower_name', lambda: _strings.lower(self._columns['name']))
+            mask &= _strings.endswith(lower_names, extension.lower())
+        return self.take(mask)
+
+    def with_format(self, *formats: str) -> "ProjectDataTable":
+        """ICA 데이터 형식이 formats 중 하나인 행의 테이블 (대소문자 무시)"""
+        wanted = {fmt.upper() for fmt in formats}
+        return self.take(self._category_mask('format', [value for value in self._categories['format']
+                                                        if value is not None and value.upper() in wanted]))
+
+    def size_between(self, min_size: Optional[int] = None, max_size: Optional[int] = None) -> "ProjectDataTable":
+        """크기가 [min_size, max_size] 범위인 행의 테이블"""
+        sizes = self.file_size
+        mask = np.ones(len(sizes), dtype=bool)
+        if min_size is not None:
+            mask &= sizes >= min_size
+        if max_size is not None:
+            mask &= sizes <= max_size
+        return self.take(mask)
+
+    def sort_by(self, name: str, descending: bool = False) -> "ProjectDataTable":
+        """
+        열 값 기준으로 정렬한 테이블 (같은 값은 원래 순서 유지)
+
+        Raises:
+            KeyError: 알 수 없는 열 이름인 경우
+            ValueError: tags 열인 경우
+        """
+        if name not in self._columns:
+            raise KeyError(f"알 수 없는 열: {name}")
+        if name == 'tags':
+            raise ValueError("tags 열로는 정렬할 수 없습니다")
+        keys = self._select(self._columns[name])
+        if name in self._categories:
+            # 값 목록의 정렬 순위로 코드를 바꿔 정수 정렬 (None은 가장 앞)
+            values = self._categories[name]
+            ranks = np.empty(len(values), dtype=np.int32)
+            ranks[sorted(range(len(values)), key=lambda code: (values[code] is not None, values[code] or ''))] = \
+                np.arange(len(values), dtype=np.int32)
+            keys = ranks[keys]
+        if descending:
+            # 오름차순 결과를 뒤집으면 같은 값끼리 순서도 뒤집히므로 뒤집은 배열을 안정 정렬한 뒤 되돌림
+            order = len(keys) - 1 - np.argsort(keys[::-1], kind='stable')[::-1]
+        else:
+            order = np.argsort(keys, kind='stable')
+        return self.take(order)
+
+    def total_size(self) -> int:
+        """전체 크기 합계 (byte)"""
+        return int(self.file_size.sum())
+
+    def size_by(self, name: str) -> Dict[Any, int]:
+        """
+        사전 부호화 열 값별 크기 합계 (예: size_by('format'))
+
+        Raises:
+            ValueError: 사전 부호화 열이 아닌 경우
+        """
+        if name not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"값별 합계는 {', '.join(CATEGORICAL_COLUMNS)} 열만 지원합니다: {name}")
+        codes = self._select(self._columns[name])
+        totals = np.zeros(len(self._categories[name]), dtype=np.int64)
+        np.add.at(totals, codes, self.file_size)
+        counts = np.bincount(codes, minlength=len(totals))
+        return {value: int(total) for value, total, count in zip(self._categories[name], totals, counts) if count}
+
+    def count_by(self, name: str) -> Dict[Any, int]:
+        """
+        사전 부호화 열 값별 행 수
+
+        Raises:
+            ValueError: 사전 부호화 열이 아닌 경우
+        """
+        if name not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"값별 집계는 {', '.join(CATEGORICAL_COLUMNS)} 열만 지원합니다: {name}")
+        counts = np.bincount(self._select(self._columns[name]), minlength=len(self._categories[name]))
+        return {value: int(count) for value, count in zip(self._categories[name], counts) if count}
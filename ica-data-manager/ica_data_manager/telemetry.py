@@ -0,0 +1,278 @@
+"""ICA 다운로드 진행 상황/처리량 기록 모듈"""
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional, TextIO
+
+
+# 진행 막대를 다시 그리는 최소 간격(초)
+PROGRESS_REFRESH_INTERVAL = 0.2
+# 이벤트 로그에 진행 상황을 기록하는 간격(초)
+PROGRESS_EVENT_INTERVAL = 5.0
+# 진행 막대 너비 (문자 수)
+PROGRESS_BAR_WIDTH = 30
+
+
+def format_size(size: float) -> str:
+    """byte 수를 읽기 쉬운 형태로 변환"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}PB"
+
+
+def format_duration(seconds: float) -> str:
+    """초를 H:MM:SS 형태로 변환"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class DownloadStatus(Enum):
+    """파일 다운로드 결과 상태"""
+    DOWNLOADED = 'downloaded'  # 처음부터 받음
+    RESUMED = 'resumed'        # 이전 실행의 저널에서 이어받음
+    SKIPPED = 'skipped'        # 같은 크기의 파일이 이미 있음
+    FAILED = 'failed'
+
+
+# 상태별 사람용 메시지 머리말
+STATUS_LABELS = {
+    DownloadStatus.DOWNLOADED: '다운로드 완료',
+    DownloadStatus.RESUMED: '이어받기 완료',
+    DownloadStatus.SKIPPED: '이미 존재',
+    DownloadStatus.FAILED: '다운로드 실패',
+}
+
+# 업로드 결과의 상태별 머리말
+UPLOAD_STATUS_LABELS = {
+    DownloadStatus.DOWNLOADED: '업로드 완료',
+    DownloadStatus.RESUMED: '이어올리기 완료',
+    DownloadStatus.SKIPPED: '이미 존재',
+    DownloadStatus.FAILED: '업로드 실패',
+}
+
+
+@dataclass
+class DownloadResult:
+    """파일 하나의 다운로드 결과"""
+    name: str
+    data_id: str
+    output_path: str
+    status: DownloadStatus
+    file_size: int
+    bytes_downloaded: int = 0  # 이번 실행에서 실제로 받은 byte 수
+    duration: float = 0.0
+    retries: int = 0
+    error: str = ''
+
+    labels = STATUS_LABELS
+
+    @property
+    def ok(self) -> bool:
+        """성공 여부 (건너뜀 포함)"""
+        return self.status != DownloadStatus.FAILED
+
+    @property
+    def throughput_mb(self) -> float:
+        """파일 처리량 (MB/s)"""
+        return self.bytes_downloaded / self.duration / (1024 * 1024) if self.duration > 0 else 0.0
+
+    @property
+    def message(self) -> str:
+        """사람용 한 줄 메시지"""
+        label = self.labels[self.status]
+        if self.status == DownloadStatus.FAILED:
+            return f"{label}: {self.name} - {self.error}"
+        message = f"{label}: {self.name} ({format_size(self.file_size)})"
+        if self.bytes_downloaded:
+            message += f" {self.throughput_mb:.1f}MB/s"
+        if self.retries:
+            message += f", 재시도 {self.retries}회"
+        return message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """이벤트 로그용 딕셔너리"""
+        return {
+            'name': self.name,
+            'data_id': self.data_id,
+            'output_path': self.output_path,
+            'status': self.status.value,
+            'file_size': self.file_size,
+            'bytes_downloaded': self.bytes_downloaded,
+            'duration': round(self.duration, 3),
+            'throughput_mb': round(self.throughput_mb, 3),
+            'retries': self.retries,
+            'error': self.error,
+        }
+
+
+@dataclass
+class UploadResult(DownloadResult):
+    """
+    파일 하나의 업로드 결과
+
+    output_path는 ICA 경로, bytes_downloaded는 이번 실행에서 보낸 byte 수이며
+    DOWNLOADED는 새로 올린 파일, RESUMED는 이전 실행에서 이어 올린 파일입니다.
+    """
+    local_path: str = ''
+
+    labels = UPLOAD_STATUS_LABELS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """이벤트 로그용 딕셔너리"""
+        record = super().to_dict()
+        record['remote_path'] = record.pop('output_path')
+        record['bytes_uploaded'] = record.pop('bytes_downloaded')
+        if self.status == DownloadStatus.DOWNLOADED:
+            record['status'] = 'uploaded'
+        record['local_path'] = self.local_path
+        return record
+
+
+def writes_to_stdout(stream: TextIO) -> bool:
+    """스트림이 표준 출력인지 확인 (--event-log - 등)"""
+    try:
+        return stream.fileno() == sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+class ProgressReporter:
+    """
+    전체 다운로드 진행 상황 표시/기록 클래스
+
+    파일이 대기열에 들어올 때마다 전체 크기를 늘리고, 받은 byte 수로 진행
+    막대와 남은 시간(ETA)을 표시합니다. 이미 있던 데이터(건너뛴 파일, 이어받기
+    전에 받아 둔 파트)는 진행률에는 더하지만 처리량 계산에서는 뺍니다.
+    event_log가 주어지면 모든 이벤트를 JSON 한 줄씩 기록하며, event_log가 표준
+    출력이면 JSON-lines만 남도록 메시지를 표준 오류로 보냅니다.
+
+    여러 스레드에서 동시에 호출할 수 있습니다.
+    """
+
+    def __init__(self, event_log: Optional[TextIO] = None, show_progress: Optional[bool] = None,
+                 stream: TextIO = sys.stderr):
+        """
+        Args:
+            event_log: JSON-lines 이벤트를 기록할 파일 객체
+            show_progress: 진행 막대 표시 여부 (None이면 stream이 터미널일 때만 표시)
+            stream: 진행 막대를 출력할 스트림 (메시지는 표준 출력)
+        """
+        self.event_log = event_log
+        self.stream = stream
+        self.message_stream = sys.stderr if event_log is not None and writes_to_stdout(event_log) else sys.stdout
+        self.show_progress = stream.isatty() if show_progress is None else show_progress
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.transferred_bytes = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._last_draw = 0.0
+        self._last_event = self._started
+        self._bar_visible = False
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def event(self, event_type: str, **fields: Any) -> None:
+        """이벤트 로그에 JSON 한 줄 기록"""
+        if self.event_log is None:
+            return
+        record = {'time': time.time(), 'event': event_type, **fields}
+        with self._lock:
+            self.event_log.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.event_log.flush()
+
+    def add_file(self, name: str, data_id: str, file_size: int) -> None:
+        """다운로드 대상 파일 추가"""
+        with self._lock:
+            self.total_files += 1
+            self.total_bytes += file_size
+        self.event('queued', name=name, data_id=data_id, file_size=file_size)
+
+    def credit(self, nbytes: int) -> None:
+        """이미 로컬에 있는 데이터만큼 진행률 증가 (처리량에는 포함하지 않음)"""
+        with self._lock:
+            self.done_bytes += nbytes
+        self._refresh()
+
+    def update(self, nbytes: int) -> None:
+        """받은 데이터만큼 진행률 증가 (실패한 요청은 음수로 되돌림)"""
+        with self._lock:
+            self.done_bytes += nbytes
+            self.transferred_bytes += nbytes
+        self._refresh()
+
+    def file_done(self, result: DownloadResult) -> None:
+        """파일 결과 출력 및 기록"""
+        if result.status == DownloadStatus.SKIPPED:
+            self.credit(result.file_size)
+        self.write(result.message)
+        self.event('file_done', **result.to_dict())
+
+    def write(self, message: str) -> None:
+        """진행 막대를 지우고 메시지 한 줄을 출력 (event_log가 표준 출력이면 표준 오류)"""
+        with self._lock:
+            self._clear_bar()
+            print(message, file=self.message_stream, flush=True)
+        self._refresh(force=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 진행 상황 (경과 시간, byte 수, 처리량, ETA)"""
+        elapsed = self.elapsed
+        rate = self.transferred_bytes / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total_bytes - self.done_bytes, 0)
+        return {
+            'elapsed': round(elapsed, 3),
+            'total_files': self.total_files,
+            'total_bytes': self.total_bytes,
+            'done_bytes': self.done_bytes,
+            'transferred_bytes': self.transferred_bytes,
+            'throughput_mb': round(rate / (1024 * 1024), 3),
+            'eta': round(remaining / rate, 1) if rate > 0 else None,
+        }
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            emit = now - self._last_event >= PROGRESS_EVENT_INTERVAL
+            if emit:
+                self._last_event = now
+        if emit:
+            self.event('progress', **self.snapshot())
+        if not self.show_progress or (not force and now - self._last_draw < PROGRESS_REFRESH_INTERVAL):
+            return
+        with self._lock:
+            self._last_draw = now
+            self._draw()
+
+    def _draw(self) -> None:
+        state = self.snapshot()
+        ratio = state['done_bytes'] / state['total_bytes'] if state['total_bytes'] else 0.0
+        filled = int(PROGRESS_BAR_WIDTH * min(ratio, 1.0))
+        eta = format_duration(state['eta']) if state['eta'] is not None else '-:--:--'
+        line = (f"[{'#' * filled}{'.' * (PROGRESS_BAR_WIDTH - filled)}] {ratio * 100:5.1f}% "
+                f"{format_size(state['done_bytes'])}/{format_size(state['total_bytes'])} "
+                f"{state['throughput_mb']:.1f}MB/s ETA {eta}")
+        self.stream.write('\r' + line)
+        self.stream.flush()
+        self._bar_visible = True
+
+    def _clear_bar(self) -> None:
+        if self._bar_visible:
+            self.stream.write('\r\033[K')
+            self._bar_visible = False
+
+    def finish(self) -> Dict[str, Any]:
+        """진행 막대를 지우고 최종 진행 상황 반환"""
+        with self._lock:
+            self._clear_bar()
+            self.stream.flush()
+        return self.snapshot()
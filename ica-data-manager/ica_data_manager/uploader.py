@@ -0,0 +1,506 @@
+"""ICA 파일 이어올리기(resumable) 멀티파트 업로드 모듈"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import requests
+
+from .downloader import (DEFAULT_MAX_CONNECTIONS, DEFAULT_PART_SIZE, ETAG_PART_SIZE_CANDIDATES, MAX_PART_RETRIES,
+                         MiB, READ_CHUNK_SIZE, REQUEST_TIMEOUT, THROTTLE_STATUS_CODES, TransferStats,
+                         make_session, multipart_etag, normalize_etag, _PartFailed)
+from .scheduler import AdaptiveConcurrency
+from .utils import default_cache_dir
+
+if TYPE_CHECKING:
+    from .telemetry import ProgressReporter
+
+
+# S3 멀티파트 업로드의 최대 파트 수
+MAX_PARTS = 10000
+# 파트 presigned URL 유효 시간(초)
+PART_URL_EXPIRES = 3600
+
+
+def plan_upload_part_size(file_size: int) -> int:
+    """
+    업로드 파트 크기 결정
+
+    기본값(DEFAULT_PART_SIZE)으로 MAX_PARTS를 넘으면 더 큰 파트 크기를 씁니다.
+    다운로드할 때 ETag의 파트 수로 파트 크기를 추정할 수 있도록
+    ETAG_PART_SIZE_CANDIDATES 중에서 고릅니다.
+    """
+    for size in sorted(mib * MiB for mib in ETAG_PART_SIZE_CANDIDATES):
+        if size >= DEFAULT_PART_SIZE and math.ceil(file_size / size) <= MAX_PARTS:
+            return size
+    return math.ceil(file_size / MAX_PARTS / MiB) * MiB
+
+
+def iter_directory(local_dir: str, remote_folder: str) -> Iterator[Tuple[str, str]]:
+    """
+    로컬 디렉토리 아래 모든 파일의 (로컬 경로, ICA 경로) 목록 (하위 디렉토리 구조 유지)
+
+    Args:
+        local_dir: 로컬 디렉토리
+        remote_folder: 업로드할 ICA 폴더 (예: /runs/RUN1/)
+    """
+    remote_folder = remote_folder.rstrip('/') + '/'
+    for root, dirs, files in os.walk(local_dir):
+        dirs.sort()
+        for name in sorted(files):
+            local_path = os.path.join(root, name)
+            relative = os.path.relpath(local_path, local_dir).replace(os.sep, '/')
+            yield local_path, remote_folder + relative
+
+
+def read_manifest(manifest_path: str, remote_folder: str) -> Iterator[Tuple[str, str]]:
+    """
+    매니페스트 파일의 (로컬 경로, ICA 경로) 목록
+
+    한 줄에 '<로컬 경로>' 또는 '<로컬 경로>\\t<ICA 경로>'를 적습니다. ICA 경로가
+    없으면 remote_folder 아래에 파일 이름으로, '/'로 시작하지 않으면
+    remote_folder 기준 상대 경로로 올립니다. 빈 줄과 '#'으로 시작하는 줄은 무시합니다.
+
+    Raises:
+        RuntimeError: 로컬 파일이 없는 경우
+    """
+    remote_folder = remote_folder.rstrip('/') + '/'
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            local_path, _, remote_path = line.partition('\t')
+            local_path = os.path.join(base_dir, os.path.expanduser(local_path.strip()))
+            if not os.path.isfile(local_path):
+                raise RuntimeError(f"매니페스트 {line_no}번째 줄의 파일이 없습니다: {local_path}")
+            remote_path = remote_path.strip() or os.path.basename(local_path)
+            if not remote_path.startswith('/'):
+                remote_path = remote_folder + remote_path
+            yield local_path, remote_path
+
+
+def journal_path_for(project_id: str, remote_path: str) -> str:
+    """원격 파일의 업로드 저널 경로 (<캐시 디렉토리>/uploads/)"""
+    key = hashlib.sha1(f"{project_id}:{remote_path}".encode()).hexdigest()
+    return str(default_cache_dir() / 'uploads' / f"{key}.journal")
+
+
+class UploadJournal:
+    """
+    이어올리기 저널 클래스
+
+    첫 줄에 로컬 파일 정보(크기, 수정 시각)와 ICA 데이터 ID, S3 멀티파트
+    UploadId를, 이후 줄마다 완료된 파트의 번호와 ETag를 JSON으로 덧붙여
+    기록합니다. 로컬 파일이 바뀌었거나 UploadId가 만료되었으면 처음부터 올립니다.
+    """
+
+    def __init__(self, path: str, data_id: str, file_size: int, mtime: float, part_size: int,
+                 upload_id: str, parts: Optional[Dict[int, str]] = None):
+        self.path = path
+        self.data_id = data_id
+        self.file_size = file_size
+        self.mtime = mtime
+        self.part_size = part_size
+        self.upload_id = upload_id
+        self.parts = parts or {}
+
+    @classmethod
+    def load(cls, path: str) -> Optional["UploadJournal"]:
+        """저널 파일 로드 (없거나 손상되었으면 None)"""
+        try:
+            with open(path) as f:
+                header = json.loads(f.readline())
+                journal = cls(path, header['data_id'], header['file_size'], header['mtime'],
+                              header['part_size'], header['upload_id'])
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    journal.parts[entry['part']] = entry['etag']
+            return journal
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def matches(self, data_id: str, file_size: int, mtime: float) -> bool:
+        """같은 로컬 파일과 ICA 데이터에 대한 저널인지 확인"""
+        return (self.data_id, self.file_size, self.mtime) == (data_id, file_size, mtime)
+
+    @property
+    def n_parts(self) -> int:
+        return max(1, math.ceil(self.file_size / self.part_size))
+
+    def part_range(self, index: int) -> Tuple[int, int]:
+        """파트의 (시작, 끝) byte 위치 (끝 포함)"""
+        start = index * self.part_size
+        return start, min(start + self.part_size, self.file_size) - 1
+
+    def missing_parts(self) -> List[int]:
+        """아직 완료되지 않은 파트 번호 목록"""
+        return [idx for idx in range(self.n_parts) if idx not in self.parts]
+
+    def mark_done(self, index: int, etag: str) -> None:
+        """파트 완료 기록 (저널 끝에 한 줄 추가)"""
+        self.parts[index] = etag
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'part': index, 'etag': etag}) + '\n')
+
+    def save(self) -> None:
+        """저널 전체를 다시 기록 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({
+                'data_id': self.data_id,
+                'file_size': self.file_size,
+                'mtime': self.mtime,
+                'part_size': self.part_size,
+                'upload_id': self.upload_id,
+            }) + '\n')
+            for index, etag in sorted(self.parts.items()):
+                f.write(json.dumps({'part': index, 'etag': etag}) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """저널 삭제"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ResumableUploader:
+    """
+    S3 멀티파트 presigned URL로 파일을 파트 단위로 올리는 이어올리기 업로더
+
+    ICA가 발급한 임시 자격 증명으로 멀티파트 업로드를 시작하고 파트별 PUT
+    presigned URL을 만든 뒤, 파트들을 공유 스레드 풀에서 동시에 올립니다.
+    ResumableDownloader와 같이 HTTP 연결 풀과 스레드 풀을 모든 파일이 공유하며
+    동시 요청 수는 AdaptiveConcurrency가 max_connections 안에서 조절합니다.
+
+    완료된 파트의 ETag는 저널에 기록되므로 중단된 뒤 다시 실행하면 같은
+    UploadId로 빠진 파트만 올립니다. 파트마다 S3가 돌려준 ETag를 로컬 MD5와
+    비교하고, 완료 후에는 전체 멀티파트 ETag를 다시 계산하여 검증합니다.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, max_retries: int = MAX_PART_RETRIES,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        """
+        Args:
+            session: HTTP 세션 (None이면 max_connections 크기의 연결 풀로 생성)
+            max_retries: 파트별 재시도 횟수
+            max_connections: 모든 파일을 합친 최대 동시 요청 수
+        """
+        self.session = session or make_session(max_connections)
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.concurrency = AdaptiveConcurrency(max_connections)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='ica-part')
+
+    def close(self) -> None:
+        """파트 업로드 스레드 풀 종료"""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ResumableUploader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def upload(self, credentials_factory: Callable[[], Dict[str, Any]], data_id: str, local_path: str,
+               journal_path: str, progress: Optional["ProgressReporter"] = None) -> TransferStats:
+        """
+        파일 업로드 (이어올리기)
+
+        여러 스레드에서 동시에 호출할 수 있습니다.
+
+        Args:
+            credentials_factory: ICA 임시 자격 증명(awsTempCredentials)을 발급하는 함수
+                (만료 시 다시 호출)
+            data_id: 업로드할 ICA 파일 데이터 ID
+            local_path: 로컬 파일 경로
+            journal_path: 이어올리기 저널 경로
+            progress: 보낸 byte 수를 전달받을 진행 상황 기록기
+
+        Returns:
+            TransferStats: 전송 통계 (bytes_downloaded는 이번 실행에서 보낸 byte 수)
+
+        Raises:
+            RuntimeError: 파트 업로드, 완료 요청 또는 체크섬 검증 실패시
+        """
+        target = _UploadTarget(credentials_factory)
+        stat = os.stat(local_path)
+        file_size = stat.st_size
+
+        if file_size == 0:
+            # 빈 파일은 멀티파트 업로드를 할 수 없으므로 한 번에 올림
+            target.call('put_object', Body=b'')
+            return TransferStats()
+
+        journal = self._open_journal(target, journal_path, data_id, file_size, stat.st_mtime)
+        stats = TransferStats(resumed_bytes=sum(
+            end - start + 1 for start, end in map(journal.part_range, journal.parts)))
+        if progress is not None and stats.resumed_bytes:
+            progress.credit(stats.resumed_bytes)
+
+        fd = os.open(local_path, os.O_RDONLY)
+        try:
+            self._upload_parts(fd, target, journal, stats, progress)
+        finally:
+            os.close(fd)
+
+        parts = [{'PartNumber': index + 1, 'ETag': f'"{journal.parts[index]}"'} for index in range(journal.n_parts)]
+        response = target.call('complete_multipart_upload', UploadId=journal.upload_id,
+                               MultipartUpload={'Parts': parts})
+        journal.remove()
+        expected = multipart_etag([journal.parts[index] for index in range(journal.n_parts)])
+        etag = normalize_etag(response.get('ETag'))
+        if etag and etag != expected:
+            raise RuntimeError(f"체크섬 불일치: {os.path.basename(local_path)} (ETag {etag} != {expected})")
+        return stats
+
+    def _open_journal(self, target: "_UploadTarget", journal_path: str, data_id: str, file_size: int,
+                      mtime: float) -> UploadJournal:
+        """기존 저널을 S3의 업로드된 파트 목록과 맞춰 재사용하거나 새 멀티파트 업로드 시작"""
+        journal = UploadJournal.load(journal_path)
+        if journal and journal.matches(data_id, file_size, mtime):
+            uploaded = target.list_parts(journal.upload_id)
+            if uploaded is not None:
+                journal.parts = {index: etag for index, etag in journal.parts.items()
+                                 if uploaded.get(index) == etag}
+                journal.save()
+                return journal
+        elif journal and journal.data_id == data_id:
+            # 로컬 파일이 바뀌었으면 이전 업로드의 파트가 저장소에 남아 과금되지 않도록 취소
+            try:
+                target.call('abort_multipart_upload', UploadId=journal.upload_id)
+            except RuntimeError:
+                pass  # 이미 만료되었거나 취소된 업로드
+        response = target.call('create_multipart_upload')
+        journal = UploadJournal(journal_path, data_id, file_size, mtime, plan_upload_part_size(file_size),
+                                response['UploadId'])
+        journal.save()
+        return journal
+
+    def _upload_parts(self, fd: int, target: "_UploadTarget", journal: UploadJournal, stats: TransferStats,
+                      progress: Optional["ProgressReporter"]) -> None:
+        """
+        빠진 파트를 공유 스레드 풀에서 동시에 올리고 완료되는 대로 저널과 통계에 기록
+
+        Raises:
+            RuntimeError: 재시도 후에도 실패한 파트가 있는 경우 (나머지 파트는 모두
+                기다려 저널에 기록한 뒤 발생)
+        """
+        futures = {
+            self._executor.submit(self._upload_part, fd, target, journal.upload_id, index,
+                                  *journal.part_range(index), progress): index
+            for index in journal.missing_parts()
+        }
+        errors = []
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    etag, retries = future.result()
+                except _PartFailed as e:
+                    stats.retries += e.retries
+                    errors.append(e)
+                    continue
+                journal.mark_done(index, etag)
+                start, end = journal.part_range(index)
+                stats.bytes_downloaded += end - start + 1
+                stats.retries += retries
+        finally:
+            # 호출자가 fd를 닫기 전에 남은 파트를 취소하거나 끝날 때까지 기다림
+            for future in futures:
+                future.cancel()
+            wait(futures)
+
+        if errors:
+            raise _PartFailed(str(errors[0]), stats.retries)
+
+    def _upload_part(self, fd: int, target: "_UploadTarget", upload_id: str, index: int, start: int, end: int,
+                     progress: Optional["ProgressReporter"]) -> Tuple[str, int]:
+        """
+        파트 하나를 올리고 ETag 반환 (실패 시 재시도)
+
+        Returns:
+            Tuple[str, int]: (파트 ETag, 재시도 횟수)
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(min(2 ** attempt, 30))
+            generation = target.generation
+            try:
+                url = target.part_url(upload_id, index + 1)
+            except (RuntimeError, requests.RequestException) as e:
+                # 임시 자격 증명 발급 실패도 다른 파트 오류처럼 재시도
+                last_error = e
+                continue
+            token = self.concurrency.acquire()
+            transferred, throttled = 0, False
+            try:
+                etag = self._put_range(url, fd, start, end, progress)
+                transferred = end - start + 1
+                return etag, attempt
+            except requests.HTTPError as e:
+                last_error = e
+                status = e.response.status_code if e.response is not None else None
+                throttled = status in THROTTLE_STATUS_CODES
+                # 임시 자격 증명 만료 시 새로 발급
+                if status in (401, 403):
+                    target.refresh(generation)
+            except requests.RequestException as e:
+                last_error = e
+                throttled = True
+            except RuntimeError as e:
+                last_error = e
+            except OSError as e:
+                # 로컬 파일 읽기 실패는 재시도해도 같으므로 바로 실패 처리
+                raise _PartFailed(f"파트 읽기 실패 (bytes {start}-{end}): {e}", attempt) from e
+            finally:
+                self.concurrency.release(token, transferred, error=throttled)
+        raise _PartFailed(f"파트 업로드 실패 (bytes {start}-{end}): {last_error}", self.max_retries)
+
+    def _put_range(self, url: str, fd: int, start: int, end: int,
+                   progress: Optional["ProgressReporter"]) -> str:
+        """파일의 byte 범위를 읽으면서 PUT으로 보내고, S3가 돌려준 ETag를 보낸 데이터의 MD5와 비교"""
+        body = _RangeReader(fd, start, end, progress)
+        try:
+            response = self.session.put(url, data=body, timeout=REQUEST_TIMEOUT)
+            with response:
+                response.raise_for_status()
+            etag = normalize_etag(response.headers.get('ETag'))
+            if etag != body.md5:
+                raise RuntimeError(f"파트 체크섬 불일치 (ETag {etag} != MD5 {body.md5})")
+        except Exception:
+            # 실패한 요청에서 보낸 만큼 진행률을 되돌림 (재시도에서 다시 보냄)
+            body.rollback()
+            raise
+        return etag
+
+
+class _RangeReader:
+    """파일의 byte 범위를 조금씩 읽어 요청 본문으로 보내는 파일 객체 (MD5 계산, 진행률 기록)"""
+
+    def __init__(self, fd: int, start: int, end: int, progress: Optional["ProgressReporter"]):
+        self._fd = fd
+        self._offset = start
+        self._start = start
+        self._end = end
+        self._progress = progress
+        self._digest = hashlib.md5()
+
+    def __len__(self) -> int:
+        # requests가 Content-Length를 정하는 데 사용 (presigned PUT은 chunked 전송 불가)
+        return self._end - self._start + 1
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._end - self._offset + 1
+        if remaining <= 0:
+            return b''
+        size = remaining if size is None or size < 0 else min(size, remaining, READ_CHUNK_SIZE)
+        chunk = os.pread(self._fd, size, self._offset)
+        self._offset += len(chunk)
+        self._digest.update(chunk)
+        if self._progress is not None:
+            self._progress.update(len(chunk))
+        return chunk
+
+    @property
+    def md5(self) -> str:
+        return self._digest.hexdigest()
+
+    def rollback(self) -> None:
+        """보낸 만큼 진행률 되돌리기"""
+        if self._progress is not None and self._offset > self._start:
+            self._progress.update(self._start - self._offset)
+        self._offset = self._start
+
+
+class _UploadTarget:
+    """
+    한 파일의 파트들이 공유하는 S3 업로드 대상 (임시 자격 증명으로 만든 boto3 클라이언트)
+
+    자격 증명이 만료되면 refresh 후 처음 사용할 때 다시 발급합니다.
+    """
+
+    def __init__(self, factory: Callable[[], Dict[str, Any]]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._client = None
+        self.generation = 0
+        self.bucket = ''
+        self.key = ''
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                import boto3
+                from botocore.config import Config
+
+                credentials = self._factory()
+                self.bucket = credentials['bucket']
+                self.key = credentials['objectPrefix']
+                self._client = boto3.client(
+                    's3',
+                    aws_access_key_id=credentials['accessKey'],
+                    aws_secret_access_key=credentials['secretKey'],
+                    aws_session_token=credentials.get('sessionToken'),
+                    region_name=credentials.get('region'),
+                    config=Config(signature_version='s3v4', retries={'mode': 'standard'}),
+                )
+            return self._client
+
+    def refresh(self, generation: int) -> None:
+        """generation의 자격 증명이 아직 현재 것이면 무효화 (다른 파트가 이미 갱신했으면 무시)"""
+        with self._lock:
+            if self.generation == generation:
+                self._client = None
+                self.generation += 1
+
+    def call(self, operation: str, **params) -> Dict[str, Any]:
+        """
+        S3 API 호출 (Bucket/Key는 자동으로 지정)
+
+        Raises:
+            RuntimeError: 호출 실패시
+        """
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        client = self._get_client()
+        try:
+            return getattr(client, operation)(Bucket=self.bucket, Key=self.key, **params)
+        except (BotoCoreError, ClientError) as e:
+            raise RuntimeError(f"S3 {operation} 실패: {str(e)}")
+
+    def list_parts(self, upload_id: str) -> Optional[Dict[int, str]]:
+        """이미 올라간 파트의 {파트 번호(0부터): ETag} (업로드가 만료되었으면 None)"""
+        from botocore.exceptions import ClientError
+
+        client = self._get_client()
+        parts = {}
+        try:
+            paginator = client.get_paginator('list_parts')
+            for page in paginator.paginate(Bucket=self.bucket, Key=self.key, UploadId=upload_id):
+                for part in page.get('Parts', []):
+                    parts[part['PartNumber'] - 1] = normalize_etag(part['ETag'])
+        except ClientError:
+            return None
+        return parts
+
+    def part_url(self, upload_id: str, part_number: int) -> str:
+        """파트 PUT presigned URL (로컬에서 서명하므로 요청을 보내지 않음)"""
+        client = self._get_client()
+        return client.generate_presigned_url(
+            'upload_part', ExpiresIn=PART_URL_EXPIRES,
+            Params={'Bucket': self.bucket, 'Key': self.key, 'UploadId': upload_id, 'PartNumber': part_number},
+        )
@@ -1,45 +1,158 @@
 """ICA 유틸리티 모듈"""
 
+import json
+import os
 import subprocess
 import sys
-from typing import Tuple
+from pathlib import Path
+from typing import List, Optional, Tuple
 import shutil
 
 
+# 확인이 끝난 icav2 실행 파일 경로 (프로세스당 한 번만 확인)
+_verified_icav2: Optional[str] = None
+
+
+def default_cache_dir() -> Path:
+    """캐시 디렉토리 경로 반환 ($XDG_CACHE_HOME/ica-data-manager)"""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'ica-data-manager'
+
+
 def check_icav2_cli() -> Tuple[bool, str]:
     """
     ICAv2 CLI가 설치되어 있는지 확인
-    
+
     Returns:
         Tuple[bool, str]: (설치 여부, 메시지)
     """
     # icav2 명령어 존재 여부 확인
     icav2_path = shutil.which('icav2')
-    
+
     if not icav2_path:
         return False, "ICAv2 CLI가 설치되어 있지 않습니다. https://help.ica.illumina.com/command-line-interface/cli-installation 에서 설치 방법을 확인하세요."
-    
+
     try:
-        # icav2 버전 확인
-        result = subprocess.run(['icav2', 'version'], 
-                              capture_output=True, 
-                              text=True, 
-                              check=True)
-        return True, f"ICAv2 CLI가 설치되어 있습니다. 버전: {result.stdout.strip()}"
+        version = _cached_icav2_version(icav2_path)
+        if version is None:
+            # icav2 버전 확인
+            result = subprocess.run(['icav2', 'version'],
+                                  capture_output=True,
+                                  text=True,
+                                  check=True)
+            version = result.stdout.strip()
+            _store_icav2_version(icav2_path, version)
+        return True, f"ICAv2 CLI가 설치되어 있습니다. 버전: {version}"
     except subprocess.CalledProcessError as e:
         return False, f"ICAv2 CLI 실행 중 오류가 발생했습니다: {str(e)}"
     except Exception as e:
         return False, f"예상치 못한 오류가 발생했습니다: {str(e)}"
 
 
+def _version_cache_path() -> Path:
+    return default_cache_dir() / 'icav2_version.json'
+
+
+def _icav2_signature(icav2_path: str) -> dict:
+    """icav2 실행 파일이 바뀌었는지 판단하는 정보 (경로, 크기, 수정 시각)"""
+    stat = os.stat(icav2_path)
+    return {'path': icav2_path, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _cached_icav2_version(icav2_path: str) -> Optional[str]:
+    """디스크에 캐시된 icav2 버전 (실행 파일이 바뀌었거나 캐시가 없으면 None)"""
+    try:
+        with open(_version_cache_path()) as f:
+            cached = json.load(f)
+        if cached['signature'] == _icav2_signature(icav2_path):
+            return cached['version']
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _store_icav2_version(icav2_path: str, version: str) -> None:
+    """icav2 버전을 디스크에 캐시 (실패해도 무시)"""
+    try:
+        _version_cache_path().parent.mkdir(parents=True, exist_ok=True)
+        with open(_version_cache_path(), 'w') as f:
+            json.dump({'signature': _icav2_signature(icav2_path), 'version': version}, f)
+    except OSError:
+        pass
+
+
 def verify_icav2_installation():
     """
     ICAv2 CLI 설치 확인 및 미설치시 에러 발생
-    
+
+    Raises:
+        RuntimeError: ICAv2 CLI가 설치되어 있지 않은 경우
+    """
+    is_installed, message = check_icav2_cli()
+    if not is_installed:
+        raise RuntimeError(message)
+    print(message, file=sys.stderr)
+
+
+def ensure_icav2() -> None:
+    """
+    ICAv2 CLI 설치 확인 (프로세스당 한 번, 성공 시 출력 없음)
+
+    버전은 icav2 실행 파일의 경로/크기/수정 시각과 함께 디스크에 캐시되므로
+    실행 파일이 바뀌지 않았으면 icav2 version도 실행하지 않습니다.
+
     Raises:
         RuntimeError: ICAv2 CLI가 설치되어 있지 않은 경우
     """
+    global _verified_icav2
+    if _verified_icav2 is not None:
+        return
     is_installed, message = check_icav2_cli()
     if not is_installed:
         raise RuntimeError(message)
-    print(message, file=sys.stderr) 
\ No newline at end of file
+    _verified_icav2 = shutil.which('icav2')
+
+
+def run_icav2(args: List[str]) -> subprocess.CompletedProcess:
+    """
+    icav2 명령어 실행 (처음 호출할 때 CLI 설치 확인)
+
+    Args:
+        args: icav2 뒤에 붙일 인자 목록
+
+    Returns:
+        subprocess.CompletedProcess: 실행 결과 (stdout/stderr는 문자열)
+
+    Raises:
+        RuntimeError: ICAv2 CLI가 설치되어 있지 않은 경우
+        subprocess.CalledProcessError: icav2 명령어 실행 실패시
+    """
+    ensure_icav2()
+    return subprocess.run(['icav2'] + args, capture_output=True, text=True, check=True)
+
+
+async def run_icav2_async(args: List[str]) -> str:
+    """
+    icav2 명령어를 asyncio 하위 프로세스로 실행 (처음 호출할 때 CLI 설치 확인)
+
+    Args:
+        args: icav2 뒤에 붙일 인자 목록
+
+    Returns:
+        str: 표준 출력
+
+    Raises:
+        RuntimeError: ICAv2 CLI가 설치되어 있지 않은 경우
+        subprocess.CalledProcessError: icav2 명령어 실행 실패시
+    """
+    import asyncio
+
+    ensure_icav2()
+    process = await asyncio.create_subprocess_exec(
+        'icav2', *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, ['icav2'] + args,
+                                            stdout.decode(), stderr.decode())
+    return stdout.decode()
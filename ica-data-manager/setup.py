@@ -9,6 +9,7 @@ setup(
         "numpy>=1.21.0",
         "pyyaml>=6.0",
         "requests>=2.28.0",
+        "boto3>=1.28.0",        # For multipart uploads with ICA temporary credentials
         "biopython>=1.80",      # For biological sequence handling
         "tabulate>=0.9.0",      # For table formatting
         "click>=8.0.0",         # For CLI interface
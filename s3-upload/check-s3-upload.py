@@ -0,0 +1,222 @@
+import hashlib
+import importlib.util
+import logging
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+# moto logs every request
+logging.getLogger("werkzeug").setLevel(logging.WARNING)
+import boto3
+import math
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import time
+from time import sleep
+
+# end-to-end checks of s3-upload.py against a local S3 stand-in: moto
+# (started here) or a MinIO given by --endpoint-url. s3-upload.py runs as a
+# subprocess, exactly as from the shell, and the results are read back with
+# boto3. exits 1 if any check fails.
+
+script_dir = Path(__file__).resolve().parent
+s3_upload = script_dir / "s3-upload.py"
+region_id = "ap-northeast-2"
+
+MB = 1024 * 1024
+# small parts and a slow link, so a run can be killed halfway through
+part_mb = 5
+parts_per_file = 8
+slow_bandwidth = 4
+# seconds to wait for a run to reach a given state
+wait_timeout = 120
+
+
+def load_s3_upload():
+    # s3-upload.py as a module (its name is not importable)
+    spec = importlib.util.spec_from_file_location("s3_upload", s3_upload)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def start_moto():
+    # moto S3 server on a free local port, returns (server, endpoint url)
+    from moto.server import ThreadedMotoServer
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    return server, f"http://127.0.0.1:{port}"
+
+
+class Checker:
+    """Runs s3-upload.py in a work directory and records the result of each check."""
+
+    def __init__(self, endpoint_url, workdir, bucket_name):
+        self.endpoint_url = endpoint_url
+        self.workdir = Path(workdir)
+        self.bucket_name = bucket_name
+        self.journal_dir = self.workdir / "journal"
+        self.s3_client = boto3.client("s3", region_name=region_id, endpoint_url=endpoint_url)
+        self.failed = list()
+
+    def check(self, ok, message):
+        if ok:
+            logging.info(f"PASS {message}")
+        else:
+            logging.error(f"FAIL {message}")
+            self.failed.append(message)
+        return ok
+
+    def command(self, *options):
+        return [sys.executable, str(s3_upload), "--endpoint-url", self.endpoint_url,
+                "--journal-dir", str(self.journal_dir), *options]
+
+    def run(self, *options):
+        # run s3-upload.py to the end, returns (exit code, log output)
+        proc = subprocess.run(self.command(*options), cwd=self.workdir, capture_output=True, text=True,
+                              timeout=wait_timeout)
+        return proc.returncode, proc.stdout + proc.stderr
+
+    def make_file(self, name, size):
+        file_path = self.workdir / name
+        with open(file_path, "wb") as fh:
+            fh.write(os.urandom(size))
+        infn = self.workdir / f"{name}.input.csv"
+        infn.write_text(f"file_path,bucket_name\n{file_path},{self.bucket_name}\n")
+        return file_path, infn
+
+    def upload_options(self, infn, *options):
+        return ("--infn", str(infn), "--outprefix", str(infn.with_suffix("")),
+                "--multipart-threshold", str(part_mb), "--multipart-chunksize", str(part_mb), *options)
+
+    def journal_parts(self):
+        # completed parts recorded in the journals (one journal per upload)
+        parts = 0
+        for path in self.journal_dir.glob("*.journal"):
+            parts += max(len(path.read_text().splitlines()) - 1, 0)
+        return parts
+
+    def interrupt(self, infn, min_parts):
+        # start a throttled upload and kill it (as a crash would) once the
+        # journal holds min_parts completed parts
+        proc = subprocess.Popen(self.command(*self.upload_options(
+            infn, "--max-concurrency", "1", "--max-bandwidth", str(slow_bandwidth))),
+            cwd=self.workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time() + wait_timeout
+        try:
+            while self.journal_parts() < min_parts:
+                if proc.poll() is not None or time() > deadline:
+                    return False
+                sleep(0.1)
+            return True
+        finally:
+            proc.send_signal(signal.SIGKILL)
+            proc.wait()
+
+    def in_progress(self, key=None):
+        uploads = self.s3_client.list_multipart_uploads(Bucket=self.bucket_name).get("Uploads", [])
+        return [upload for upload in uploads if key is None or upload["Key"] == key]
+
+    def check_chunksizes(self):
+        # part size raised so that no upload needs more than 10,000 parts
+        module = load_s3_upload()
+        for size in [1024 * MB, 80 * 1024 * MB, 300 * 1024 * MB, 5 * 1024 * 1024 * MB]:
+            for profile, settings in module.transfer_profiles.items():
+                chunksize = module.pick_chunksize(size, settings["multipart_chunksize"] * MB)
+                self.check(math.ceil(size / chunksize) <= module.max_parts,
+                           f"chunk size : {size // MB:,} MB with {profile} -> {chunksize // MB} MB parts")
+
+    def check_resume(self):
+        file_path, infn = self.make_file("resume.bin", parts_per_file * part_mb * MB)
+        key = file_path.name
+
+        # interrupted run: the upload stays open in S3 and the journal keeps the parts
+        self.check(self.interrupt(infn, 3), "interrupt : upload killed after 3 parts")
+        self.check(len(self.in_progress(key)) == 1, "interrupt : multipart upload left open in the bucket")
+        journaled = self.journal_parts()
+
+        # rerun: only the missing parts are sent
+        returncode, output = self.run(*self.upload_options(infn))
+        self.check(returncode == 0, "resume : rerun exits 0")
+        self.check(f"({journaled} / {parts_per_file} parts already uploaded)" in output,
+                   f"resume : rerun reuses the {journaled} journaled parts")
+
+        part_md5s = b""
+        with open(file_path, "rb") as fh:
+            for part in iter(lambda: fh.read(part_mb * MB), b""):
+                part_md5s += hashlib.md5(part).digest()
+        expected = f"{hashlib.md5(part_md5s).hexdigest()}-{parts_per_file}"
+        etag = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)["ETag"].strip('"')
+        self.check(etag == expected, f"resume : object ETag matches the local file ({etag})")
+        self.check(not self.in_progress(key), "resume : no multipart upload left open")
+        self.check(not list(self.journal_dir.glob("*.journal")), "resume : journal removed")
+
+    def check_abort_stale(self):
+        file_path, infn = self.make_file("stale.bin", parts_per_file * part_mb * MB)
+        key = file_path.name
+
+        self.check(self.interrupt(infn, 1), "cleanup : upload killed after 1 part")
+        self.check(len(self.in_progress(key)) == 1, "cleanup : multipart upload left open in the bucket")
+
+        returncode, output = self.run("--abort-stale-uploads", "0", "--cleanup-buckets", self.bucket_name)
+        self.check(returncode == 0, "cleanup : --abort-stale-uploads exits 0")
+        self.check("aborted 1 stale uploads" in output, "cleanup : one stale upload aborted")
+        self.check(not self.in_progress(), "cleanup : no multipart upload left open")
+        self.check(not list(self.journal_dir.glob("*.journal")), "cleanup : journal of the aborted upload removed")
+
+    def check_benchmark(self):
+        profiles = ["default", "throttled"]
+        proc = subprocess.run(self.command("--benchmark", "--benchmark-size", "8", "--workers", "1",
+                                           "--benchmark-bucket", f"{self.bucket_name}-benchmark",
+                                           "--benchmark-profiles", *profiles),
+                              cwd=self.workdir, capture_output=True, text=True, timeout=wait_timeout)
+        rows = [line.split("\t") for line in proc.stdout.splitlines()[1:] if line]
+        self.check(proc.returncode == 0 and [row[0] for row in rows] == profiles,
+                   "benchmark : one row per profile")
+        for row in rows:
+            self.check(float(row[-1]) > 0, f"benchmark : {row[0]} at {row[-1]} MB/s")
+
+
+def main(args):
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        # moto accepts any credentials
+        for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+            os.environ.setdefault(name, "testing")
+        server, endpoint_url = start_moto()
+    logging.info(f"S3 endpoint : {endpoint_url}")
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="check-s3-upload.") as workdir:
+            checker = Checker(endpoint_url, workdir, args.bucket)
+            checker.check_chunksizes()
+            checker.check_resume()
+            checker.check_abort_stale()
+            if not args.skip_benchmark:
+                checker.check_benchmark()
+    finally:
+        if server is not None:
+            server.stop()
+
+    if checker.failed:
+        logging.error(f"{len(checker.failed)} checks failed")
+        sys.exit(1)
+    logging.info("all checks passed")
+
+
+if __name__=="__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="check s3-upload.py against moto or a local MinIO")
+    parser.add_argument("--endpoint-url", default=None,
+                        help="S3 endpoint to test against (default: a moto server started by this script)")
+    parser.add_argument("--bucket", default="glc-check-s3-upload",
+                        help="bucket used (and created if missing) for the checks")
+    parser.add_argument("--skip-benchmark", action="store_true", help="skip the benchmark mode check")
+    args = parser.parse_args()
+    main(args)
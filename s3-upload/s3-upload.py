@@ -2,50 +2,372 @@
 
 
 import csv
+import hashlib
+import json
 import logging
+import mmap
 logging.basicConfig(level=logging.INFO)
 import boto3
-from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
 from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
 import os
 import sys
+import tempfile
 import threading
+import uuid
 from pathlib import Path
+from s3transfer.utils import ReadFileChunk
 from time import time
+from time import sleep
 from time import localtime
 from time import strftime
 region_id = "ap-northeast-2"
 
-class ProgressPercentage(object):
-    def __init__(self, filename):
-        self._filename = filename
-        self._size = float(os.path.getsize(filename))
+# number of files uploaded at the same time
+default_workers = 4
+# minimum seconds between redraws of the progress line
+progress_interval = 0.5
+
+MB = 1024 * 1024
+# S3 allows at most 10,000 parts per multipart upload
+max_parts = 10000
+# multipart settings per network profile (sizes in MB, max_bandwidth in MB/s
+# for all concurrent uploads together, None means unlimited)
+#   default   : boto3 defaults
+#   lan       : fat, low-latency pipe (large parts, many threads)
+#   wan       : internet delivery (medium parts, moderate threads)
+#   throttled : shared/metered link (few threads, capped bandwidth)
+transfer_profiles = {
+    "default": dict(multipart_threshold=8, multipart_chunksize=8, max_concurrency=10, max_bandwidth=None),
+    "lan": dict(multipart_threshold=64, multipart_chunksize=64, max_concurrency=32, max_bandwidth=None),
+    "wan": dict(multipart_threshold=16, multipart_chunksize=16, max_concurrency=16, max_bandwidth=None),
+    "throttled": dict(multipart_threshold=8, multipart_chunksize=8, max_concurrency=4, max_bandwidth=50),
+}
+default_profile = "default"
+# buckets receiving at most this many files are checked with head_object per
+# key; larger deliveries list the bucket once (paginated) instead
+head_object_limit = 100
+# part sizes (MB) commonly used by S3 clients, tried when matching a multipart ETag
+common_chunksizes = [5, 8, 16, 32, 64, 100, 128, 256, 512, 1024]
+# directory of the multipart upload journals used to resume interrupted uploads
+default_journal_dir = "s3-upload.journal"
+# bytes hashed per step; md5 and sha256 run side by side on each block
+hash_block = 8 * MB
+# threads that run the md5 updates next to the sha256 updates
+hash_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hash")
+
+
+def pick_chunksize(file_size, min_chunksize):
+    # smallest whole-MB part size, not below min_chunksize, that keeps the part
+    # count within S3's limit
+    needed = math.ceil(file_size / max_parts / MB) * MB
+    return max(min_chunksize, needed)
+
+
+def make_transfer_config(settings, file_size, workers=1):
+    # TransferConfig for one file; max_bandwidth is shared by the concurrent
+    # uploads, so each transfer gets its share of it
+    max_bandwidth = settings["max_bandwidth"]
+    return TransferConfig(
+        multipart_threshold=settings["multipart_threshold"] * MB,
+        multipart_chunksize=pick_chunksize(file_size, settings["multipart_chunksize"] * MB),
+        max_concurrency=settings["max_concurrency"],
+        max_bandwidth=int(max_bandwidth * MB / workers) if max_bandwidth else None,
+    )
+
+
+def file_md5s(file_name, chunksize):
+    # md5 of each chunksize part of the file
+    md5s = list()
+    with open(file_name, "rb") as fh:
+        for part in iter(lambda: fh.read(chunksize), b""):
+            md5s.append(hashlib.md5(part).digest())
+    return md5s
+
+
+def etag_matches(file_name, size, etag):
+    # compare a local file with an S3 ETag: plain md5 for single part uploads,
+    # md5 of the part md5s plus "-<parts>" for multipart uploads, whose part
+    # size is guessed from the part count. None if no guessed part size gives
+    # that part count, so the file can't be verified
+    etag = etag.strip('"')
+    if "-" not in etag:
+        md5 = hashlib.md5()
+        with open(file_name, "rb") as fh:
+            for chunk in iter(lambda: fh.read(MB), b""):
+                md5.update(chunk)
+        return md5.hexdigest() == etag
+    parts = int(etag.rsplit("-", 1)[1])
+    chunksizes = {pick_chunksize(size, settings["multipart_chunksize"] * MB)
+                  for settings in transfer_profiles.values()}
+    chunksizes.update(pick_chunksize(size, mb * MB) for mb in common_chunksizes)
+    chunksizes = [chunksize for chunksize in sorted(chunksizes) if math.ceil(size / chunksize) == parts]
+    for chunksize in chunksizes:
+        digest = hashlib.md5(b"".join(file_md5s(file_name, chunksize))).hexdigest()
+        if f"{digest}-{parts}" == etag:
+            return True
+    return False if chunksizes else None
+
+
+def make_s3_client(max_pool_connections=10, endpoint_url=None):
+    return boto3.client(
+        "s3", region_name=region_id, endpoint_url=endpoint_url,
+        config=Config(max_pool_connections=max_pool_connections)
+    )
+
+
+class ProgressMonitor(logging.StreamHandler):
+    """
+    One progress line for all concurrent uploads.
+
+    It is passed as the boto3 Callback of every upload; the line shows files
+    done, bytes sent over all files and the overall rate. While uploading it
+    also replaces the console log handler, so that log records are written
+    above the line instead of being appended to it.
+    """
+    def __init__(self, total_files, total_bytes, stream=sys.stderr):
+        super().__init__(stream)
+        self._total_files = total_files
+        self._total_bytes = total_bytes
+        self._tty = stream.isatty()
         self._seen_so_far = 0
+        self._done_files = 0
+        self._started = time()
+        self._last_draw = 0.0
+        self._drawn = False
         self._lock = threading.Lock()
 
     def __call__(self, bytes_amount):
         with self._lock:
             self._seen_so_far += bytes_amount
-            percentage = (self._seen_so_far / self._size) * 100
-            sys.stdout.write(
-                "\r%s  %s / %s  (%.2f%%)" % (
-                    self._filename, self._seen_so_far, self._size,
-                    percentage))
-            sys.stdout.flush()
+            if time() - self._last_draw >= progress_interval:
+                self._draw()
+
+    def skip(self, size):
+        # files that are not uploaded do not count towards the total
+        with self._lock:
+            self._total_bytes -= size
+
+    def file_done(self):
+        with self._lock:
+            self._done_files += 1
+            self._draw()
+
+    def emit(self, record):
+        with self._lock:
+            drawn = self._drawn
+            self._clear()
+            super().emit(record)
+            if drawn:
+                self._draw()
+
+    def finish(self):
+        with self._lock:
+            self._draw()
+            if self._drawn:
+                self.stream.write("\n")
+                self.stream.flush()
+            self._drawn = False
+
+    def _draw(self):
+        if not self._tty:
+            return
+        elapsed = max(time() - self._started, 1e-6)
+        percentage = (self._seen_so_far / self._total_bytes * 100) if self._total_bytes else 100.0
+        self.stream.write(
+            "\r[%d/%d files]  %s / %s bytes  (%.2f%%)  %.1f MB/s\033[K" % (
+                self._done_files, self._total_files,
+                f"{self._seen_so_far:,}", f"{self._total_bytes:,}",
+                percentage, self._seen_so_far / elapsed / (1024 * 1024)))
+        self.stream.flush()
+        self._last_draw = time()
+        self._drawn = True
+
+    def _clear(self):
+        if self._drawn:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+            self._drawn = False
+
+
+class UploadJournal:
+    """
+    Journal of one resumable multipart upload.
+
+    The first line holds the target and the UploadId, every later line a
+    completed part and its ETag, appended (and flushed) as soon as the part
+    is uploaded. A line cut short by a crash is ignored, so that part is
+    simply sent again.
+    """
+    def __init__(self, path, header, parts=None):
+        self.path = path
+        self.header = header
+        self.parts = parts or dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_for(journal_dir, bucket_name, object_name):
+        digest = hashlib.sha1(f"{bucket_name}/{object_name}".encode()).hexdigest()
+        return os.path.join(journal_dir, f"{digest}.journal")
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as fh:
+                lines = fh.read().splitlines()
+        except FileNotFoundError:
+            return None
+        try:
+            header = json.loads(lines[0])
+        except (IndexError, ValueError):
+            return None
+        parts = dict()
+        for line in lines[1:]:
+            try:
+                part = json.loads(line)
+            except ValueError:
+                continue
+            parts[part["part"]] = part["etag"]
+        return cls(path, header, parts)
+
+    @classmethod
+    def create(cls, path, header):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as fh:
+            fh.write(json.dumps(header) + "\n")
+        return cls(path, header)
+
+    def matches(self, header):
+        # same target, same file (size, mtime) and same part layout
+        return all(self.header.get(key) == value for key, value in header.items())
+
+    def add(self, part_number, etag):
+        with self._lock:
+            self.parts[part_number] = etag
+            with open(self.path, "a") as fh:
+                fh.write(json.dumps({"part": part_number, "etag": etag}) + "\n")
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class FileHasher:
+    """
+    MD5 and SHA-256 of one file in a single sequential pass.
+
+    Multipart uploads report each uploaded part with part_done(), in any
+    order. The thread that completes the next part in file order hashes it,
+    together with any later parts already done, through a memory map. The
+    data was just read for the upload, so it is hashed from the page cache
+    rather than read from disk a second time, and the hashing overlaps with
+    the parts still uploading.
+    """
+    def __init__(self, file_name, size, chunksize=None):
+        self._file_name = file_name
+        self._size = size
+        self._chunksize = chunksize or max(size, 1)
+        self._md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256()
+        self._offset = 0
+        self._next_part = 1
+        self._done = set()
+        self._lock = threading.Lock()
+        self._hashing = threading.Lock()
+
+    def part_done(self, part):
+        with self._lock:
+            self._done.add(part)
+        while self._hashing.acquire(blocking=False):
+            try:
+                while True:
+                    with self._lock:
+                        if self._next_part not in self._done:
+                            break
+                        part = self._next_part
+                        self._next_part += 1
+                    self._hash_to(min(part * self._chunksize, self._size))
+            finally:
+                self._hashing.release()
+            # another part may have completed while the lock was held
+            with self._lock:
+                if self._next_part not in self._done:
+                    return
+
+    def hash_all(self):
+        with self._hashing:
+            self._hash_to(self._size)
+        return self.hexdigests()
+
+    def hexdigests(self):
+        if self._offset != self._size:
+            raise RuntimeError(f"{self._file_name} is hashed only up to {self._offset:,} bytes")
+        return self._md5.hexdigest(), self._sha256.hexdigest()
+
+    def _hash_to(self, end):
+        if end <= self._offset:
+            return
+        with open(self._file_name, "rb") as fh, \
+                mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            for start in range(self._offset, end, hash_block):
+                with view[start:min(start + hash_block, end)] as block:
+                    future = hash_executor.submit(self._md5.update, block)
+                    self._sha256.update(block)
+                    future.result()
+        self._offset = end
+
+
+class BandwidthLimiter:
+    # paces the parts of all resumable uploads so that together they stay
+    # under max_bandwidth (bytes per second)
+    def __init__(self, max_bandwidth):
+        self._rate = max_bandwidth
+        self._next = time()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        with self._lock:
+            now = time()
+            start = max(now, self._next)
+            self._next = start + amount / self._rate
+        if start > now:
+            sleep(start - now)
 
 
 class S3Uploader:
-    def __init__(self, infn):
+    def __init__(self, infn, workers=default_workers, settings=None, endpoint_url=None, checksum=False,
+                 journal_dir=default_journal_dir):
         self.meta_dic = dict()
         self.parse_infn(Path(infn))
         self.all_bucket_names = list()
+        # bucket -> {key: (size, etag)} of the objects already in S3
+        self.bucket_objects = dict()
+        self.workers = workers
+        self.checksum = checksum
+        self.journal_dir = journal_dir
+        self.settings = settings or transfer_profiles[default_profile]
+        max_bandwidth = self.settings["max_bandwidth"]
+        self.limiter = BandwidthLimiter(max_bandwidth * MB) if max_bandwidth else None
+        # one client (and connection pool) shared by all upload threads;
+        # each file's multipart transfer uses up to max_concurrency connections,
+        # so the pool is sized for all of them.
+        self.s3_client = make_s3_client(workers * self.settings["max_concurrency"], endpoint_url)
+        # presigned urls are signed locally, so this client makes no requests
+        self.presign_client = boto3.client("s3",
+                                           region_name=region_id,
+                                           endpoint_url=endpoint_url,
+                                           config=Config(s3={'addressing_style': 'path'},
+                                                         signature_version='s3v4')
+                                           )
         self.get_all_bucket_names()
 
     def get_all_bucket_names(self):
-        s3 = boto3.resource('s3')
-        for bucket in s3.buckets.all():
-            self.all_bucket_names.append(bucket.name)
-            logging.info(f"found the bucket in S3 before : {bucket.name}")
+        for bucket in self.s3_client.list_buckets()["Buckets"]:
+            self.all_bucket_names.append(bucket["Name"])
+            logging.info(f"found the bucket in S3 before : {bucket['Name']}")
         return True
 
     def parse_infn(self, infn_path):
@@ -76,47 +398,290 @@ class S3Uploader:
 
         return True
 
-    def upload_to_bucket(self, file_name, info_dic, object_name=None):
+    def prepare_buckets(self):
+        # create missing buckets and index legacy files once per bucket,
+        # before the upload threads start
+        object_names = dict()
+        for info_dic in self.meta_dic.values():
+            object_names.setdefault(info_dic["bucket_name"], []).append(info_dic["object_name"])
+
+        for bucket_name, names in sorted(object_names.items()):
+            # find legacy buckets in my s3
+            if not self.is_exists_bucket(bucket_name):
+                logging.info(f"create the bucket : {bucket_name}")
+                if self.create_bucket(bucket_name):
+                    self.all_bucket_names.append(bucket_name)
+                self.bucket_objects[bucket_name] = dict()
+                continue
+
+            # find legacy files in the bucket
+            if len(names) <= head_object_limit:
+                self.bucket_objects[bucket_name] = self.head_objects(bucket_name, names)
+            else:
+                self.bucket_objects[bucket_name] = self.list_bucket_objects(bucket_name)
+            if not self.bucket_objects[bucket_name]:
+                logging.info(f"no legacy files in the bucket : {bucket_name}")
+
+        return True
+
+    def list_bucket_objects(self, bucket_name):
+        # {key: (size, etag)} of every object in the bucket (all pages)
+        objects = dict()
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name):
+            for content in page.get("Contents", []):
+                objects[content["Key"]] = (content["Size"], content["ETag"].strip('"'))
+        logging.info(f"found {len(objects):,} objects in the bucket : {bucket_name}")
+        return objects
+
+    def head_objects(self, bucket_name, object_names):
+        # {key: (size, etag)} of the given keys that exist in the bucket
+        objects = dict()
+        for object_name in object_names:
+            try:
+                response = self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+            except ClientError as e:
+                if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                    continue
+                raise
+            objects[object_name] = (response["ContentLength"], response["ETag"].strip('"'))
+        return objects
+
+    def is_uploaded(self, file_name, info_dic, object_name):
+        # the same file (size, and ETag with --checksum) is already in the bucket
+        legacy = self.bucket_objects[info_dic["bucket_name"]].get(object_name)
+        if legacy is None:
+            return False
+        size, etag = legacy
+        if size != info_dic["size"]:
+            logging.warning(f"The file in the bucket has a different size ({size:,} bytes), "
+                            f"upload again : {file_name}")
+            return False
+        if self.checksum:
+            # checksums tagged by an earlier run, otherwise the ETag
+            tags = self.get_checksum_tags(info_dic["bucket_name"], object_name)
+            if tags:
+                self.set_checksums(info_dic, *FileHasher(file_name, info_dic["size"]).hash_all())
+                if tags.get("md5") != info_dic["md5"] or tags.get("sha256", info_dic["sha256"]) != info_dic["sha256"]:
+                    logging.warning(f"The file in the bucket has a different checksum, upload again : {file_name}")
+                    return False
+            else:
+                matched = etag_matches(file_name, info_dic["size"], etag)
+                if matched is None:
+                    logging.warning(f"can't verify the ETag ({etag}) with a known part size, "
+                                    f"compared by size only : {file_name}")
+                elif not matched:
+                    logging.warning(f"The file in the bucket has a different ETag ({etag}), "
+                                    f"upload again : {file_name}")
+                    return False
+        return True
+
+    def get_checksum_tags(self, bucket_name, object_name):
+        # {"md5": ..., "sha256": ...} tagged on the object (empty if not tagged
+        # or the tags can't be read)
+        try:
+            response = self.s3_client.get_object_tagging(Bucket=bucket_name, Key=object_name)
+        except ClientError as e:
+            logging.warning(f"can't read the checksum tags of {object_name} : {e}")
+            return dict()
+        return {tag["Key"]: tag["Value"] for tag in response["TagSet"] if tag["Key"] in ("md5", "sha256")}
+
+    def put_checksum_tags(self, bucket_name, object_name, info_dic):
+        # add the checksums to the object's tags, keeping any other tags, since
+        # put_object_tagging replaces the whole tag set. a failure only loses
+        # the tags, the file itself is uploaded
+        try:
+            response = self.s3_client.get_object_tagging(Bucket=bucket_name, Key=object_name)
+            tag_set = [tag for tag in response["TagSet"] if tag["Key"] not in ("md5", "sha256")]
+            tag_set += [{"Key": "md5", "Value": info_dic["md5"]},
+                        {"Key": "sha256", "Value": info_dic["sha256"]}]
+            self.s3_client.put_object_tagging(Bucket=bucket_name, Key=object_name,
+                                              Tagging={"TagSet": tag_set})
+        except ClientError as e:
+            logging.warning(f"can't tag the checksums of {object_name} : {e}")
+
+    @staticmethod
+    def set_checksums(info_dic, md5, sha256):
+        info_dic["md5"] = md5
+        info_dic["sha256"] = sha256
+
+    def upload_to_bucket(self, file_name, info_dic, object_name=None, monitor=None):
 
-        sys.stdout.write("\n")
         logging.info(f"Uploading the file is in progress to bucket.")
         logging.info(f" -> source file : {file_name}")
         logging.info(f" -> target bucket : {info_dic['bucket_name']}")
 
-        s3_client = boto3.client("s3", region_name=region_id)
-
-        # find legacy buckets in my s3
         bucket_name = info_dic["bucket_name"]
-        if not self.is_exists_bucket(bucket_name):
-            logging.info(f"create the bucket : {bucket_name}")
-            if self.create_bucket(bucket_name):
-                self.all_bucket_names.append(bucket_name)
-
-        # find legacy files in the bucket
-        object_list = s3_client.list_objects(Bucket=bucket_name)
-        try:
-            file_list = [content["Key"] for content in object_list["Contents"]]
-        except KeyError as e:
-            logging.error(f"KeyError : {e}")
-            logging.info(f"bucket is empty : {bucket_name}")
-            file_list = list()
 
         # upload files
         if object_name is None:
             object_name = info_dic["file_path"].name
 
-        if object_name not in file_list:
-            try:
+        try:
+            # checked inside the try: hashing the local file for --checksum can fail too
+            uploaded = self.is_uploaded(file_name, info_dic, object_name)
+            if not uploaded:
                 logging.info(f"upload the file : {file_name}")
-                resposne = s3_client.upload_file(
-                    file_name, bucket_name, object_name,
-                    Callback=ProgressPercentage(file_name)
-                )
-                sys.stdout.write("\n")
-            except ClientError as e:
-                logging.error(f"ClientError : {e}")
-        else:
-            logging.warning(f"The file has already been uploaded : {file_name}")
+                if info_dic["size"] >= self.settings["multipart_threshold"] * MB:
+                    self.resumable_upload(file_name, info_dic, object_name, monitor)
+                else:
+                    # small file: hashed first, then uploaded from the page cache
+                    self.set_checksums(info_dic, *FileHasher(file_name, info_dic["size"]).hash_all())
+                    self.s3_client.upload_file(
+                        file_name, bucket_name, object_name,
+                        Callback=monitor,
+                        Config=make_transfer_config(self.settings, info_dic["size"], self.workers)
+                    )
+                self.put_checksum_tags(bucket_name, object_name, info_dic)
+            else:
+                logging.warning(f"The file has already been uploaded : {file_name}")
+                if monitor is not None:
+                    monitor.skip(info_dic["size"])
+                if "md5" not in info_dic:
+                    tags = self.get_checksum_tags(bucket_name, object_name)
+                    if "md5" in tags and "sha256" in tags:
+                        self.set_checksums(info_dic, tags["md5"], tags["sha256"])
+                    else:
+                        # uploaded before checksums were tagged: hashed once and the
+                        # checksums added to the object's tags, so later runs read the
+                        # tags instead of the whole file
+                        self.set_checksums(info_dic, *FileHasher(file_name, info_dic["size"]).hash_all())
+                        self.put_checksum_tags(bucket_name, object_name, info_dic)
+        except ClientError as e:
+            logging.error(f"ClientError : {e}")
+            return False
+        except (BotoCoreError, OSError) as e:
+            logging.error(f"upload interrupted, run again to resume : {file_name} ({e})")
+            return False
+
+        return True
+
+    def resumable_upload(self, file_name, info_dic, object_name, monitor=None):
+        # multipart upload that records each completed part in a journal, so an
+        # interrupted run only sends the parts that are missing
+        bucket_name = info_dic["bucket_name"]
+        size = info_dic["size"]
+        config = make_transfer_config(self.settings, size, self.workers)
+        chunksize = config.multipart_chunksize
+        header = {"bucket": bucket_name, "key": object_name, "file": os.path.abspath(file_name),
+                  "size": size, "mtime": os.path.getmtime(file_name), "chunksize": chunksize}
+        journal_path = UploadJournal.path_for(self.journal_dir, bucket_name, object_name)
+
+        journal = UploadJournal.load(journal_path)
+        done = dict()
+        if journal is not None:
+            upload_id = journal.header.get("upload_id")
+            uploaded = self.list_uploaded_parts(bucket_name, object_name, upload_id) if upload_id else None
+            if journal.matches(header) and uploaded is not None:
+                # parts journaled locally and still held by S3 under the same ETag
+                done = {part: etag for part, etag in journal.parts.items() if uploaded.get(part) == etag}
+            else:
+                if uploaded is not None:
+                    logging.info(f"the file has changed since the last run, abort the old upload : {file_name}")
+                    self.s3_client.abort_multipart_upload(Bucket=bucket_name, Key=object_name, UploadId=upload_id)
+                journal = None
+        if journal is None:
+            upload_id = self.s3_client.create_multipart_upload(Bucket=bucket_name, Key=object_name)["UploadId"]
+            journal = UploadJournal.create(journal_path, dict(header, upload_id=upload_id))
+        upload_id = journal.header["upload_id"]
+
+        n_parts = math.ceil(size / chunksize)
+        part_sizes = {part: min(chunksize, size - (part - 1) * chunksize) for part in range(1, n_parts + 1)}
+        hasher = FileHasher(file_name, size, chunksize)
+        if done:
+            logging.info(f"resume the upload : {file_name} ({len(done)} / {n_parts} parts already uploaded)")
+            if monitor is not None:
+                monitor.skip(sum(part_sizes[part] for part in done))
+
+        def upload_part(part):
+            if self.limiter is not None:
+                self.limiter.consume(part_sizes[part])
+            body = ReadFileChunk.from_filename(file_name, (part - 1) * chunksize, part_sizes[part],
+                                               enable_callbacks=False)
+            with body:
+                response = self.s3_client.upload_part(Bucket=bucket_name, Key=object_name, UploadId=upload_id,
+                                                      PartNumber=part, Body=body)
+            journal.add(part, response["ETag"].strip('"'))
+            if monitor is not None:
+                monitor(part_sizes[part])
+            hasher.part_done(part)
+
+        with ThreadPoolExecutor(max_workers=config.max_concurrency) as executor:
+            futures = [executor.submit(upload_part, part) for part in part_sizes if part not in done]
+            # parts sent by an earlier run are hashed while the missing ones upload
+            futures.append(executor.submit(lambda: [hasher.part_done(part) for part in sorted(done)]))
+            for future in futures:
+                future.result()
+        self.set_checksums(info_dic, *hasher.hexdigests())
+
+        self.s3_client.complete_multipart_upload(
+            Bucket=bucket_name, Key=object_name, UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": part, "ETag": f'"{journal.parts[part]}"'}
+                                       for part in sorted(part_sizes)]}
+        )
+        journal.remove()
+        return True
+
+    def list_uploaded_parts(self, bucket_name, object_name, upload_id):
+        # {part number: etag} held by S3 for the upload, None if it no longer exists
+        parts = dict()
+        paginator = self.s3_client.get_paginator("list_parts")
+        try:
+            for page in paginator.paginate(Bucket=bucket_name, Key=object_name, UploadId=upload_id):
+                for part in page.get("Parts", []):
+                    parts[part["PartNumber"]] = part["ETag"].strip('"')
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchUpload", "404"):
+                return None
+            raise
+        return parts
+
+    def upload_all(self):
+        # upload files concurrently (largest first) and create each presigned url
+        # as soon as its upload completes
+        self.prepare_buckets()
+        total_bytes = sum(info_dic["size"] for info_dic in self.meta_dic.values())
+        monitor = ProgressMonitor(len(self.meta_dic), total_bytes)
+        # log to the console through the monitor while the progress line is shown
+        root_logger = logging.getLogger()
+        console_handlers = [handler for handler in root_logger.handlers
+                            if type(handler) is logging.StreamHandler and handler.stream is monitor.stream]
+        for handler in console_handlers:
+            monitor.setFormatter(handler.formatter)
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(monitor)
+
+        def upload_one(file_name, info_dic):
+            if not self.upload_to_bucket(file_name, info_dic, monitor=monitor):
+                return file_name, False
+            result = self.create_presigned_url(file_name, info_dic)
+            if result:
+                logging.info(f"Presigned URL : {file_name} --> {result}")
+            return file_name, bool(result)
+
+        failed = list()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(upload_one, file_name, info_dic)
+                    for file_name, info_dic in sorted(self.meta_dic.items(),
+                                                      key=lambda item: item[1]["size"], reverse=True)
+                ]
+                for future in as_completed(futures):
+                    file_name, ok = future.result()
+                    monitor.file_done()
+                    if not ok:
+                        failed.append(file_name)
+        finally:
+            monitor.finish()
+            root_logger.removeHandler(monitor)
+            for handler in console_handlers:
+                root_logger.addHandler(handler)
+
+        logging.info(f"uploaded {len(self.meta_dic) - len(failed)} / {len(self.meta_dic)} files")
+        for file_name in failed:
+            logging.error(f"failed to upload : {file_name}")
+        return failed
 
     def is_exists_bucket(self, bucket_name):
         if bucket_name in self.all_bucket_names:
@@ -126,9 +691,8 @@ class S3Uploader:
         return False
 
     def create_bucket(self, bucket_name):
-        s3_client = boto3.client("s3", region_name=region_id)
         location = {'LocationConstraint': region_id}
-        s3_client.create_bucket(Bucket=bucket_name, CreateBucketConfiguration=location)
+        self.s3_client.create_bucket(Bucket=bucket_name, CreateBucketConfiguration=location)
 
         return True
 
@@ -138,13 +702,8 @@ class S3Uploader:
         logging.info(f"create presigned url for {file_name}")
 
         # create presigned url
-        s3_client = boto3.client("s3",
-                                 region_name=region_id,
-                                 config=Config(s3={'addressing_style': 'path'},
-                                               signature_version='s3v4')
-                                 )
         try:
-            response = s3_client.generate_presigned_url(
+            response = self.presign_client.generate_presigned_url(
                 ClientMethod='get_object',
                 Params={'Bucket': info_dic["bucket_name"],
                         'Key': info_dic["object_name"]},
@@ -152,7 +711,6 @@ class S3Uploader:
             )
         except ClientError as e:
             logging.error(e)
-            sys.exit()
             return False
 
         # add presigned url to meta_dic
@@ -173,6 +731,8 @@ class S3Uploader:
         outfh = open(outfn, "w")
         headers = ["File_name"]
         headers.append("File_size(Bytes)")
+        headers.append("MD5")
+        headers.append("SHA256")
         headers.append("S3_url")
         headers.append("Presigned_url")
         #headers.append("Download_url")
@@ -180,8 +740,12 @@ class S3Uploader:
         headers.append("Expiry_date")
         outfh.write("{0}\n".format("\t".join(headers)))
         for file_name, info_dic in self.meta_dic.items():
+            if "presigned_url" not in info_dic:
+                continue
             items = [info_dic["object_name"]]
             items.append(f"{info_dic['size']:,}")
+            items.append(info_dic["md5"])
+            items.append(info_dic["sha256"])
             items.append(f"s3://{info_dic['bucket_name']}/{info_dic['object_name']}")
             items.append(info_dic["presigned_url"])
             #items.append(f"=hyperlink({info_dic['presigned_url']}, {info_dic['object_name']})")
@@ -190,19 +754,125 @@ class S3Uploader:
             outfh.write("{0}\n".format("\t".join(items)))
         outfh.close()
 
+    def write_manifest(self, outprefix):
+        # checksum files for `md5sum -c` / `sha256sum -c` in the download directory
+        for algorithm in ("md5", "sha256"):
+            with open(f"{outprefix}.{algorithm}", "w") as outfh:
+                for file_name, info_dic in self.meta_dic.items():
+                    if "presigned_url" not in info_dic:
+                        continue
+                    outfh.write(f"{info_dic[algorithm]}  {info_dic['object_name']}\n")
+
+def resolve_settings(profile, args):
+    # profile values overridden by the options given on the command line
+    settings = dict(transfer_profiles[profile])
+    for key in settings:
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    return settings
+
+
+def benchmark(args):
+    # upload a temporary file `workers` times at once with each profile and
+    # report the achieved rate; meant for a local S3 stand-in (moto, MinIO)
+    # given by --endpoint-url or AWS_ENDPOINT_URL
+    profiles = args.benchmark_profiles or list(transfer_profiles)
+    size = args.benchmark_size * MB
+    bucket_name = args.benchmark_bucket
+    rows = list()
+
+    with tempfile.NamedTemporaryFile(prefix="s3-upload-benchmark.") as tmp:
+        for _ in range(args.benchmark_size):
+            tmp.write(os.urandom(MB))
+        tmp.flush()
+
+        for profile in profiles:
+            settings = resolve_settings(profile, args)
+            s3_client = make_s3_client(args.workers * settings["max_concurrency"], args.endpoint_url)
+            if bucket_name not in [bucket["Name"] for bucket in s3_client.list_buckets()["Buckets"]]:
+                s3_client.create_bucket(Bucket=bucket_name,
+                                        CreateBucketConfiguration={'LocationConstraint': region_id})
+            transfer_config = make_transfer_config(settings, size, args.workers)
+            keys = [f"benchmark/{uuid.uuid4().hex}/{idx}" for idx in range(args.workers)]
+
+            logging.info(f"benchmark profile : {profile} ({args.workers} x {args.benchmark_size} MB)")
+            started = time()
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                for future in [executor.submit(s3_client.upload_file, tmp.name, bucket_name, key,
+                                               Config=transfer_config) for key in keys]:
+                    future.result()
+            elapsed = time() - started
+            s3_client.delete_objects(Bucket=bucket_name,
+                                     Delete={"Objects": [{"Key": key} for key in keys]})
+
+            rows.append([profile,
+                         f"{transfer_config.multipart_chunksize // MB}",
+                         f"{settings['max_concurrency']}",
+                         f"{settings['max_bandwidth'] or '-'}",
+                         f"{elapsed:.2f}",
+                         f"{args.workers * size / MB / elapsed:.1f}"])
+
+    headers = ["Profile", "Chunk(MB)", "Threads/file", "Cap(MB/s)", "Seconds", "MB/s"]
+    print("\t".join(headers))
+    for items in rows:
+        print("\t".join(items))
+
+
+def cleanup(args):
+    # abort multipart uploads started more than --abort-stale-uploads hours ago;
+    # their parts are billed as storage until the upload is completed or aborted
+    s3_client = make_s3_client(endpoint_url=args.endpoint_url)
+    bucket_names = args.cleanup_buckets or [bucket["Name"] for bucket in s3_client.list_buckets()["Buckets"]]
+    cutoff = time() - args.abort_stale_uploads * 3600
+    aborted = set()
+    total_size = 0
+
+    for bucket_name in bucket_names:
+        paginator = s3_client.get_paginator("list_multipart_uploads")
+        for page in paginator.paginate(Bucket=bucket_name):
+            for upload in page.get("Uploads", []):
+                if upload["Initiated"].timestamp() > cutoff:
+                    continue
+                size = 0
+                for parts in s3_client.get_paginator("list_parts").paginate(
+                        Bucket=bucket_name, Key=upload["Key"], UploadId=upload["UploadId"]):
+                    size += sum(part["Size"] for part in parts.get("Parts", []))
+                initiated = strftime('%Y-%m-%d %I:%M:%S %p', localtime(upload["Initiated"].timestamp()))
+                logging.info(f"abort the stale upload : s3://{bucket_name}/{upload['Key']} "
+                             f"(started {initiated}, {size:,} bytes in parts)")
+                s3_client.abort_multipart_upload(Bucket=bucket_name, Key=upload["Key"],
+                                                 UploadId=upload["UploadId"])
+                aborted.add(upload["UploadId"])
+                total_size += size
+
+    # local journals of aborted uploads can no longer be resumed
+    if os.path.isdir(args.journal_dir):
+        for name in os.listdir(args.journal_dir):
+            journal = UploadJournal.load(os.path.join(args.journal_dir, name))
+            if journal is not None and journal.header.get("upload_id") in aborted:
+                journal.remove()
+
+    logging.info(f"aborted {len(aborted)} stale uploads ({total_size:,} bytes)")
+
+
 def main(args):
 
-    obj = S3Uploader(args.infn)
-    for file_name, info_dic in obj.meta_dic.items():
-        obj.upload_to_bucket(file_name, info_dic)
-        result = obj.create_presigned_url(file_name, info_dic)
-        if result:
-            logging.info(f"Presigned URL : {file_name} --> {result}")
-        else:
-            logging.error("Error in create presigned url")
-            sys.exit()
+    if args.benchmark:
+        benchmark(args)
+        return
+    if args.abort_stale_uploads is not None:
+        cleanup(args)
+        return
+
+    obj = S3Uploader(args.infn, workers=args.workers, settings=resolve_settings(args.profile, args),
+                     endpoint_url=args.endpoint_url, checksum=args.checksum, journal_dir=args.journal_dir)
+    failed = obj.upload_all()
 
     obj.write_result(f"{args.outprefix}.result.tsv")
+    if args.manifest:
+        obj.write_manifest(args.outprefix)
+    if failed:
+        sys.exit(1)
 
 
 
@@ -221,6 +891,41 @@ if __name__=="__main__":
     """
     )
     parser.add_argument("--outprefix", default="atgcu-util.s3-upload")
+    parser.add_argument("--workers", type=int, default=default_workers,
+                        help="number of files uploaded at the same time")
+    parser.add_argument("--manifest", action="store_true",
+                        help="also write <outprefix>.md5 and <outprefix>.sha256 for md5sum -c / sha256sum -c")
+    parser.add_argument("--checksum", action="store_true",
+                        help="files already in the bucket with the same size are also compared by ETag (md5)")
+    parser.add_argument("--profile", choices=list(transfer_profiles), default=default_profile,
+                        help="multipart settings for the network: " + ", ".join(
+                            f"{name}={settings['multipart_chunksize']}MB x {settings['max_concurrency']}"
+                            + (f" @{settings['max_bandwidth']}MB/s" if settings['max_bandwidth'] else "")
+                            for name, settings in transfer_profiles.items()))
+    parser.add_argument("--multipart-threshold", type=int, default=None,
+                        help="file size (MB) from which multipart upload is used (overrides the profile)")
+    parser.add_argument("--multipart-chunksize", type=int, default=None,
+                        help="minimum part size (MB); raised automatically to stay within 10,000 parts")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="parts uploaded at the same time per file (overrides the profile)")
+    parser.add_argument("--max-bandwidth", type=float, default=None,
+                        help="upload bandwidth cap (MB/s) for all files together (overrides the profile)")
+    parser.add_argument("--endpoint-url", default=None,
+                        help="S3 endpoint (e.g. http://localhost:9000 for MinIO); AWS_ENDPOINT_URL also works")
+    parser.add_argument("--journal-dir", default=default_journal_dir,
+                        help="directory of the journals used to resume interrupted multipart uploads")
+    parser.add_argument("--abort-stale-uploads", type=float, default=None, metavar="HOURS",
+                        help="abort multipart uploads started more than HOURS ago instead of uploading --infn")
+    parser.add_argument("--cleanup-buckets", nargs="+", default=None,
+                        help="buckets checked by --abort-stale-uploads (default: all buckets)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="measure the upload rate of each profile instead of uploading --infn")
+    parser.add_argument("--benchmark-profiles", nargs="+", choices=list(transfer_profiles), default=None,
+                        help="profiles to benchmark (default: all)")
+    parser.add_argument("--benchmark-size", type=int, default=256,
+                        help="size (MB) of the temporary file uploaded by each worker")
+    parser.add_argument("--benchmark-bucket", default="s3-upload-benchmark",
+                        help="bucket used (and created if missing) for the benchmark")
     args = parser.parse_args()
     main(args)
 